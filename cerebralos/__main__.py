@@ -3,10 +3,10 @@
 CerebralOS CLI — Pure Python entry point.
 
 Usage:
-    python -m cerebralos run <patient.txt> [--protocols] [--ntds]
+    python -m cerebralos run <patient.txt> [--protocols] [--ntds] [--no-excel] [--no-open]
     python -m cerebralos run-all
-    python -m cerebralos live <patient.txt>
-    python -m cerebralos excel
+    python -m cerebralos live <patient.txt> [--no-open]
+    python -m cerebralos excel [--force]
     python -m cerebralos help
 
 Works on Windows, macOS, and Linux without bash.
@@ -18,37 +18,72 @@ import sys
 import platform
 import subprocess
 from pathlib import Path
+from typing import FrozenSet, List, Optional, Tuple
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _DATA_DIR = _PROJECT_ROOT / "data_raw"
 _OUTPUT_DIR = _PROJECT_ROOT / "outputs" / "pi_reports"
+_SYSTEM = platform.system()
+
+
+# Entry names in data_raw/, rebuilt when the directory (or its mtime) changes
+_DATA_DIR_INDEX: Optional[FrozenSet[str]] = None
+_DATA_DIR_WATERMARK: Optional[Tuple[str, int]] = None
+
+
+def _data_dir_index() -> Optional[FrozenSet[str]]:
+    """Return the cached set of names in data_raw/, or None if it is unreadable."""
+    global _DATA_DIR_INDEX, _DATA_DIR_WATERMARK
+    try:
+        watermark = (str(_DATA_DIR), os.stat(_DATA_DIR).st_mtime_ns)
+        if _DATA_DIR_INDEX is None or watermark != _DATA_DIR_WATERMARK:
+            with os.scandir(_DATA_DIR) as it:
+                _DATA_DIR_INDEX = frozenset(e.name for e in it)
+            _DATA_DIR_WATERMARK = watermark
+    except OSError:
+        return None
+    return _DATA_DIR_INDEX
 
 
 def _resolve_patient_file(name: str) -> Path:
-    """Resolve patient file from name, with or without .txt extension."""
+    """Resolve patient file from name, with or without .txt extension.
+
+    Candidates are probed in order: as given, data_raw/<name>, then (without
+    .txt) data_raw/<name>.txt and <name>.txt.  data_raw/ candidates for a bare
+    file name found in _data_dir_index() need no stat; a name the index lacks
+    is still checked on disk, where a case-insensitive filesystem may match it.
+    """
     p = Path(name)
-    if p.is_absolute() and p.exists():
-        return p
-    # Try as-is
-    if p.exists():
-        return p
-    # Try in data_raw/
-    candidate = _DATA_DIR / name
-    if candidate.exists():
-        return candidate
-    # Try adding .txt
+    # data_raw/<absolute path> is the absolute path itself; don't stat it twice
+    relative = not p.is_absolute()
+    candidates: List[Tuple[Path, Optional[str]]] = [(p, None)]
+    if relative:
+        candidates.append((_DATA_DIR / name, name))
     if not name.endswith(".txt"):
-        candidate = _DATA_DIR / f"{name}.txt"
-        if candidate.exists():
-            return candidate
-        candidate = Path(f"{name}.txt")
-        if candidate.exists():
+        if relative:
+            candidates.append((_DATA_DIR / f"{name}.txt", f"{name}.txt"))
+        candidates.append((Path(f"{name}.txt"), None))
+    index = _data_dir_index() if relative and p.name == name else None
+    for candidate, entry in candidates:
+        indexed = entry is not None and index is not None and entry in index
+        if indexed or os.path.exists(candidate):
             return candidate
     print(f"Error: Patient file not found: {name}")
     print(f"  Searched: {p}, {_DATA_DIR / name}")
     sys.exit(1)
 
 
+def _emit(lines: List[str]) -> None:
+    """Write one phase's status lines with a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _should_open(no_open_flag: bool) -> bool:
+    """Open reports only for an interactive terminal and without --no-open."""
+    return not no_open_flag and sys.stdout.isatty()
+
+
 def _open_file(path: Path) -> None:
     """Open a file with the platform default application.
 
@@ -56,23 +91,31 @@ def _open_file(path: Path) -> None:
     """
     if os.environ.get("CEREBRAL_NO_OPEN") == "1":
         return
-    system = platform.system()
     try:
-        if system == "Darwin":
-            subprocess.run(["open", str(path)], check=False)
-        elif system == "Linux":
-            subprocess.run(["xdg-open", str(path)], check=False)
-        elif system == "Windows":
-            subprocess.run(["start", "", str(path)], shell=True, check=False)
+        if _SYSTEM == "Windows":
+            # ShellExecute directly — no intermediate cmd.exe
+            os.startfile(str(path))
+            return
+        opener = {"Darwin": "open", "Linux": "xdg-open"}.get(_SYSTEM)
+        if opener:
+            # Detached launcher: the CLI does not wait on it
+            subprocess.Popen(
+                [opener, str(path)],
+                start_new_session=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
     except Exception:
         pass
 
 
 def cmd_run(args: list) -> int:
     """Run evaluation on a single patient."""
-    # Consume --protocols, --ntds, and --sections flags before positional args
+    # Consume --protocols, --ntds, --no-excel, --no-open, and --sections flags before positional args
     protocols_flag = "--protocols" in args
     ntds_flag = "--ntds" in args
+    no_excel_flag = "--no-excel" in args
+    no_open_flag = "--no-open" in args
     sections_raw = None
     filtered_args = []
     skip_next = False
@@ -90,7 +133,7 @@ def cmd_run(args: list) -> int:
         if a.startswith("--sections="):
             sections_raw = a[len("--sections="):]
             continue
-        if a in ("--protocols", "--ntds"):
+        if a in ("--protocols", "--ntds", "--no-excel", "--no-open"):
             continue
         filtered_args.append(a)
     args = filtered_args
@@ -114,148 +157,170 @@ def cmd_run(args: list) -> int:
             return 1
 
     if not args:
-        print("Usage: python -m cerebralos run <patient_file> [--protocols] [--ntds] [--sections <keys>]")
+        print("Usage: python -m cerebralos run <patient_file> [--protocols] [--ntds] [--no-excel] [--no-open] [--sections <keys>]")
         return 1
 
     patient_path = _resolve_patient_file(args[0])
-    print(f"CerebralOS -- Evaluating: {patient_path.name}")
-    print()
+    _emit([f"CerebralOS -- Evaluating: {patient_path.name}", ""])
 
+    from collections import Counter
+    from concurrent.futures import ThreadPoolExecutor
     from cerebralos.ingestion.batch_eval import (
         _load_resources, evaluate_patient, generate_pi_report,
-        _get_evaluable_protocols, _generate_v5_report,
+        _get_evaluable_protocols, _generate_v5_report, _write_evaluation_json,
     )
     from cerebralos.reporting.html_report import generate_patient_html
 
     resources = _load_resources()
     evaluable_count = len(_get_evaluable_protocols(resources["protocols"]))
     ntds_count = len(resources.get("ntds_rulesets", {}))
-    print(f"  {len(resources['action_patterns'])} pattern keys")
-    print(f"  {evaluable_count} evaluable protocols")
-    print(f"  {ntds_count} NTDS hospital events")
-    print()
+    _emit([
+        f"  {len(resources['action_patterns'])} pattern keys",
+        f"  {evaluable_count} evaluable protocols",
+        f"  {ntds_count} NTDS hospital events",
+        "",
+    ])
 
     evaluation = evaluate_patient(patient_path, resources)
 
+    # Status lines are collected and written once after the reports
+    status: List[str] = []
+
     # Count outcomes
-    outcomes = {}
-    for r in evaluation["results"]:
-        o = r["outcome"]
-        outcomes[o] = outcomes.get(o, 0) + 1
-    triggered = sum(v for k, v in outcomes.items() if k != "NOT_TRIGGERED")
-    print(f"  Protocols: {triggered} triggered: {outcomes}")
-
-    ntds_outcomes = {}
-    for r in evaluation.get("ntds_results", []):
-        o = r["outcome"]
-        ntds_outcomes[o] = ntds_outcomes.get(o, 0) + 1
+    outcomes = Counter(r["outcome"] for r in evaluation["results"])
+    triggered = sum(outcomes.values()) - outcomes["NOT_TRIGGERED"]
+    status.append(f"  Protocols: {triggered} triggered: {dict(outcomes)}")
+
+    ntds_outcomes = Counter(r["outcome"] for r in evaluation.get("ntds_results", []))
     if ntds_outcomes:
-        print(f"  NTDS: {ntds_outcomes}")
+        status.append(f"  NTDS: {dict(ntds_outcomes)}")
+
+    # Excel — skipped with --no-excel / CEREBRAL_EXCEL=0, or when openpyxl is
+    # not installed (probed without importing it)
+    from importlib.util import find_spec
+    _excel_enabled = (
+        not no_excel_flag
+        and os.environ.get("CEREBRAL_EXCEL") != "0"
+        and find_spec("openpyxl") is not None
+    )
 
-    # Generate reports
+    # Text, HTML, JSON and Excel only read `evaluation`: run them on a thread
+    # pool while V5 and the bundle are built here, then report in fixed order
     report_path = _OUTPUT_DIR / f"{patient_path.stem}_pi_report.txt"
-    generate_pi_report(evaluation, report_path)
-    print(f"  Text:  {report_path}")
-
     html_path = _OUTPUT_DIR / f"{patient_path.stem}_report.html"
-    generate_patient_html(evaluation, html_path)
-    print(f"  HTML:  {html_path}")
-
-    # JSON
-    import json
     json_path = _OUTPUT_DIR / f"{patient_path.stem}_results.json"
-    json_path.parent.mkdir(parents=True, exist_ok=True)
-    json_path.write_text(json.dumps(evaluation, indent=2, default=str), encoding="utf-8")
-    print(f"  JSON:  {json_path}")
-
-    # V5 daily notes with NTDS signal summary and protocol results
-    try:
-        v5_path = _OUTPUT_DIR / f"{patient_path.stem}_TRAUMA_DAILY_NOTES_v5.txt"
-        # Gate NTDS section: --ntds flag OR CEREBRAL_NTDS=1 env var
-        _ntds_enabled = (
-            ntds_flag
-            or os.environ.get("CEREBRAL_NTDS") == "1"
-        )
-        _ntds_results = (
-            evaluation.get("ntds_results", [])
-            if _ntds_enabled
-            else []
-        )
-        # Gate protocol section: --protocols flag OR CEREBRAL_PROTOCOLS=1 env var
-        _proto_enabled = (
-            protocols_flag
-            or os.environ.get("CEREBRAL_PROTOCOLS") == "1"
-        )
-        _proto_results = (
-            evaluation.get("results", [])
-            if _proto_enabled
-            else None
-        )
-        _generate_v5_report(
-            patient_path,
-            _ntds_results,
-            v5_path,
-            protocol_results=_proto_results,
-            sections=sections_filter,
-        )
-        print(f"  V5:    {v5_path}")
-    except Exception as exc:
-        print(f"  V5:    error -- {exc}")
-
-    # Bundle v1 (casefile assembly — skip if required artifacts absent)
-    _bundle_evidence = _PROJECT_ROOT / "outputs" / "evidence" / patient_path.stem / "patient_evidence_v1.json"
-    _bundle_features = _PROJECT_ROOT / "outputs" / "features" / patient_path.stem / "patient_features_v1.json"
-    _bundle_timeline = _PROJECT_ROOT / "outputs" / "timeline" / patient_path.stem / "patient_days_v1.json"
-    if _bundle_evidence.is_file() and _bundle_features.is_file() and _bundle_timeline.is_file():
+    # Leaving the block waits for every writer, so a failed join cannot
+    # leave the Excel workbook still being written
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writers = [
+            pool.submit(generate_pi_report, evaluation, report_path),
+            pool.submit(generate_patient_html, evaluation, html_path),
+            pool.submit(_write_evaluation_json, evaluation, json_path),
+        ]
+        excel_future = pool.submit(_update_excel, evaluation) if _excel_enabled else None
+        writer_status_at = len(status)
+
+        # V5 daily notes with NTDS signal summary and protocol results
         try:
-            from cerebralos.reporting.build_patient_bundle_v1 import (
-                assemble_bundle, write_bundle,
+            v5_path = _OUTPUT_DIR / f"{patient_path.stem}_TRAUMA_DAILY_NOTES_v5.txt"
+            # Gate NTDS section: --ntds flag OR CEREBRAL_NTDS=1 env var
+            _ntds_enabled = (
+                ntds_flag
+                or os.environ.get("CEREBRAL_NTDS") == "1"
+            )
+            _ntds_results = (
+                evaluation.get("ntds_results", [])
+                if _ntds_enabled
+                else []
+            )
+            # Gate protocol section: --protocols flag OR CEREBRAL_PROTOCOLS=1 env var
+            _proto_enabled = (
+                protocols_flag
+                or os.environ.get("CEREBRAL_PROTOCOLS") == "1"
+            )
+            _proto_results = (
+                evaluation.get("results", [])
+                if _proto_enabled
+                else None
             )
-            bundle_out = (
-                _PROJECT_ROOT / "outputs" / "casefile"
-                / patient_path.stem / "patient_bundle_v1.json"
+            _generate_v5_report(
+                patient_path,
+                _ntds_results,
+                v5_path,
+                protocol_results=_proto_results,
+                sections=sections_filter,
             )
-            bundle = assemble_bundle(patient_path.stem)
-            write_bundle(bundle, bundle_out)
-            print(f"  Bundle: {bundle_out}")
+            status.append(f"  V5:    {v5_path}")
         except Exception as exc:
-            print(f"  Bundle: error -- {exc}")
-            bundle_out = None
+            status.append(f"  V5:    error -- {exc}")
 
-        # Casefile v1 HTML render
-        if bundle_out and bundle_out.is_file():
+        # Bundle v1 (casefile assembly — skip if required artifacts absent)
+        _bundle_evidence = _PROJECT_ROOT / "outputs" / "evidence" / patient_path.stem / "patient_evidence_v1.json"
+        _bundle_features = _PROJECT_ROOT / "outputs" / "features" / patient_path.stem / "patient_features_v1.json"
+        _bundle_timeline = _PROJECT_ROOT / "outputs" / "timeline" / patient_path.stem / "patient_days_v1.json"
+        if _bundle_evidence.is_file() and _bundle_features.is_file() and _bundle_timeline.is_file():
             try:
-                from cerebralos.reporting.render_pi_rn_casefile_v1 import (
-                    render_casefile_to_file,
+                from cerebralos.reporting.build_patient_bundle_v1 import (
+                    assemble_bundle, write_bundle,
                 )
-                casefile_out = (
+                bundle_out = (
                     _PROJECT_ROOT / "outputs" / "casefile"
-                    / patient_path.stem / "casefile_v1.html"
+                    / patient_path.stem / "patient_bundle_v1.json"
                 )
-                render_casefile_to_file(bundle_out, casefile_out)
-                print(f"  Casefile: {casefile_out}")
+                bundle = assemble_bundle(patient_path.stem)
+                write_bundle(bundle, bundle_out)
+                status.append(f"  Bundle: {bundle_out}")
             except Exception as exc:
-                print(f"  Casefile: error -- {exc}")
-    else:
-        print("  Bundle: skipped (required pipeline artifacts not found)")
+                status.append(f"  Bundle: error -- {exc}")
+                bundle_out = None
+
+            # Casefile v1 HTML render
+            if bundle_out and bundle_out.is_file():
+                try:
+                    from cerebralos.reporting.render_pi_rn_casefile_v1 import (
+                        render_casefile_to_file,
+                    )
+                    casefile_out = (
+                        _PROJECT_ROOT / "outputs" / "casefile"
+                        / patient_path.stem / "casefile_v1.html"
+                    )
+                    render_casefile_to_file(bundle_out, casefile_out)
+                    status.append(f"  Casefile: {casefile_out}")
+                except Exception as exc:
+                    status.append(f"  Casefile: error -- {exc}")
+        else:
+            status.append("  Bundle: skipped (required pipeline artifacts not found)")
+
+        # Join the writers; a failed text/HTML/JSON write still aborts the run
+        for future in writers:
+            future.result()
+        status[writer_status_at:writer_status_at] = [
+            f"  Text:  {report_path}",
+            f"  HTML:  {html_path}",
+            f"  JSON:  {json_path}",
+        ]
+        if excel_future is not None:
+            status.append(excel_future.result())
+
+    status.append("")
+    _emit(status)
+    if _should_open(no_open_flag):
+        _open_file(html_path)
+    print("Done.")
+    return 0
 
-    # Excel
+
+def _update_excel(evaluation: dict) -> str:
+    """Update the Excel dashboard for one patient; return its status line."""
     try:
         from cerebralos.reporting.excel_dashboard import update_excel_dashboard
         from cerebralos.classification.vrc_categories import classify_vrc_categories
         excel_path = _PROJECT_ROOT / "outputs" / "trauma_dashboard.xlsx"
         vrc = classify_vrc_categories(evaluation)
         update_excel_dashboard(evaluation, vrc, excel_path)
-        print(f"  Excel: {excel_path}")
-    except ImportError:
-        pass
+        return f"  Excel: {excel_path}"
     except Exception as exc:
-        print(f"  Excel: error -- {exc}")
-
-    print()
-    _open_file(html_path)
-    print("Done.")
-    return 0
+        return f"  Excel: error -- {exc}"
 
 
 def cmd_run_all(args: list) -> int:
@@ -275,14 +340,16 @@ def cmd_run_all(args: list) -> int:
 
 def cmd_live(args: list) -> int:
     """Run evaluation in live/provisional mode."""
+    no_open_flag = "--no-open" in args
+    args = [a for a in args if a != "--no-open"]
     if not args:
-        print("Usage: python -m cerebralos live <patient_file>")
+        print("Usage: python -m cerebralos live <patient_file> [--no-open]")
         return 1
 
     patient_path = _resolve_patient_file(args[0])
-    print(f"CerebralOS -- LIVE evaluation: {patient_path.name}")
-    print()
+    _emit([f"CerebralOS -- LIVE evaluation: {patient_path.name}", ""])
 
+    from collections import Counter
     from cerebralos.ingestion.batch_eval import (
         _load_resources, evaluate_patient, generate_pi_report,
         _get_evaluable_protocols,
@@ -296,49 +363,121 @@ def cmd_live(args: list) -> int:
     evaluation["is_live"] = True
     evaluation["has_discharge"] = False
 
+    # Status lines are collected and written once after the reports
+    status: List[str] = []
+
     # Count outcomes
-    outcomes = {}
-    for r in evaluation["results"]:
-        o = r["outcome"]
-        outcomes[o] = outcomes.get(o, 0) + 1
-    triggered = sum(v for k, v in outcomes.items() if k != "NOT_TRIGGERED")
-    print(f"  Protocols: {triggered} triggered: {outcomes} [LIVE]")
+    outcomes = Counter(r["outcome"] for r in evaluation["results"])
+    triggered = sum(outcomes.values()) - outcomes["NOT_TRIGGERED"]
+    status.append(f"  Protocols: {triggered} triggered: {dict(outcomes)} [LIVE]")
 
     # Generate reports
     report_path = _OUTPUT_DIR / f"{patient_path.stem}_pi_report.txt"
-    generate_pi_report(evaluation, report_path)
-    print(f"  Text:  {report_path}")
+    generate_pi_report(evaluation, report_path, return_text=False)
+    status.append(f"  Text:  {report_path}")
 
     html_path = _OUTPUT_DIR / f"{patient_path.stem}_report.html"
     generate_patient_html(evaluation, html_path)
-    print(f"  HTML:  {html_path}")
+    status.append(f"  HTML:  {html_path}")
 
-    print()
-    _open_file(html_path)
+    status.append("")
+    _emit(status)
+    if _should_open(no_open_flag):
+        _open_file(html_path)
     print("Done.")
     return 0
 
 
+def _load_fresh_evaluation(patient_path: Path, rules_mtime_ns: int) -> Optional[dict]:
+    """Return the saved evaluation for a patient if it is still current.
+
+    Current means the JSON sidecar is newer than both the patient file and
+    every rule file, and was written by this governance/engine/rules version.
+    Sidecars from a ``batch_eval --live`` run carry overridden discharge
+    fields and are never reused.
+    """
+    import json
+
+    json_path = _OUTPUT_DIR / f"{patient_path.stem}_results.json"
+    try:
+        json_mtime_ns = json_path.stat().st_mtime_ns
+        if json_mtime_ns <= max(patient_path.stat().st_mtime_ns, rules_mtime_ns):
+            return None
+        evaluation = json.loads(json_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    from cerebralos import GOVERNANCE_VERSION, ENGINE_VERSION, RULES_VERSIONS
+    if (
+        evaluation.get("live_forced")
+        or evaluation.get("governance_version") != GOVERNANCE_VERSION
+        or evaluation.get("engine_version") != ENGINE_VERSION
+        or evaluation.get("rules_versions") != RULES_VERSIONS
+    ):
+        return None
+    return evaluation
+
+
 def cmd_excel(args: list) -> int:
-    """Regenerate Excel dashboard from all patients."""
+    """Regenerate Excel dashboard from all patients.
+
+    Patients re-evaluated here also get a fresh JSON sidecar in
+    outputs/pi_reports/, which later runs reuse.
+    """
+    force = "--force" in args
     print("CerebralOS -- Regenerating Excel dashboard")
 
-    from cerebralos.ingestion.batch_eval import _load_resources, evaluate_patient
-    from cerebralos.reporting.excel_dashboard import update_excel_dashboard
+    from cerebralos.ingestion.batch_eval import (
+        _load_resources, _resource_stamp, _write_evaluation_json, evaluate_patients,
+    )
+    from cerebralos.reporting.excel_dashboard import (
+        open_excel_dashboard, update_excel_dashboard_ws,
+    )
     from cerebralos.classification.vrc_categories import classify_vrc_categories
 
-    resources = _load_resources()
-    patient_files = sorted(_DATA_DIR.glob("*.txt"))
+    # Names from one directory scan (d_type, no per-entry stat); Paths only
+    # for the files actually evaluated
+    try:
+        with os.scandir(_DATA_DIR) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".txt") and e.is_file())
+    except FileNotFoundError:
+        names = []  # no data_raw/ yet: no patients, as for an empty directory
+    patient_files = [_DATA_DIR / n for n in names]
     excel_path = _PROJECT_ROOT / "outputs" / "trauma_dashboard.xlsx"
 
+    # Reuse up-to-date JSON sidecars (unless --force); only stale patients
+    # are re-evaluated
+    cached: dict = {}
+    if not force:
+        rules_mtime_ns = max(mtime for _, mtime in _resource_stamp())
+        for pf in patient_files:
+            evaluation = _load_fresh_evaluation(pf, rules_mtime_ns)
+            if evaluation is not None:
+                cached[pf] = evaluation
+    stale = [pf for pf in patient_files if pf not in cached]
+    fresh = evaluate_patients(stale, _load_resources()) if stale else iter(())
+
+    # Evaluate across worker processes; rows are applied to one in-memory
+    # workbook and saved once at the end
+    wb = open_excel_dashboard(excel_path)
     for pf in patient_files:
-        print(f"  Evaluating: {pf.name}")
-        evaluation = evaluate_patient(pf, resources)
+        # One buffered write per patient; flushed with the summary below
+        if pf in cached:
+            evaluation = cached.pop(pf)
+            sys.stdout.write(f"  Up to date: {pf.name}\n")
+        else:
+            evaluation = next(fresh)
+            sys.stdout.write(f"  Evaluating: {pf.name}\n")
+            _write_evaluation_json(evaluation, _OUTPUT_DIR / f"{pf.stem}_results.json")
         vrc = classify_vrc_categories(evaluation)
-        update_excel_dashboard(evaluation, vrc, excel_path)
+        update_excel_dashboard_ws(evaluation, vrc, wb)
+    # Run the generator to its end so its process pool shuts down before
+    # the save rather than at garbage collection
+    for _ in fresh:
+        pass
+    wb.save(excel_path)
 
-    print(f"  Excel: {excel_path}")
-    print("Done.")
+    _emit([f"  Excel: {excel_path}", "Done."])
     return 0
 
 
@@ -349,14 +488,19 @@ def cmd_help(args: list) -> int:
     print("Usage: python -m cerebralos <command> [args]")
     print()
     print("Commands:")
-    print("  run <patient.txt> [--protocols] [--ntds] [--sections <keys>]")
+    print("  run <patient.txt> [--protocols] [--ntds] [--no-excel] [--no-open] [--sections <keys>]")
     print("                       Evaluate a single patient (generates all reports)")
     print("                       --protocols: include PROTOCOL SIGNAL SUMMARY in v5")
     print("                       --ntds:      include NTDS SIGNAL SUMMARY in v5")
+    print("                       --no-excel:  skip the Excel dashboard update")
+    print("                       --no-open:   do not open the HTML report (also skipped off a terminal)")
     print("                       --sections:  comma-separated v5 optional section keys")
     print("  run-all              Evaluate all patients in data_raw/")
-    print("  live <patient.txt>   Evaluate an in-hospital patient (provisional mode)")
-    print("  excel                Regenerate Excel dashboard from all patients")
+    print("  live <patient.txt> [--no-open]")
+    print("                       Evaluate an in-hospital patient (provisional mode)")
+    print("  excel [--force]      Regenerate Excel dashboard from all patients")
+    print("                       --force:     re-evaluate patients with up-to-date results")
+    print("                       (re-evaluated patients' outputs/pi_reports/*_results.json are rewritten)")
     print("  help                 Show this help message")
     print()
     print("Examples:")
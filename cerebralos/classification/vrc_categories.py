@@ -15,129 +15,233 @@ Status values:
 """
 from __future__ import annotations
 
+import os
 import re
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick  # optional accelerator; substring checks are the fallback
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # optional linear-time engine, used with CEREBRAL_VRC_RE2=1
+except ImportError:
+    re2 = None
 
 
 # ---------------------------------------------------------------------------
 # Category definitions
 # ---------------------------------------------------------------------------
 
-_VRC_CATEGORIES = [
-    # Neurosurgical Injuries
-    {
-        "id": "NEURO_EPIDURAL_SUBDURAL_TO_OR",
-        "group": "Neurosurgical Injuries",
-        "description": "Epidural/subdural hematoma taken to operating room",
-        "detect_fn": "_check_neuro_hematoma_or",
-    },
-    {
-        "id": "NEURO_SEVERE_TBI_ICU",
-        "group": "Neurosurgical Injuries",
-        "description": "Severe TBI (GCS <= 8) admitted to ICU",
-        "detect_fn": "_check_severe_tbi_icu",
-    },
-    {
-        "id": "NEURO_SPINAL_CORD_DEFICIT",
-        "group": "Neurosurgical Injuries",
-        "description": "Spinal cord injury with neurologic deficit",
-        "detect_fn": "_check_spinal_cord",
-    },
-    # Orthopaedic Injuries
-    {
-        "id": "ORTHO_AMPUTATION",
-        "group": "Orthopaedic Injuries",
-        "description": "Any amputations excluding digits",
-        "detect_fn": "_check_amputation",
-    },
-    {
-        "id": "ORTHO_ACETABULAR_PELVIC",
-        "group": "Orthopaedic Injuries",
-        "description": "Acetabular/pelvic fractures requiring embolization, transfusion, or surgery/ORIF",
-        "detect_fn": "_check_acetabular_pelvic",
-    },
-    {
-        "id": "ORTHO_OPEN_FEMUR_TIBIA",
-        "group": "Orthopaedic Injuries",
-        "description": "Open femur or tibia fractures",
-        "detect_fn": "_check_open_femur_tibia",
-    },
-    # Abdominal & Thoracic Injuries
-    {
-        "id": "ABDTHOR_THORACIC_CARDIAC",
-        "group": "Abdominal & Thoracic Injuries",
-        "description": "Thoracic/cardiac injuries (incl. aortic), AIS >= 3 or requiring intervention",
-        "detect_fn": "_check_thoracic_cardiac",
-    },
-    {
-        "id": "ABDTHOR_SOLID_ORGAN",
-        "group": "Abdominal & Thoracic Injuries",
-        "description": "Solid organ injuries (spleen/liver/kidney/pancreas) >= Grade III or requiring intervention",
-        "detect_fn": "_check_solid_organ",
-    },
-    {
-        "id": "ABDTHOR_PENETRATING",
-        "group": "Abdominal & Thoracic Injuries",
-        "description": "Penetrating neck/torso/proximal extremity trauma, ISS >= 9 or requiring intervention",
-        "detect_fn": "_check_penetrating",
-    },
-    # Non-Surgical Admissions & Transfers
-    {
-        "id": "NONSURG_ISS9",
-        "group": "Non-Surgical Admissions & Transfers",
-        "description": "Patients admitted to non-surgical services with ISS >= 9",
-        "detect_fn": "_check_nonsurg_iss9",
-    },
-    {
-        "id": "NONSURG_GERIATRIC_HIP",
-        "group": "Non-Surgical Admissions & Transfers",
-        "description": "Non-surgical geriatric hip fractures with ISS >= 9",
-        "detect_fn": "_check_geriatric_hip",
-    },
-    {
-        "id": "NONSURG_TRANSFER_OUT",
-        "group": "Non-Surgical Admissions & Transfers",
-        "description": "Transfer out for management of acute injury",
-        "detect_fn": "_check_transfer_out",
-    },
-    # Adverse Events
-    {
-        "id": "ADVERSE_RETURN_SICU_OR",
-        "group": "Adverse Events",
-        "description": "Unexpected return to SICU/PICU or operating room",
-        "detect_fn": "_check_return_sicu_or",
-    },
-    {
-        "id": "ADVERSE_ISS25_SURVIVAL",
-        "group": "Adverse Events",
-        "description": "ISS > 25 with survival, without severe TBI (Head AIS < 3)",
-        "detect_fn": "_check_iss25_survival",
-    },
-    # Massive Transfusion Protocol
-    {
-        "id": "MTP_ACTIVATED",
-        "group": "Massive Transfusion Protocol",
-        "description": "MTP activation criteria, timing of hemorrhage control",
-        "detect_fn": "_check_mtp",
-    },
-    # Hospice
-    {
-        "id": "HOSPICE",
-        "group": "Hospice",
-        "description": "Care provided up to time of transfer for hospice",
-        "detect_fn": "_check_hospice",
-    },
-    # Deaths
-    {
-        "id": "DEATH",
-        "group": "Deaths",
-        "description": "Mortality (with or without opportunity for improvement)",
-        "detect_fn": "_check_death",
-    },
-]
+@dataclass(frozen=True)
+class VrcCategory:
+    """One ACS VRC Medical Record Injury Category.
+
+    Attributes:
+        id: Stable category identifier (e.g. NEURO_SEVERE_TBI_ICU)
+        group: Category group heading
+        description: Human-readable category description
+        detect_fn: Detection function, called as detect_fn(idx, evaluation)
+        required_mask: Keyword bits (see _keyword_mask) of which at least one
+            must be present for detect_fn to find anything; 0 = always run
+        absent_result: What detect_fn returns when none of them is present
+    """
+    id: str
+    group: str
+    description: str
+    detect_fn: Callable[["_SnippetIndex", Dict], "CategoryResult"]
+    required_mask: int = 0
+    absent_result: Optional["CategoryResult"] = None
+
+
+class CategoryResult(NamedTuple):
+    """Outcome of one detection function.
+
+    Attributes:
+        status: YES | NO | POSSIBLE | UNABLE
+        reason: Human-readable explanation
+        evidence_snippets: Supporting snippets (at most three)
+
+    Results may be shared module constants (see ``_NO_HEMATOMA`` and
+    friends); callers must not mutate them.
+    """
+    status: str
+    reason: str
+    evidence_snippets: Sequence[Dict]
 
 
+# ---------------------------------------------------------------------------
+# Patterns (compiled once at import)
+# ---------------------------------------------------------------------------
+#
+# Every pattern is searched against text already lowered by _SnippetIndex,
+# so patterns are written in lowercase and compiled case-sensitively.
+#
+# With CEREBRAL_VRC_RE2=1 (and google-re2 installed) patterns are compiled by
+# RE2, which guarantees linear-time matching, for A/B comparison against re.
+# None of them use backreferences or lookarounds.  Note RE2's \b, \d and \s
+# are ASCII-only where re's are Unicode-aware.
+
+
+def _compile(pattern: str) -> Any:
+    if re2 is not None and os.environ.get("CEREBRAL_VRC_RE2") == "1":
+        return re2.compile(pattern)
+    return re.compile(pattern)
+
+
+# Whitespace is only consumed by one \s* on either side of the optional
+# separator -- a third, optional \s between two \s* runs made a long blank
+# run after "gcs" backtrack super-linearly.  ISS values are parsed by
+# _find_iss rather than a pattern.
+_PAT_GCS = _compile(r'\bgcs\s*(?:(?:of|:)\s*)?(\d{1,2})\b')
+_PAT_OR = _compile(r'\b(?:operating room|taken to or\b|brought to or\b|operative|surgery performed|surgical intervention)')
+_PAT_ICU = _compile(r'\b(?:admitted to icu|icu admission|sicu|micu|picu|transferred to icu|intensive care unit)')
+_PAT_SURGICAL = _compile(r'\b(?:surgery|surgical|operative|orif|arthroplasty|fixation|reduction|laparotomy|thoracotomy|craniotomy)')
+_PAT_HEMATOMA = _compile(r'\b(?:epidural|subdural)\s*(?:hematoma|hemorrhage|bleed)')
+_PAT_CRANIOTOMY = _compile(r'\b(?:craniotomy|craniectomy|hematoma evacuation|burr hole)')
+_PAT_TBI = _compile(r'\b(?:traumatic brain injury|tbi|severe head injury|intracranial hemorrhage)')
+_PAT_SPINAL_CORD = _compile(r'\b(?:spinal cord injury|paraplegia|quadriplegia|tetraplegia|neurologic deficit|cord compression|myelopathy)')
+_PAT_AMPUTATION = _compile(r'\b(?:amputation|amputated)\b')
+_PAT_DIGIT = _compile(r'\b(?:digit|finger|toe|fingertip)\b')
+_PAT_PELVIC_FRACTURE = _compile(r'\b(?:acetabul(?:ar|um)|pelvic|pelvis)\s*(?:fracture|fx)')
+_PAT_PELVIC_INTERVENTION = _compile(r'\b(?:embolization|transfusion|orif|open reduction|internal fixation|surgery)')
+# "open fx" and the bone in either order, within one sentence and 80 characters
+_PAT_OPEN_FEMUR_TIBIA = _compile(
+    r'\bopen\s*(?:fracture|fx)\b[^.]{0,80}\b(?:femur|femoral|tibia|tibial)\b'
+    r'|\b(?:femur|femoral|tibia|tibial)\b[^.]{0,80}\bopen\s*(?:fracture|fx)\b'
+)
+_PAT_FEMUR_TIBIA_FRACTURE = _compile(r'\b(?:femur|femoral|tibia|tibial)\s*(?:fracture|fx)')
+_PAT_THORACIC = _compile(r'\b(?:aortic\s*(?:injury|dissection|transection|tear|rupture)|cardiac\s*injury|thoracotomy|thoracic\s*(?:injury|trauma)|hemothorax|pneumothorax|chest tube|cardiac tamponade|pericardial)')
+_PAT_THORACIC_INTERVENTION = _compile(r'\b(?:intubat|thoracotomy|surgery|chest tube|intervention|embolization|repair)')
+_PAT_SOLID_ORGAN = _compile(r'\b(?:spleen|splenic|liver|hepatic|kidney|renal|pancrea(?:s|tic))\s*(?:injury|laceration|rupture|contusion|hemorrhage|bleed)')
+_PAT_HIGH_GRADE = _compile(r'\bgrade\s*(?:iii|iv|v|3|4|5)\b')
+_PAT_ORGAN_INTERVENTION = _compile(r'\b(?:splenectomy|embolization|transfusion|nephrectomy|laparotomy|surgery|operative)')
+_PAT_PENETRATING = _compile(r'\b(?:penetrating|gunshot|gsw|stab|stab wound|ballistic)\b')
+_PAT_TORSO_LOCATION = _compile(r'\b(?:neck|torso|chest|abdom|trunk|proximal extremity|axilla|groin)\b')
+_PAT_HIP_FRACTURE = _compile(r'\b(?:hip\s*fracture|femoral\s*neck\s*fracture|intertrochanteric|subtrochanteric)')
+_PAT_TRANSFER_OUT = _compile(r'\b(?:transfer(?:red)?\s*(?:to|out)|transported to\s*\w+\s*hospital|accept(?:ed)?\s*(?:by|at))')
+_PAT_RETURN_SICU_OR = _compile(r'\b(?:return(?:ed)?\s*to\s*(?:or|operating room|sicu|icu)|unplanned\s*return|readmit(?:ted)?\s*to\s*(?:icu|sicu)|unexpected\s*return|re-?exploration)')
+_PAT_MTP = _compile(r'\b(?:massive\s*transfusion|mtp|code\s*crimson|massive\s*hemorrhage\s*protocol)')
+_PAT_BLOOD_PRODUCTS = _compile(r'\b(?:prbc|packed red blood cells|ffp|plt|cryoprecipitate|blood products)\b')
+_PAT_HOSPICE = _compile(r'\b(?:hospice|comfort\s*care|comfort\s*measures|palliative|withdrawal\s*of\s*care|withdraw\s*care)')
+_PAT_DEATH = _compile(r'\b(?:expired|time of death|pronounced dead|deceased|death|died|tod\s*:|mortality)\b')
+_PAT_DOB = _compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+# Literal keywords, at least one of which occurs in any text the matching
+# pattern accepts.  Every snippet is scanned for all keywords in one pass
+# (see _keywords_present) and each pattern only runs on snippets holding
+# one of its keywords.  The patterns stay as the final word because their
+# word boundaries and ordering matter ("died" inside "studied", "toe"
+# inside "toenail", "open fx" before or after "tibia").
+_KW_OR = ("operating room", "taken to or", "brought to or", "operative",
+          "surgery performed", "surgical intervention")
+_KW_ICU = ("admitted to icu", "icu admission", "sicu", "micu", "picu",
+           "transferred to icu", "intensive care unit")
+_KW_SURGICAL = ("surg", "operative", "orif", "arthroplasty", "fixation", "reduction",
+                "laparotomy", "thoracotomy", "craniotomy")
+_KW_HEMATOMA = ("epidural", "subdural")
+_KW_CRANIOTOMY = ("craniotomy", "craniectomy", "hematoma evacuation", "burr hole")
+_KW_TBI = ("traumatic brain injury", "tbi", "severe head injury", "intracranial hemorrhage")
+_KW_SPINAL_CORD = ("spinal cord injury", "paraplegia", "quadriplegia", "tetraplegia",
+                   "neurologic deficit", "cord compression", "myelopathy")
+_KW_AMPUTATION = ("amputat",)
+_KW_DIGIT = ("digit", "finger", "toe")
+_KW_PELVIC_FRACTURE = ("acetabul", "pelvi")
+_KW_PELVIC_INTERVENTION = ("embolization", "transfusion", "orif", "open reduction",
+                           "internal fixation", "surgery")
+_KW_FEMUR_TIBIA = ("femur", "femoral", "tibia")
+_KW_THORACIC = ("aortic", "cardiac", "thoracotomy", "thoracic", "hemothorax", "pneumothorax",
+                "chest tube", "pericardial")
+_KW_THORACIC_INTERVENTION = ("intubat", "thoracotomy", "surgery", "chest tube", "intervention",
+                             "embolization", "repair")
+_KW_SOLID_ORGAN = ("spleen", "splenic", "liver", "hepatic", "kidney", "renal", "pancrea")
+_KW_HIGH_GRADE = ("grade",)
+_KW_ORGAN_INTERVENTION = ("splenectomy", "embolization", "transfusion", "nephrectomy",
+                          "laparotomy", "surgery", "operative")
+_KW_PENETRATING = ("penetrating", "gunshot", "gsw", "stab", "ballistic")
+_KW_TORSO_LOCATION = ("neck", "torso", "chest", "abdom", "trunk", "proximal extremity",
+                      "axilla", "groin")
+_KW_HIP_FRACTURE = ("hip", "femoral", "intertrochanteric", "subtrochanteric")
+_KW_TRANSFER_OUT = ("transfer", "transported to", "accept")
+_KW_RETURN_SICU_OR = ("return", "readmit", "exploration")
+_KW_MTP = ("massive", "mtp", "crimson")
+_KW_BLOOD_PRODUCTS = ("prbc", "packed red blood cells", "ffp", "plt", "cryoprecipitate",
+                      "blood products")
+_KW_HOSPICE = ("hospice", "comfort", "palliative", "withdraw")
+_KW_DEATH = ("expired", "death", "pronounced dead", "deceased", "died", "tod", "mortality")
+
+# Patterns matched against whole snippets (via _SnippetIndex.matching[_pairs]),
+# plus the amputation digit filter, with their keywords.
+_PATTERN_KEYWORDS: Dict[re.Pattern, Tuple[str, ...]] = {
+    _PAT_OR: _KW_OR,
+    _PAT_ICU: _KW_ICU,
+    _PAT_SURGICAL: _KW_SURGICAL,
+    _PAT_HEMATOMA: _KW_HEMATOMA,
+    _PAT_CRANIOTOMY: _KW_CRANIOTOMY,
+    _PAT_TBI: _KW_TBI,
+    _PAT_SPINAL_CORD: _KW_SPINAL_CORD,
+    _PAT_AMPUTATION: _KW_AMPUTATION,
+    _PAT_DIGIT: _KW_DIGIT,
+    _PAT_PELVIC_FRACTURE: _KW_PELVIC_FRACTURE,
+    _PAT_PELVIC_INTERVENTION: _KW_PELVIC_INTERVENTION,
+    _PAT_OPEN_FEMUR_TIBIA: _KW_FEMUR_TIBIA,
+    _PAT_FEMUR_TIBIA_FRACTURE: _KW_FEMUR_TIBIA,
+    _PAT_THORACIC: _KW_THORACIC,
+    _PAT_THORACIC_INTERVENTION: _KW_THORACIC_INTERVENTION,
+    _PAT_SOLID_ORGAN: _KW_SOLID_ORGAN,
+    _PAT_HIGH_GRADE: _KW_HIGH_GRADE,
+    _PAT_ORGAN_INTERVENTION: _KW_ORGAN_INTERVENTION,
+    _PAT_PENETRATING: _KW_PENETRATING,
+    _PAT_TORSO_LOCATION: _KW_TORSO_LOCATION,
+    _PAT_HIP_FRACTURE: _KW_HIP_FRACTURE,
+    _PAT_TRANSFER_OUT: _KW_TRANSFER_OUT,
+    _PAT_RETURN_SICU_OR: _KW_RETURN_SICU_OR,
+    _PAT_MTP: _KW_MTP,
+    _PAT_BLOOD_PRODUCTS: _KW_BLOOD_PRODUCTS,
+    _PAT_HOSPICE: _KW_HOSPICE,
+    _PAT_DEATH: _KW_DEATH,
+}
+
+# One bit per pattern; a snippet index ORs together the bits of every
+# pattern whose keyword bucket is non-empty
+_PATTERN_BITS: Dict[re.Pattern, int] = {p: 1 << i for i, p in enumerate(_PATTERN_KEYWORDS)}
+
+
+def _keyword_mask(*patterns: re.Pattern) -> int:
+    """Return the combined keyword bits of the given patterns."""
+    mask = 0
+    for p in patterns:
+        mask |= _PATTERN_BITS[p]
+    return mask
+
+
+_KEYWORDS: Tuple[str, ...] = tuple(sorted({k for kws in _PATTERN_KEYWORDS.values() for k in kws}))
+
+# keyword -> patterns that keyword can admit
+_KEYWORD_PATTERNS: Dict[str, Tuple[re.Pattern, ...]] = {
+    k: tuple(p for p, kws in _PATTERN_KEYWORDS.items() if k in kws) for k in _KEYWORDS
+}
+
+
+
+def _build_keyword_automaton(keywords: Tuple[str, ...]):
+    """Build an Aho-Corasick automaton over the keywords, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for k in keywords:
+        automaton.add_word(k, k)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton(_KEYWORDS)
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -152,346 +256,609 @@ def _all_text(snippets: List[Dict]) -> str:
     return "\n".join(parts).lower()
 
 
-def _snippets_matching(snippets: List[Dict], pattern: re.Pattern) -> List[Dict]:
-    """Return snippets whose text matches the pattern."""
-    matches = []
-    for s in snippets:
-        t = (s.get("text") or "").lower()
-        if pattern.search(t):
-            matches.append(s)
-    return matches
+def _keywords_present(text: str) -> FrozenSet[str]:
+    """Return every keyword in _KEYWORDS that occurs in lowered text."""
+    if not text:
+        return frozenset()
+    if _KEYWORD_AUTOMATON is not None:
+        return frozenset(k for _, k in _KEYWORD_AUTOMATON.iter(text))
+    return frozenset(k for k in _KEYWORDS if k in text)
+
+
+def _keyword_search(text: str, pattern: re.Pattern) -> bool:
+    """Search lowered text, trying the pattern's literal keywords first."""
+    keywords = _PATTERN_KEYWORDS.get(pattern)
+    if keywords is not None and not any(k in text for k in keywords):
+        return False
+    return pattern.search(text) is not None
+
+
+def _is_word_char(c: str) -> bool:
+    """Return whether c is a regex word character (\\w)."""
+    return c.isalnum() or c == "_"
+
+
+def _find_iss(text: str) -> Optional[int]:
+    """
+    Return the first ISS value in lowered text, or None.
+
+    Hand-parses what r'\\biss\\s*(?:(?:of|:|=)\\s*)?(\\d+)\\b' would match:
+    "iss" at a word start, optional whitespace, an optional "of", ":" or "="
+    plus optional whitespace, then digits ending at a word boundary.  The
+    anchors are found with str.find, so text without "iss" is one C scan.
+    """
+    n = len(text)
+    pos = text.find("iss")
+    while pos != -1:
+        if pos == 0 or not _is_word_char(text[pos - 1]):
+            i = pos + 3
+            while i < n and text[i].isspace():
+                i += 1
+            if text.startswith("of", i):
+                j = i + 2
+            elif i < n and text[i] in ":=":
+                j = i + 1
+            else:
+                j = -1
+            if j != -1:
+                while j < n and text[j].isspace():
+                    j += 1
+                if j < n and text[j].isdecimal():
+                    i = j
+            start = i
+            while i < n and text[i].isdecimal():
+                i += 1
+            if i > start and (i == n or not _is_word_char(text[i])):
+                return int(text[start:i])
+        pos = text.find("iss", pos + 1)
+    return None
+
 
+class _SnippetIndex:
+    """
+    One patient's evidence snippets, indexed for the detection functions.
+
+    Each snippet's text is lowered exactly once, into ``lowered`` as
+    (snippet, lowered_text) pairs that every detector reuses.  The keyword
+    scanner then walks each text once and buckets the pair under every
+    pattern one of its keywords admits; snippets with no keyword are never
+    scanned again.  Per-pattern hits are computed on first use and
+    memoized, so each pattern confirms each bucketed snippet at most once.
+    ``by_source`` groups the snippets by source_type, in original order,
+    and the GCS/ISS reductions (``min_gcs``: lowest GCS in 3..15,
+    ``first_iss``: first ISS in chart order) are folded into the same pass.
+    ``present_mask`` has the bit of every pattern with a non-empty bucket.
+    ``now`` is the reference time for ages (None: read the clock).
+    """
 
-def _extract_gcs(snippets: List[Dict]) -> Optional[int]:
+    __slots__ = ("snippets", "now", "lowered", "by_source", "min_gcs", "first_iss", "present_mask",
+                 "_buckets", "_pairs", "_hits", "_any")
+
+    def __init__(self, snippets: List[Dict], now: Optional[datetime] = None):
+        self.snippets = snippets
+        self.now = now
+        self.lowered = [(s, (s.get("text") or "").lower()) for s in snippets]
+        self.by_source: Dict[Optional[str], List[Dict]] = {}
+        for s in snippets:
+            self.by_source.setdefault(s.get("source_type"), []).append(s)
+        self.min_gcs: Optional[int] = None
+        self.first_iss: Optional[int] = None
+        self._buckets: Dict[re.Pattern, List[Tuple[Dict, str]]] = {}
+        for pair in self.lowered:
+            t = pair[1]
+            if "gcs" in t:
+                for m in _PAT_GCS.finditer(t):
+                    v = int(m.group(1))
+                    if 3 <= v <= 15 and (self.min_gcs is None or v < self.min_gcs):
+                        self.min_gcs = v
+            if self.first_iss is None:
+                self.first_iss = _find_iss(t)
+            patterns = set()
+            for k in _keywords_present(t):
+                patterns.update(_KEYWORD_PATTERNS[k])
+            for p in patterns:
+                self._buckets.setdefault(p, []).append(pair)
+        self.present_mask = _keyword_mask(*self._buckets)
+        self._pairs: Dict[re.Pattern, List[Tuple[Dict, str]]] = {}
+        self._hits: Dict[re.Pattern, List[Dict]] = {}
+        self._any: Dict[re.Pattern, bool] = {}
+
+    def matching_pairs(self, pattern: re.Pattern) -> List[Tuple[Dict, str]]:
+        """Return (snippet, lowered_text) pairs matching the pattern (shared; do not mutate).
+
+        The pattern must be registered in _PATTERN_KEYWORDS.
+        """
+        pairs = self._pairs.get(pattern)
+        if pairs is None:
+            pairs = [(s, t) for s, t in self._buckets.get(pattern, ()) if pattern.search(t)]
+            self._pairs[pattern] = pairs
+        return pairs
+
+    def matching(self, pattern: re.Pattern) -> List[Dict]:
+        """Return snippets whose text matches the pattern (shared list; do not mutate)."""
+        hits = self._hits.get(pattern)
+        if hits is None:
+            hits = [s for s, _ in self.matching_pairs(pattern)]
+            self._hits[pattern] = hits
+        return hits
+
+    def any_matching(self, pattern: re.Pattern) -> bool:
+        """Return whether any snippet matches, stopping at the first hit."""
+        pairs = self._pairs.get(pattern)
+        if pairs is not None:
+            return bool(pairs)
+        found = self._any.get(pattern)
+        if found is None:
+            found = any(pattern.search(t) for _, t in self._buckets.get(pattern, ()))
+            self._any[pattern] = found
+        return found
+
+
+def _extract_gcs(idx: _SnippetIndex) -> Optional[int]:
     """Extract the lowest GCS value from evidence blocks."""
-    gcs_pattern = re.compile(r'\bgcs\s*(?:of|:|\s)?\s*(\d{1,2})\b', re.IGNORECASE)
-    values = []
-    for s in snippets:
-        t = s.get("text") or ""
-        for m in gcs_pattern.finditer(t):
-            val = int(m.group(1))
-            if 3 <= val <= 15:
-                values.append(val)
-    return min(values) if values else None
+    return idx.min_gcs
+
+
+def _extract_iss(idx: _SnippetIndex) -> Optional[int]:
+    """Return the first ISS value documented, in chart order."""
+    return idx.first_iss
 
 
-def _extract_age(evaluation: Dict) -> Optional[int]:
-    """Try to extract patient age from DOB or evidence."""
+def _extract_age(evaluation: Dict, now: Optional[datetime] = None) -> Optional[int]:
+    """Try to extract patient age from DOB or evidence, as of ``now`` (default: the clock)."""
     dob = evaluation.get("dob", "")
     if dob:
         # Try to parse DOB and compute age
-        import re as _re
-        m = _re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', dob)
+        m = _PAT_DOB.search(dob)
         if m:
-            from datetime import datetime
             try:
                 birth = datetime(int(m.group(3)), int(m.group(1)), int(m.group(2)))
-                age = (datetime.now() - birth).days // 365
+                age = ((now or datetime.now()) - birth).days // 365
                 return age
             except (ValueError, OverflowError):
                 pass
     return None
 
 
-def _has_or_evidence(snippets: List[Dict]) -> bool:
+def _has_or_evidence(idx: _SnippetIndex) -> bool:
     """Check for operating room evidence."""
-    or_pat = re.compile(r'\b(?:operating room|taken to or\b|brought to or\b|operative|surgery performed|surgical intervention)', re.IGNORECASE)
-    return bool(_snippets_matching(snippets, or_pat))
+    return idx.any_matching(_PAT_OR)
 
 
-def _has_icu_evidence(snippets: List[Dict]) -> bool:
+def _has_icu_evidence(idx: _SnippetIndex) -> bool:
     """Check for ICU admission evidence."""
-    icu_pat = re.compile(r'\b(?:admitted to icu|icu admission|sicu|micu|picu|transferred to icu|intensive care unit)', re.IGNORECASE)
-    return bool(_snippets_matching(snippets, icu_pat))
+    return idx.any_matching(_PAT_ICU)
 
 
-def _has_surgical_evidence(snippets: List[Dict]) -> bool:
+def _has_surgical_evidence(idx: _SnippetIndex) -> bool:
     """Check for any surgical procedure performed."""
-    surg_pat = re.compile(r'\b(?:surgery|surgical|operative|orif|arthroplasty|fixation|reduction|laparotomy|thoracotomy|craniotomy)', re.IGNORECASE)
-    return bool(_snippets_matching(snippets, surg_pat))
+    return idx.any_matching(_PAT_SURGICAL)
+
+
+# ---------------------------------------------------------------------------
+# Fixed negative results
+# ---------------------------------------------------------------------------
+
+# Shared by every call (and by the absent_result of gated categories), so
+# detector results must be treated as read-only.
+_NO_HEMATOMA = CategoryResult("NO", "No epidural/subdural hematoma documented", ())
+_NO_SEVERE_TBI = CategoryResult("NO", "No severe TBI indicators", ())
+_NO_SPINAL_CORD = CategoryResult("NO", "No spinal cord injury documented", ())
+_NO_DIGIT_ONLY_AMPUTATION = CategoryResult("NO", "Only digit amputation documented", ())
+_NO_AMPUTATION = CategoryResult("NO", "No amputation documented", ())
+_NO_PELVIC_FRACTURE = CategoryResult("NO", "No acetabular/pelvic fracture documented", ())
+_NO_FEMUR_TIBIA_FRACTURE = CategoryResult("NO", "No femur/tibia fracture documented", ())
+_NO_THORACIC = CategoryResult("NO", "No thoracic/cardiac injury documented", ())
+_NO_SOLID_ORGAN = CategoryResult("NO", "No solid organ injury documented", ())
+_NO_PENETRATING = CategoryResult("NO", "No penetrating trauma documented", ())
+_NO_SURGICAL_ADMISSION = CategoryResult("NO", "Surgical intervention documented (not non-surgical admission)", ())
+_NO_HIP_FRACTURE = CategoryResult("NO", "No hip fracture documented", ())
+_NO_HIP_SURGICAL = CategoryResult("NO", "Hip fracture with surgical intervention", ())
+_NO_TRANSFER_OUT = CategoryResult("NO", "No transfer out documented", ())
+_NO_RETURN_SICU_OR = CategoryResult("NO", "No return to SICU/OR documented", ())
+_NO_MTP = CategoryResult("NO", "No MTP activation documented", ())
+_NO_HOSPICE = CategoryResult("NO", "No hospice/comfort care documented", ())
+_NO_DEATH = CategoryResult("NO", "No mortality documented", ())
 
 
 # ---------------------------------------------------------------------------
 # Detection functions
 # ---------------------------------------------------------------------------
 
-def _check_neuro_hematoma_or(snippets: List[Dict], evaluation: Dict) -> Dict:
-    hematoma_pat = re.compile(r'\b(?:epidural|subdural)\s*(?:hematoma|hemorrhage|bleed)', re.IGNORECASE)
-    craniotomy_pat = re.compile(r'\b(?:craniotomy|craniectomy|hematoma evacuation|burr hole)', re.IGNORECASE)
-    hematoma_ev = _snippets_matching(snippets, hematoma_pat)
-    craniotomy_ev = _snippets_matching(snippets, craniotomy_pat)
-    if hematoma_ev and (craniotomy_ev or _has_or_evidence(snippets)):
-        return {"status": "YES", "reason": "Epidural/subdural hematoma with OR intervention documented",
-                "evidence_snippets": (hematoma_ev + craniotomy_ev)[:3]}
+def _check_neuro_hematoma_or(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    hematoma_ev = idx.matching(_PAT_HEMATOMA)
+    craniotomy_ev = idx.matching(_PAT_CRANIOTOMY)
+    if hematoma_ev and (craniotomy_ev or _has_or_evidence(idx)):
+        return CategoryResult("YES", "Epidural/subdural hematoma with OR intervention documented",
+                              (hematoma_ev + craniotomy_ev)[:3])
     if hematoma_ev:
-        return {"status": "POSSIBLE", "reason": "Epidural/subdural hematoma documented, OR intervention unclear",
-                "evidence_snippets": hematoma_ev[:2]}
-    return {"status": "NO", "reason": "No epidural/subdural hematoma documented", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", "Epidural/subdural hematoma documented, OR intervention unclear",
+                              hematoma_ev[:2])
+    return _NO_HEMATOMA
 
 
-def _check_severe_tbi_icu(snippets: List[Dict], evaluation: Dict) -> Dict:
-    gcs = _extract_gcs(snippets)
-    has_icu = _has_icu_evidence(snippets)
+def _check_severe_tbi_icu(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    gcs = _extract_gcs(idx)
+    has_icu = _has_icu_evidence(idx)
     if gcs is not None and gcs <= 8 and has_icu:
-        return {"status": "YES", "reason": f"GCS {gcs} with ICU admission", "evidence_snippets": []}
+        return CategoryResult("YES", f"GCS {gcs} with ICU admission", [])
     if gcs is not None and gcs <= 8:
-        return {"status": "POSSIBLE", "reason": f"GCS {gcs} documented, ICU admission unclear",
-                "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", f"GCS {gcs} documented, ICU admission unclear", [])
     if gcs is not None and gcs > 8:
-        return {"status": "NO", "reason": f"GCS {gcs} (> 8)", "evidence_snippets": []}
+        return CategoryResult("NO", f"GCS {gcs} (> 8)", [])
     # Check for TBI language without GCS
-    tbi_pat = re.compile(r'\b(?:traumatic brain injury|tbi|severe head injury|intracranial hemorrhage)', re.IGNORECASE)
-    if _snippets_matching(snippets, tbi_pat) and has_icu:
-        return {"status": "POSSIBLE", "reason": "TBI + ICU documented but GCS value not found",
-                "evidence_snippets": _snippets_matching(snippets, tbi_pat)[:2]}
-    return {"status": "NO", "reason": "No severe TBI indicators", "evidence_snippets": []}
+    if idx.matching(_PAT_TBI) and has_icu:
+        return CategoryResult("POSSIBLE", "TBI + ICU documented but GCS value not found",
+                              idx.matching(_PAT_TBI)[:2])
+    return _NO_SEVERE_TBI
 
 
-def _check_spinal_cord(snippets: List[Dict], evaluation: Dict) -> Dict:
-    sci_pat = re.compile(r'\b(?:spinal cord injury|paraplegia|quadriplegia|tetraplegia|neurologic deficit|cord compression|myelopathy)', re.IGNORECASE)
-    matches = _snippets_matching(snippets, sci_pat)
+def _check_spinal_cord(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_SPINAL_CORD)
     if matches:
-        return {"status": "YES", "reason": "Spinal cord injury with neurologic deficit documented",
-                "evidence_snippets": matches[:3]}
-    return {"status": "NO", "reason": "No spinal cord injury documented", "evidence_snippets": []}
+        return CategoryResult("YES", "Spinal cord injury with neurologic deficit documented", matches[:3])
+    return _NO_SPINAL_CORD
 
 
-def _check_amputation(snippets: List[Dict], evaluation: Dict) -> Dict:
-    amp_pat = re.compile(r'\b(?:amputation|amputated)\b', re.IGNORECASE)
-    digit_pat = re.compile(r'\b(?:digit|finger|toe|fingertip)\b', re.IGNORECASE)
-    matches = _snippets_matching(snippets, amp_pat)
+def _check_amputation(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching_pairs(_PAT_AMPUTATION)
     if matches:
         # Exclude digit-only amputations
-        non_digit = [s for s in matches if not digit_pat.search((s.get("text") or "").lower())]
+        non_digit = [s for s, t in matches if not _keyword_search(t, _PAT_DIGIT)]
         if non_digit:
-            return {"status": "YES", "reason": "Amputation (non-digit) documented",
-                    "evidence_snippets": non_digit[:2]}
-        return {"status": "NO", "reason": "Only digit amputation documented", "evidence_snippets": []}
-    return {"status": "NO", "reason": "No amputation documented", "evidence_snippets": []}
+            return CategoryResult("YES", "Amputation (non-digit) documented", non_digit[:2])
+        return _NO_DIGIT_ONLY_AMPUTATION
+    return _NO_AMPUTATION
 
 
-def _check_acetabular_pelvic(snippets: List[Dict], evaluation: Dict) -> Dict:
-    frac_pat = re.compile(r'\b(?:acetabul(?:ar|um)|pelvic|pelvis)\s*(?:fracture|fx)', re.IGNORECASE)
-    interv_pat = re.compile(r'\b(?:embolization|transfusion|orif|open reduction|internal fixation|surgery)', re.IGNORECASE)
-    frac_ev = _snippets_matching(snippets, frac_pat)
-    interv_ev = _snippets_matching(snippets, interv_pat)
+def _check_acetabular_pelvic(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    frac_ev = idx.matching(_PAT_PELVIC_FRACTURE)
+    interv_ev = idx.matching(_PAT_PELVIC_INTERVENTION)
     if frac_ev and interv_ev:
-        return {"status": "YES", "reason": "Acetabular/pelvic fracture with intervention",
-                "evidence_snippets": (frac_ev + interv_ev)[:3]}
+        return CategoryResult("YES", "Acetabular/pelvic fracture with intervention",
+                              (frac_ev + interv_ev)[:3])
     if frac_ev:
-        return {"status": "POSSIBLE", "reason": "Acetabular/pelvic fracture documented, intervention unclear",
-                "evidence_snippets": frac_ev[:2]}
-    return {"status": "NO", "reason": "No acetabular/pelvic fracture documented", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", "Acetabular/pelvic fracture documented, intervention unclear",
+                              frac_ev[:2])
+    return _NO_PELVIC_FRACTURE
 
 
-def _check_open_femur_tibia(snippets: List[Dict], evaluation: Dict) -> Dict:
-    open_frac_pat = re.compile(r'\bopen\s*(?:fracture|fx)\b.*\b(?:femur|femoral|tibia|tibial)\b', re.IGNORECASE)
-    alt_pat = re.compile(r'\b(?:femur|femoral|tibia|tibial)\b.*\bopen\s*(?:fracture|fx)\b', re.IGNORECASE)
-    matches = _snippets_matching(snippets, open_frac_pat) + _snippets_matching(snippets, alt_pat)
+def _check_open_femur_tibia(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_OPEN_FEMUR_TIBIA)
     if matches:
-        return {"status": "YES", "reason": "Open femur/tibia fracture documented",
-                "evidence_snippets": matches[:2]}
+        return CategoryResult("YES", "Open femur/tibia fracture documented", matches[:2])
     # Check for femur/tibia fracture without "open" qualifier
-    frac_pat = re.compile(r'\b(?:femur|femoral|tibia|tibial)\s*(?:fracture|fx)', re.IGNORECASE)
-    frac_ev = _snippets_matching(snippets, frac_pat)
+    frac_ev = idx.matching(_PAT_FEMUR_TIBIA_FRACTURE)
     if frac_ev:
-        return {"status": "POSSIBLE", "reason": "Femur/tibia fracture documented, open/closed not specified",
-                "evidence_snippets": frac_ev[:2]}
-    return {"status": "NO", "reason": "No femur/tibia fracture documented", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", "Femur/tibia fracture documented, open/closed not specified",
+                              frac_ev[:2])
+    return _NO_FEMUR_TIBIA_FRACTURE
 
 
-def _check_thoracic_cardiac(snippets: List[Dict], evaluation: Dict) -> Dict:
-    thoracic_pat = re.compile(r'\b(?:aortic\s*(?:injury|dissection|transection|tear|rupture)|cardiac\s*injury|thoracotomy|thoracic\s*(?:injury|trauma)|hemothorax|pneumothorax|chest tube|cardiac tamponade|pericardial)', re.IGNORECASE)
-    matches = _snippets_matching(snippets, thoracic_pat)
+def _check_thoracic_cardiac(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_THORACIC)
     if matches:
         # Check for intervention
-        interv_pat = re.compile(r'\b(?:intubat|thoracotomy|surgery|chest tube|intervention|embolization|repair)', re.IGNORECASE)
-        interv_ev = _snippets_matching(snippets, interv_pat)
+        interv_ev = idx.matching(_PAT_THORACIC_INTERVENTION)
         if interv_ev:
-            return {"status": "YES", "reason": "Thoracic/cardiac injury with intervention documented",
-                    "evidence_snippets": (matches + interv_ev)[:3]}
-        return {"status": "POSSIBLE", "reason": "Thoracic/cardiac injury documented, AIS/intervention unclear",
-                "evidence_snippets": matches[:3]}
-    return {"status": "NO", "reason": "No thoracic/cardiac injury documented", "evidence_snippets": []}
-
-
-def _check_solid_organ(snippets: List[Dict], evaluation: Dict) -> Dict:
-    organ_pat = re.compile(r'\b(?:spleen|splenic|liver|hepatic|kidney|renal|pancrea(?:s|tic))\s*(?:injury|laceration|rupture|contusion|hemorrhage|bleed)', re.IGNORECASE)
-    grade_pat = re.compile(r'\bgrade\s*(?:III|IV|V|3|4|5)\b', re.IGNORECASE)
-    interv_pat = re.compile(r'\b(?:splenectomy|embolization|transfusion|nephrectomy|laparotomy|surgery|operative)', re.IGNORECASE)
-    organ_ev = _snippets_matching(snippets, organ_pat)
+            return CategoryResult("YES", "Thoracic/cardiac injury with intervention documented",
+                                  (matches + interv_ev)[:3])
+        return CategoryResult("POSSIBLE", "Thoracic/cardiac injury documented, AIS/intervention unclear",
+                              matches[:3])
+    return _NO_THORACIC
+
+
+def _check_solid_organ(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    organ_ev = idx.matching(_PAT_SOLID_ORGAN)
     if organ_ev:
-        grade_ev = _snippets_matching(snippets, grade_pat)
-        interv_ev = _snippets_matching(snippets, interv_pat)
+        grade_ev = idx.matching(_PAT_HIGH_GRADE)
+        interv_ev = idx.matching(_PAT_ORGAN_INTERVENTION)
         if grade_ev or interv_ev:
-            return {"status": "YES", "reason": "Solid organ injury with high grade or intervention",
-                    "evidence_snippets": (organ_ev + grade_ev + interv_ev)[:3]}
-        return {"status": "POSSIBLE", "reason": "Solid organ injury documented, grade/intervention unclear",
-                "evidence_snippets": organ_ev[:2]}
-    return {"status": "NO", "reason": "No solid organ injury documented", "evidence_snippets": []}
+            return CategoryResult("YES", "Solid organ injury with high grade or intervention",
+                                  (organ_ev + grade_ev + interv_ev)[:3])
+        return CategoryResult("POSSIBLE", "Solid organ injury documented, grade/intervention unclear",
+                              organ_ev[:2])
+    return _NO_SOLID_ORGAN
 
 
-def _check_penetrating(snippets: List[Dict], evaluation: Dict) -> Dict:
-    pen_pat = re.compile(r'\b(?:penetrating|gunshot|gsw|stab|stab wound|ballistic)\b', re.IGNORECASE)
-    location_pat = re.compile(r'\b(?:neck|torso|chest|abdom|trunk|proximal extremity|axilla|groin)\b', re.IGNORECASE)
-    pen_ev = _snippets_matching(snippets, pen_pat)
+def _check_penetrating(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    pen_ev = idx.matching(_PAT_PENETRATING)
     if pen_ev:
-        loc_ev = _snippets_matching(snippets, location_pat)
+        loc_ev = idx.matching(_PAT_TORSO_LOCATION)
         if loc_ev:
-            return {"status": "YES", "reason": "Penetrating trauma to neck/torso documented",
-                    "evidence_snippets": (pen_ev + loc_ev)[:3]}
-        return {"status": "POSSIBLE", "reason": "Penetrating trauma documented, location unclear",
-                "evidence_snippets": pen_ev[:2]}
-    return {"status": "NO", "reason": "No penetrating trauma documented", "evidence_snippets": []}
+            return CategoryResult("YES", "Penetrating trauma to neck/torso documented", (pen_ev + loc_ev)[:3])
+        return CategoryResult("POSSIBLE", "Penetrating trauma documented, location unclear", pen_ev[:2])
+    return _NO_PENETRATING
 
 
-def _check_nonsurg_iss9(snippets: List[Dict], evaluation: Dict) -> Dict:
-    has_surg = _has_surgical_evidence(snippets)
-    iss_pat = re.compile(r'\biss\s*(?:of|:|\s|=)?\s*(\d+)\b', re.IGNORECASE)
-    iss_val = None
-    for s in snippets:
-        t = s.get("text") or ""
-        m = iss_pat.search(t)
-        if m:
-            iss_val = int(m.group(1))
-            break
+def _check_nonsurg_iss9(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    has_surg = _has_surgical_evidence(idx)
+    iss_val = _extract_iss(idx)
     if has_surg:
-        return {"status": "NO", "reason": "Surgical intervention documented (not non-surgical admission)",
-                "evidence_snippets": []}
+        return _NO_SURGICAL_ADMISSION
     if iss_val is not None and iss_val >= 9:
-        return {"status": "YES", "reason": f"Non-surgical admission with ISS {iss_val}",
-                "evidence_snippets": []}
+        return CategoryResult("YES", f"Non-surgical admission with ISS {iss_val}", [])
     if iss_val is not None and iss_val < 9:
-        return {"status": "NO", "reason": f"ISS {iss_val} (< 9)", "evidence_snippets": []}
+        return CategoryResult("NO", f"ISS {iss_val} (< 9)", [])
     if not has_surg:
-        return {"status": "POSSIBLE", "reason": "No surgical intervention found, ISS not documented",
-                "evidence_snippets": []}
-    return {"status": "UNABLE", "reason": "Cannot determine surgical status or ISS", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", "No surgical intervention found, ISS not documented", [])
+    return CategoryResult("UNABLE", "Cannot determine surgical status or ISS", [])
 
 
-def _check_geriatric_hip(snippets: List[Dict], evaluation: Dict) -> Dict:
-    age = _extract_age(evaluation)
-    hip_pat = re.compile(r'\b(?:hip\s*fracture|femoral\s*neck\s*fracture|intertrochanteric|subtrochanteric)', re.IGNORECASE)
-    hip_ev = _snippets_matching(snippets, hip_pat)
-    has_surg = _has_surgical_evidence(snippets)
+def _check_geriatric_hip(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    age = _extract_age(evaluation, idx.now)
+    hip_ev = idx.matching(_PAT_HIP_FRACTURE)
+    has_surg = _has_surgical_evidence(idx)
     if age is not None and age >= 65 and hip_ev and not has_surg:
-        return {"status": "POSSIBLE", "reason": f"Age {age}, hip fracture, no surgery documented, ISS not verified",
-                "evidence_snippets": hip_ev[:2]}
+        return CategoryResult("POSSIBLE", f"Age {age}, hip fracture, no surgery documented, ISS not verified",
+                              hip_ev[:2])
     if hip_ev and not has_surg:
-        return {"status": "POSSIBLE", "reason": "Hip fracture, no surgery documented, age/ISS unclear",
-                "evidence_snippets": hip_ev[:2]}
+        return CategoryResult("POSSIBLE", "Hip fracture, no surgery documented, age/ISS unclear", hip_ev[:2])
     if not hip_ev:
-        return {"status": "NO", "reason": "No hip fracture documented", "evidence_snippets": []}
-    return {"status": "NO", "reason": "Hip fracture with surgical intervention", "evidence_snippets": []}
+        return _NO_HIP_FRACTURE
+    return _NO_HIP_SURGICAL
 
 
-def _check_transfer_out(snippets: List[Dict], evaluation: Dict) -> Dict:
-    transfer_pat = re.compile(r'\b(?:transfer(?:red)?\s*(?:to|out)|transported to\s*\w+\s*hospital|accept(?:ed)?\s*(?:by|at))', re.IGNORECASE)
-    matches = _snippets_matching(snippets, transfer_pat)
+def _check_transfer_out(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_TRANSFER_OUT)
     # Check discharge blocks specifically
-    discharge_transfer = [s for s in matches if s.get("source_type") == "DISCHARGE"]
+    discharge_transfer = []
+    if "DISCHARGE" in idx.by_source:
+        discharge_transfer = [s for s in matches if s.get("source_type") == "DISCHARGE"]
     if discharge_transfer:
-        return {"status": "YES", "reason": "Transfer out documented in discharge",
-                "evidence_snippets": discharge_transfer[:2]}
+        return CategoryResult("YES", "Transfer out documented in discharge", discharge_transfer[:2])
     if matches:
-        return {"status": "POSSIBLE", "reason": "Transfer language found, not in discharge block",
-                "evidence_snippets": matches[:2]}
-    return {"status": "NO", "reason": "No transfer out documented", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", "Transfer language found, not in discharge block", matches[:2])
+    return _NO_TRANSFER_OUT
 
 
-def _check_return_sicu_or(snippets: List[Dict], evaluation: Dict) -> Dict:
-    return_pat = re.compile(r'\b(?:return(?:ed)?\s*to\s*(?:or|operating room|sicu|icu)|unplanned\s*return|readmit(?:ted)?\s*to\s*(?:icu|sicu)|unexpected\s*return|re-?exploration)', re.IGNORECASE)
-    matches = _snippets_matching(snippets, return_pat)
+def _check_return_sicu_or(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_RETURN_SICU_OR)
     if matches:
-        return {"status": "YES", "reason": "Unexpected return to SICU/OR documented",
-                "evidence_snippets": matches[:3]}
+        return CategoryResult("YES", "Unexpected return to SICU/OR documented", matches[:3])
     # Check for multiple OR blocks (possible return)
-    or_blocks = [s for s in snippets if s.get("source_type") in ("OPERATIVE_NOTE", "PROCEDURE")]
-    if len(or_blocks) >= 2:
-        return {"status": "POSSIBLE", "reason": f"Multiple operative blocks ({len(or_blocks)}) — possible return to OR",
-                "evidence_snippets": or_blocks[:2]}
-    return {"status": "NO", "reason": "No return to SICU/OR documented", "evidence_snippets": []}
-
-
-def _check_iss25_survival(snippets: List[Dict], evaluation: Dict) -> Dict:
-    iss_pat = re.compile(r'\biss\s*(?:of|:|\s|=)?\s*(\d+)\b', re.IGNORECASE)
-    iss_val = None
-    for s in snippets:
-        m = iss_pat.search(s.get("text") or "")
-        if m:
-            iss_val = int(m.group(1))
-            break
+    op_notes = idx.by_source.get("OPERATIVE_NOTE", [])
+    procedures = idx.by_source.get("PROCEDURE", [])
+    n_blocks = len(op_notes) + len(procedures)
+    if n_blocks >= 2:
+        if op_notes and procedures:
+            # Both kinds present: keep the chart's interleaving for the evidence
+            or_blocks = [s for s in idx.snippets if s.get("source_type") in ("OPERATIVE_NOTE", "PROCEDURE")]
+        else:
+            or_blocks = op_notes or procedures
+        return CategoryResult("POSSIBLE", f"Multiple operative blocks ({n_blocks}) — possible return to OR",
+                              or_blocks[:2])
+    return _NO_RETURN_SICU_OR
+
+
+def _check_iss25_survival(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    iss_val = _extract_iss(idx)
     has_discharge = evaluation.get("has_discharge", False)
-    gcs = _extract_gcs(snippets)
+    gcs = _extract_gcs(idx)
     if iss_val is not None and iss_val > 25 and has_discharge:
         if gcs is not None and gcs <= 8:
-            return {"status": "NO", "reason": f"ISS {iss_val} but severe TBI (GCS {gcs})",
-                    "evidence_snippets": []}
-        return {"status": "YES", "reason": f"ISS {iss_val} with survival, no severe TBI",
-                "evidence_snippets": []}
+            return CategoryResult("NO", f"ISS {iss_val} but severe TBI (GCS {gcs})", [])
+        return CategoryResult("YES", f"ISS {iss_val} with survival, no severe TBI", [])
     if iss_val is not None and iss_val <= 25:
-        return {"status": "NO", "reason": f"ISS {iss_val} (<= 25)", "evidence_snippets": []}
-    return {"status": "UNABLE", "reason": "ISS not documented", "evidence_snippets": []}
+        return CategoryResult("NO", f"ISS {iss_val} (<= 25)", [])
+    return CategoryResult("UNABLE", "ISS not documented", [])
 
 
-def _check_mtp(snippets: List[Dict], evaluation: Dict) -> Dict:
-    mtp_pat = re.compile(r'\b(?:massive\s*transfusion|mtp|code\s*crimson|massive\s*hemorrhage\s*protocol)', re.IGNORECASE)
-    matches = _snippets_matching(snippets, mtp_pat)
+def _check_mtp(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_MTP)
     if matches:
-        return {"status": "YES", "reason": "Massive Transfusion Protocol activation documented",
-                "evidence_snippets": matches[:3]}
+        return CategoryResult("YES", "Massive Transfusion Protocol activation documented", matches[:3])
     # Check for high volume transfusion
-    transfusion_pat = re.compile(r'\b(?:prbc|packed red blood cells|ffp|plt|cryoprecipitate|blood products)\b', re.IGNORECASE)
-    transfusion_ev = _snippets_matching(snippets, transfusion_pat)
+    transfusion_ev = idx.matching(_PAT_BLOOD_PRODUCTS)
     if len(transfusion_ev) >= 3:
-        return {"status": "POSSIBLE", "reason": f"Multiple blood product references ({len(transfusion_ev)}) — possible MTP",
-                "evidence_snippets": transfusion_ev[:3]}
-    return {"status": "NO", "reason": "No MTP activation documented", "evidence_snippets": []}
+        return CategoryResult("POSSIBLE", f"Multiple blood product references ({len(transfusion_ev)}) — possible MTP",
+                              transfusion_ev[:3])
+    return _NO_MTP
 
 
-def _check_hospice(snippets: List[Dict], evaluation: Dict) -> Dict:
-    hospice_pat = re.compile(r'\b(?:hospice|comfort\s*care|comfort\s*measures|palliative|withdrawal\s*of\s*care|withdraw\s*care)', re.IGNORECASE)
-    matches = _snippets_matching(snippets, hospice_pat)
+def _check_hospice(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_HOSPICE)
     if matches:
-        return {"status": "YES", "reason": "Hospice/comfort care documented",
-                "evidence_snippets": matches[:2]}
-    return {"status": "NO", "reason": "No hospice/comfort care documented", "evidence_snippets": []}
+        return CategoryResult("YES", "Hospice/comfort care documented", matches[:2])
+    return _NO_HOSPICE
 
 
-def _check_death(snippets: List[Dict], evaluation: Dict) -> Dict:
-    death_pat = re.compile(r'\b(?:expired|time of death|pronounced dead|deceased|death|died|tod\s*:|mortality)\b', re.IGNORECASE)
-    matches = _snippets_matching(snippets, death_pat)
+def _check_death(idx: _SnippetIndex, evaluation: Dict) -> CategoryResult:
+    matches = idx.matching(_PAT_DEATH)
     if matches:
-        return {"status": "YES", "reason": "Mortality documented",
-                "evidence_snippets": matches[:3]}
-    return {"status": "NO", "reason": "No mortality documented", "evidence_snippets": []}
+        return CategoryResult("YES", "Mortality documented", matches[:3])
+    return _NO_DEATH
 
 
 # ---------------------------------------------------------------------------
 # Dispatcher
 # ---------------------------------------------------------------------------
 
-_DETECT_FNS = {
-    "_check_neuro_hematoma_or": _check_neuro_hematoma_or,
-    "_check_severe_tbi_icu": _check_severe_tbi_icu,
-    "_check_spinal_cord": _check_spinal_cord,
-    "_check_amputation": _check_amputation,
-    "_check_acetabular_pelvic": _check_acetabular_pelvic,
-    "_check_open_femur_tibia": _check_open_femur_tibia,
-    "_check_thoracic_cardiac": _check_thoracic_cardiac,
-    "_check_solid_organ": _check_solid_organ,
-    "_check_penetrating": _check_penetrating,
-    "_check_nonsurg_iss9": _check_nonsurg_iss9,
-    "_check_geriatric_hip": _check_geriatric_hip,
-    "_check_transfer_out": _check_transfer_out,
-    "_check_return_sicu_or": _check_return_sicu_or,
-    "_check_iss25_survival": _check_iss25_survival,
-    "_check_mtp": _check_mtp,
-    "_check_hospice": _check_hospice,
-    "_check_death": _check_death,
+# Categories in report order, each bound directly to its detection function
+_VRC_CATEGORIES: Tuple[VrcCategory, ...] = (
+    # Neurosurgical Injuries
+    VrcCategory(
+        id="NEURO_EPIDURAL_SUBDURAL_TO_OR",
+        group="Neurosurgical Injuries",
+        description="Epidural/subdural hematoma taken to operating room",
+        detect_fn=_check_neuro_hematoma_or,
+        required_mask=_keyword_mask(_PAT_HEMATOMA),
+        absent_result=_NO_HEMATOMA,
+    ),
+    VrcCategory(
+        id="NEURO_SEVERE_TBI_ICU",
+        group="Neurosurgical Injuries",
+        description="Severe TBI (GCS <= 8) admitted to ICU",
+        detect_fn=_check_severe_tbi_icu,
+    ),
+    VrcCategory(
+        id="NEURO_SPINAL_CORD_DEFICIT",
+        group="Neurosurgical Injuries",
+        description="Spinal cord injury with neurologic deficit",
+        detect_fn=_check_spinal_cord,
+        required_mask=_keyword_mask(_PAT_SPINAL_CORD),
+        absent_result=_NO_SPINAL_CORD,
+    ),
+    # Orthopaedic Injuries
+    VrcCategory(
+        id="ORTHO_AMPUTATION",
+        group="Orthopaedic Injuries",
+        description="Any amputations excluding digits",
+        detect_fn=_check_amputation,
+        required_mask=_keyword_mask(_PAT_AMPUTATION),
+        absent_result=_NO_AMPUTATION,
+    ),
+    VrcCategory(
+        id="ORTHO_ACETABULAR_PELVIC",
+        group="Orthopaedic Injuries",
+        description="Acetabular/pelvic fractures requiring embolization, transfusion, or surgery/ORIF",
+        detect_fn=_check_acetabular_pelvic,
+        required_mask=_keyword_mask(_PAT_PELVIC_FRACTURE),
+        absent_result=_NO_PELVIC_FRACTURE,
+    ),
+    VrcCategory(
+        id="ORTHO_OPEN_FEMUR_TIBIA",
+        group="Orthopaedic Injuries",
+        description="Open femur or tibia fractures",
+        detect_fn=_check_open_femur_tibia,
+        required_mask=_keyword_mask(_PAT_OPEN_FEMUR_TIBIA, _PAT_FEMUR_TIBIA_FRACTURE),
+        absent_result=_NO_FEMUR_TIBIA_FRACTURE,
+    ),
+    # Abdominal & Thoracic Injuries
+    VrcCategory(
+        id="ABDTHOR_THORACIC_CARDIAC",
+        group="Abdominal & Thoracic Injuries",
+        description="Thoracic/cardiac injuries (incl. aortic), AIS >= 3 or requiring intervention",
+        detect_fn=_check_thoracic_cardiac,
+        required_mask=_keyword_mask(_PAT_THORACIC),
+        absent_result=_NO_THORACIC,
+    ),
+    VrcCategory(
+        id="ABDTHOR_SOLID_ORGAN",
+        group="Abdominal & Thoracic Injuries",
+        description="Solid organ injuries (spleen/liver/kidney/pancreas) >= Grade III or requiring intervention",
+        detect_fn=_check_solid_organ,
+        required_mask=_keyword_mask(_PAT_SOLID_ORGAN),
+        absent_result=_NO_SOLID_ORGAN,
+    ),
+    VrcCategory(
+        id="ABDTHOR_PENETRATING",
+        group="Abdominal & Thoracic Injuries",
+        description="Penetrating neck/torso/proximal extremity trauma, ISS >= 9 or requiring intervention",
+        detect_fn=_check_penetrating,
+        required_mask=_keyword_mask(_PAT_PENETRATING),
+        absent_result=_NO_PENETRATING,
+    ),
+    # Non-Surgical Admissions & Transfers
+    VrcCategory(
+        id="NONSURG_ISS9",
+        group="Non-Surgical Admissions & Transfers",
+        description="Patients admitted to non-surgical services with ISS >= 9",
+        detect_fn=_check_nonsurg_iss9,
+    ),
+    VrcCategory(
+        id="NONSURG_GERIATRIC_HIP",
+        group="Non-Surgical Admissions & Transfers",
+        description="Non-surgical geriatric hip fractures with ISS >= 9",
+        detect_fn=_check_geriatric_hip,
+        required_mask=_keyword_mask(_PAT_HIP_FRACTURE),
+        absent_result=_NO_HIP_FRACTURE,
+    ),
+    VrcCategory(
+        id="NONSURG_TRANSFER_OUT",
+        group="Non-Surgical Admissions & Transfers",
+        description="Transfer out for management of acute injury",
+        detect_fn=_check_transfer_out,
+        required_mask=_keyword_mask(_PAT_TRANSFER_OUT),
+        absent_result=_NO_TRANSFER_OUT,
+    ),
+    # Adverse Events
+    VrcCategory(
+        id="ADVERSE_RETURN_SICU_OR",
+        group="Adverse Events",
+        description="Unexpected return to SICU/PICU or operating room",
+        detect_fn=_check_return_sicu_or,
+    ),
+    VrcCategory(
+        id="ADVERSE_ISS25_SURVIVAL",
+        group="Adverse Events",
+        description="ISS > 25 with survival, without severe TBI (Head AIS < 3)",
+        detect_fn=_check_iss25_survival,
+    ),
+    # Massive Transfusion Protocol
+    VrcCategory(
+        id="MTP_ACTIVATED",
+        group="Massive Transfusion Protocol",
+        description="MTP activation criteria, timing of hemorrhage control",
+        detect_fn=_check_mtp,
+        required_mask=_keyword_mask(_PAT_MTP, _PAT_BLOOD_PRODUCTS),
+        absent_result=_NO_MTP,
+    ),
+    # Hospice
+    VrcCategory(
+        id="HOSPICE",
+        group="Hospice",
+        description="Care provided up to time of transfer for hospice",
+        detect_fn=_check_hospice,
+        required_mask=_keyword_mask(_PAT_HOSPICE),
+        absent_result=_NO_HOSPICE,
+    ),
+    # Deaths
+    VrcCategory(
+        id="DEATH",
+        group="Deaths",
+        description="Mortality (with or without opportunity for improvement)",
+        detect_fn=_check_death,
+        required_mask=_keyword_mask(_PAT_DEATH),
+        absent_result=_NO_DEATH,
+    ),
+)
+
+
+def _run_detectors(idx: _SnippetIndex, evaluation: Dict) -> List[Dict]:
+    """Run every category's detection function, in category order.
+
+    Categories none of whose required keywords occur in the chart take
+    their precomputed absent_result without calling the detector.
+    """
+    present = idx.present_mask
+    needed = [cat for cat in _VRC_CATEGORIES
+              if not cat.required_mask or cat.required_mask & present]
+    found = {cat.id: cat.detect_fn(idx, evaluation) for cat in needed}
+    return [found.get(cat.id, cat.absent_result) for cat in _VRC_CATEGORIES]
+
+
+# The fixed leading fields of each category's result dict, copied into every
+# result with one unpack.
+_CAT_RESULT_TEMPLATES: Dict[str, Mapping[str, str]] = {
+    cat.id: MappingProxyType({
+        "category_id": cat.id,
+        "category_group": cat.group,
+        "description": cat.description,
+    })
+    for cat in _VRC_CATEGORIES
 }
 
 
+def _classify(evaluation: Dict[str, Any], today: date) -> List[Dict[str, Any]]:
+    """Build one patient's category results, with ages computed as of ``today``."""
+    idx = _SnippetIndex(
+        evaluation.get("all_evidence_snippets", []),
+        now=datetime.combine(today, datetime.min.time()),
+    )
+    outcomes = _run_detectors(idx, evaluation)
+    return [
+        {
+            **_CAT_RESULT_TEMPLATES[cat.id],
+            "status": r.status,
+            "reason": r.reason,
+            # A fresh list: shared absent results must not be mutated through it
+            "evidence_snippets": list(r.evidence_snippets),
+        }
+        for cat, r in zip(_VRC_CATEGORIES, outcomes)
+    ]
+
+
 def classify_vrc_categories(
     evaluation: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
@@ -505,30 +872,21 @@ def classify_vrc_categories(
         List of category result dicts with keys:
             category_id, category_group, description, status, reason, evidence_snippets
     """
-    snippets = evaluation.get("all_evidence_snippets", [])
-    results = []
-
-    for cat in _VRC_CATEGORIES:
-        fn = _DETECT_FNS.get(cat["detect_fn"])
-        if fn is None:
-            results.append({
-                "category_id": cat["id"],
-                "category_group": cat["group"],
-                "description": cat["description"],
-                "status": "UNABLE",
-                "reason": "Detection function not found",
-                "evidence_snippets": [],
-            })
-            continue
-
-        result = fn(snippets, evaluation)
-        results.append({
-            "category_id": cat["id"],
-            "category_group": cat["group"],
-            "description": cat["description"],
-            "status": result["status"],
-            "reason": result["reason"],
-            "evidence_snippets": result.get("evidence_snippets", []),
-        })
-
-    return results
+    return _classify(evaluation, date.today())
+
+
+def classify_vrc_categories_batch(
+    evaluations: List[Dict[str, Any]],
+) -> List[List[Dict[str, Any]]]:
+    """
+    Classify several patients against one reference date.
+
+    Equivalent to calling classify_vrc_categories() per patient, except that
+    the date is read once, so every age in the batch is computed against the
+    same day even across midnight.
+
+    Returns:
+        One result list per evaluation, in input order.
+    """
+    today = date.today()
+    return [_classify(ev, today) for ev in evaluations]
@@ -20,17 +20,67 @@ Detection sources:
 """
 from __future__ import annotations
 
+import gzip
+import io
 import json
-from dataclasses import asdict, dataclass
+import json.encoder
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any, AnyStr, BinaryIO, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union,
+)
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional accelerator; gzip is the fallback
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # optional; only needed for format="msgpack"
+    msgpack = None
+
+__all__ = [
+    "FailureEntry",
+    "FailureLog",
+    "failure_log_to_jsonl",
+    "log_unanchored_evidence",
+    "log_missing_required_element",
+    "log_negation_miss",
+    "log_historical_false_trigger",
+    "log_unanchored_evidence_many",
+    "log_missing_required_element_many",
+    "log_negation_miss_many",
+    "log_historical_false_trigger_many",
+]
 
 
 @dataclass
 class FailureEntry:
-    """A single governance failure record."""
-    timestamp: str           # ISO 8601 timestamp
+    """
+    A single governance failure record.
+
+    ``timestamp`` is normally the ISO 8601 local time the log_* helpers
+    write, but an int of microseconds since the epoch is also accepted and
+    stored as a JSON number; timestamp_us and timestamp_iso read either.
+    """
+    timestamp: Union[str, int]  # ISO 8601 timestamp, or epoch microseconds
     section: str             # Governance section that was violated (e.g., "19A", "evidence_anchor")
     category: str            # "rule", "drift", "structural"
     description: str         # Factual, non-interpretive description
@@ -40,162 +90,992 @@ class FailureEntry:
     protocol_id: Optional[str] = None  # Protocol identifier if applicable
     metadata: Optional[Dict[str, Any]] = None  # Additional structured data
 
+    @property
+    def timestamp_us(self) -> int:
+        """Microseconds since the epoch; naive ISO timestamps are local time."""
+        ts = self.timestamp
+        if isinstance(ts, int):
+            return ts
+        dt = datetime.fromisoformat(ts)
+        # Whole seconds through timestamp(), so float rounding cannot touch the microseconds
+        return int(dt.replace(microsecond=0).timestamp()) * 1_000_000 + dt.microsecond
+
+    @property
+    def timestamp_iso(self) -> str:
+        """The timestamp as ISO 8601 local time, as the log_* helpers write it."""
+        ts = self.timestamp
+        if not isinstance(ts, int):
+            return ts
+        sec, us = divmod(ts, 1_000_000)
+        return datetime.fromtimestamp(sec).replace(microsecond=us).isoformat()
+
 
 _DEFAULT_LOG_PATH = Path("outputs") / "failure_log.jsonl"
 
+# Buffer size of the handle a FailureLog holds open inside a ``with`` block
+_WRITE_BUFFER_SIZE = 64 * 1024
+_READ_BUFFER_SIZE = 1 << 20
+
+# Open flags for durable logs; 0 where the platform lacks them
+_O_DSYNC = getattr(os, "O_DSYNC", 0)
+_O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+# Appends between size checks of a log with rotate_bytes set
+_ROTATE_CHECK_INTERVAL = 64
+
+# A coalescing buffer grown past this by one large burst is released afterwards
+_SCRATCH_MAX_SIZE = 128 * 1024
+
+# A newline that ends a whitespace-only line (the first line is checked
+# separately, as it has no newline before it)
+_BLANK_LINE = re.compile(rb'\n[ \t\r\f\v]*(?=\n)')
+_LEADING_BLANK_LINE = re.compile(rb'[ \t\r\f\v]*\n')
+
+# A whole record as _serialize writes it (ASCII only, an ISO string or integer
+# timestamp, optional ids and a flat metadata dict of scalars), capturing an
+# unescaped category.  summary() takes the category of a line that matches it
+# in full and parses every other line, so torn or run-together records are
+# rejected exactly as read_all() rejects them.
+_JSON_STR = rb'"(?:[\x20\x21\x23-\x5b\x5d-\x7e]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*"'
+_JSON_INT = rb'-?(?:0|[1-9][0-9]*)'
+_JSON_SCALAR = rb'(?:' + _JSON_STR + rb'|' + _JSON_INT + rb'|true|false|null)'
+_RECORD = re.compile(
+    rb'\{"timestamp": (?:' + _JSON_STR + rb'|' + _JSON_INT + rb')'
+    rb', "section": ' + _JSON_STR
+    + rb', "category": "([\x20\x21\x23-\x5b\x5d-\x7e]*)"'
+    rb', "description": ' + _JSON_STR
+    + rb', "command": ' + _JSON_STR
+    + rb', "detection_source": ' + _JSON_STR
+    + rb'(?:, "patient_id": (?:' + _JSON_STR + rb'|' + _JSON_INT + rb'))?'
+    rb'(?:, "protocol_id": (?:' + _JSON_STR + rb'|' + _JSON_INT + rb'))?'
+    rb'(?:, "metadata": \{(?:' + _JSON_STR + rb': ' + _JSON_SCALAR
+    + rb'(?:, ' + _JSON_STR + rb': ' + _JSON_SCALAR + rb')*)?\})?'
+    rb'\}\n?'
+)
+
+_FIELDS = tuple(f.name for f in fields(FailureEntry))
+
+
+# category, section and detection_source take a handful of values, so parsed
+# entries share one string object per value.  The values documented on
+# FailureEntry are looked up here before falling back to sys.intern.
+_INTERN = {
+    value: value
+    for value in (
+        "rule", "drift", "structural",
+        "execution", "diagnostic", "governance_checklist",
+        "evidence_anchor", "negation_detection", "historical_filtering",
+    )
+}
+
+
+def _intern(value: Any) -> Any:
+    if type(value) is not str:
+        return value  # hand-edited record; keep what was written
+    cached = _INTERN.get(value)
+    return cached if cached is not None else sys.intern(value)
+
+
+def _entry_from_record(data: Dict[str, Any]) -> FailureEntry:
+    """FailureEntry for a parsed record, filling its fields without __init__."""
+    get = data.get
+    entry = FailureEntry.__new__(FailureEntry)
+    # Unrolled over FailureEntry's fields: required ones default to ""
+    entry.__dict__ = {
+        "timestamp": get("timestamp", ""),
+        "section": _intern(get("section", "")),
+        "category": _intern(get("category", "")),
+        "description": get("description", ""),
+        "command": get("command", ""),
+        "detection_source": _intern(get("detection_source", "")),
+        "patient_id": get("patient_id"),
+        "protocol_id": get("protocol_id"),
+        "metadata": get("metadata"),
+    }
+    return entry
+
+
+def _loads(data: Any) -> Any:
+    """Parse one record, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # orjson rejects NaN and lone surrogates, which json.dumps can write
+    return json.loads(data)
+
+
+_KEY_PREFIXES = {name: json.dumps(name) + ": " for name in _FIELDS}
+_encode_str = json.encoder.encode_basestring_ascii
+# json.dumps(value, default=str) builds this encoder on every call
+_encode_other = json.JSONEncoder(default=str).encode
+
+
+def _json(value: Any) -> str:
+    """``value`` exactly as json.dumps(..., default=str) writes it."""
+    if type(value) is str:
+        return _encode_str(value)
+    return _encode_other(value)
+
+
+def _fragment(name: str, value: Any) -> str:
+    """``"name": value`` exactly as json.dumps(..., default=str) writes it."""
+    return _KEY_PREFIXES[name] + _json(value)
+
+
+def _serialize(entry: FailureEntry) -> bytes:
+    """One JSON Lines record for ``entry``, None fields omitted."""
+    d = entry.__dict__
+    timestamp, section, category = d["timestamp"], d["section"], d["category"]
+    description, command, detection_source = d["description"], d["command"], d["detection_source"]
+    if (timestamp is None or section is None or category is None
+            or description is None or command is None or detection_source is None):
+        parts = [_fragment(k, d[k]) for k in _FIELDS if d[k] is not None]
+        return ("{" + ", ".join(parts) + "}\n").encode("ascii")
+    # Unrolled over FailureEntry's fields for the usual all-required record
+    out = ['{"timestamp": ', _json(timestamp),
+           ', "section": ', _json(section),
+           ', "category": ', _json(category),
+           ', "description": ', _json(description),
+           ', "command": ', _json(command),
+           ', "detection_source": ', _json(detection_source)]
+    value = d["patient_id"]
+    if value is not None:
+        out += (', "patient_id": ', _json(value))
+    value = d["protocol_id"]
+    if value is not None:
+        out += (', "protocol_id": ', _json(value))
+    value = d["metadata"]
+    if value is not None:
+        out += (', "metadata": ', _json(value))
+    out.append("}\n")
+    return "".join(out).encode("ascii")
+
+
+class _PendingWrite:
+    """One append's records, queued until a lock holder writes them."""
+
+    __slots__ = ("buf", "done", "error")
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.done = False
+        self.error: Optional[BaseException] = None
+
 
 class FailureLog:
     """
     Append-only governance failure log.
 
-    Thread-safe for single-process usage (file append is atomic on most OSes).
+    Thread-safe for single-process usage.  Concurrent appends are group
+    committed: each thread queues its records, and whichever thread holds the
+    write lock writes everything queued so far in one call, so threads that
+    pile up behind it usually find their records already written.  If that
+    write fails, every thread whose records it carried raises the error.
+
+    Used as a context manager, the log keeps one buffered handle open for the
+    duration of the block, so a burst of appends costs a few large writes
+    instead of an open/write/close per entry; leaving the block flushes and
+    closes it.  Outside a ``with`` block every append is written immediately.
+
+    With ``durable=True`` the file is opened O_APPEND | O_DSYNC, so each write
+    returns only once its data is on stable storage, without a separate fsync
+    (and, for appends that do not grow the file's allocated extents, without
+    a metadata journal commit).  Every append then waits on the device; when
+    losing the last few entries on a crash is acceptable, the default plus a
+    periodic ``flush(fsync=True)`` is much cheaper.  Where O_DSYNC is not
+    available each write is followed by an fsync instead.
+
+    With ``rotate_bytes`` set, once the active file grows past that size it
+    is renamed to ``<stem>.<N>.jsonl`` and compressed in the background
+    (zstd when zstandard is installed, otherwise gzip), and the totals of
+    every rotated segment are kept in ``<stem>.index.json``.
+    count() and summary() then read the index plus the active file only;
+    iter_entries() still yields every segment, oldest first.
+
+    With ``preallocate_bytes`` set, the file is grown in zero-filled steps of
+    that size (posix_fallocate where available) and records are written in
+    place with pwrite, so steady-state appends do not extend the file and
+    touch no extent metadata -- cheapest combined with ``durable=True``.
+    Readers stop where the trailing run of NUL bytes begins, so the zero
+    tail is never read as records, and a writer recovers its offset the same
+    way; NULs earlier in the file (left by a crash) only cost the debris
+    they overwrote.  A preallocated
+    log must have a single writer at a time; hold it open in a ``with`` block
+    so the offset is found once rather than on every append.  A log opened
+    without ``preallocate_bytes`` on a file that still has a zero tail
+    writes in place too, rather than appending after the zeros.
+
+    With ``format="msgpack"`` (requires the msgpack package) each record is
+    written as a MessagePack map behind a 4-byte little-endian length, which
+    is smaller and quicker to encode and decode than JSON for machine
+    consumers.  Such a log cannot be rotated or preallocated, and count()
+    and summary() decode every record; failure_log_to_jsonl() converts it
+    back to JSON Lines.
     """
 
-    def __init__(self, log_path: Optional[Path] = None):
+    def __init__(
+        self,
+        log_path: Optional[Path] = None,
+        durable: bool = False,
+        rotate_bytes: Optional[int] = None,
+        preallocate_bytes: Optional[int] = None,
+        format: str = "jsonl",
+    ):
+        if format not in ("jsonl", "msgpack"):
+            raise ValueError(f"unknown failure log format {format!r}")
+        if format == "msgpack":
+            if msgpack is None:
+                raise ImportError('format="msgpack" requires the msgpack package')
+            if rotate_bytes is not None or preallocate_bytes is not None:
+                raise ValueError('rotate_bytes and preallocate_bytes require format="jsonl"')
         self._path = log_path or _DEFAULT_LOG_PATH
+        self._format = format
+        self._durable = durable
+        self._rotate_bytes = rotate_bytes
+        self._preallocate_bytes = preallocate_bytes
+        # Whether records are pwritten at the data end rather than appended
+        self._in_place = preallocate_bytes is not None
+        self._fd: Optional[int] = None
+        self._offset = 0
+        self._size_checked = False
+        self._writes_since_size_check = 0
+        self._compressor: Optional[threading.Thread] = None
+        self._parent_created = False
+        self._keep_open = False
+        self._fh: Optional[BinaryIO] = None
+        self._pending: Deque[_PendingWrite] = deque()
+        self._scratch = bytearray()
+        self._write_lock = threading.Lock()
+
+    def __enter__(self) -> "FailureLog":
+        self._keep_open = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     @property
     def path(self) -> Path:
         return self._path
 
+    def flush(self, fsync: bool = False) -> None:
+        """Write out buffered entries, optionally forcing them to disk."""
+        with self._write_lock:
+            if self._fd is not None and fsync:
+                os.fsync(self._fd)
+            if self._fh is None:
+                return
+            self._fh.flush()
+            if fsync:
+                os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        """Flush and close the held handle; later appends open per call."""
+        with self._write_lock:
+            self._keep_open = False
+            self._release_handles()
+            if self._compressor is not None:
+                self._compressor.join()
+                self._compressor = None
+
+    def _release_handles(self) -> None:
+        """Close whatever handle is held; the next append reopens lazily."""
+        if self._fh is not None:
+            fh, self._fh = self._fh, None
+            fh.close()
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
+
+    def _ensure_parent(self) -> None:
+        if not self._parent_created:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._parent_created = True
+
+    def _open_append(self, buffering: int) -> Optional[BinaryIO]:
+        """Open the log for appending; None if it ends in a preallocated zero tail."""
+        # Opened readable as well, so the tail is checked on the same handle
+        if not self._durable:
+            f = open(self._path, "a+b", buffering=buffering)
+        else:
+            flags = os.O_RDWR | os.O_CREAT | os.O_APPEND | _O_DSYNC | _O_CLOEXEC
+            f = os.fdopen(os.open(self._path, flags, 0o644), "a+b", buffering=buffering)
+        if _has_zero_tail(f.fileno()):
+            f.close()
+            return None
+        return f
+
+    @staticmethod
+    def _sync(f: BinaryIO) -> None:
+        f.flush()  # with O_DSYNC, the write itself is the sync
+        if not _O_DSYNC:
+            os.fsync(f.fileno())
+
     def append(self, entry: FailureEntry) -> None:
         """Append a failure entry to the log file."""
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        record = asdict(entry)
-        # Remove None values for cleaner output
-        record = {k: v for k, v in record.items() if v is not None}
-        with open(self._path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, default=str) + "\n")
+        self.append_many([entry])
+
+    def append_many(self, entries: Iterable[FailureEntry]) -> None:
+        """Append several failure entries with a single open and write."""
+        serialize = _pack if self._format == "msgpack" else _serialize
+        self._write(b"".join(serialize(e) for e in entries))
+
+    def _write_jsonl(self, buf: bytes) -> None:
+        """Append JSON Lines records rendered by the log_* helpers."""
+        if self._format == "msgpack":
+            buf = b"".join(_pack_record(json.loads(line)) for line in buf.splitlines())
+        self._write(buf)
+
+    def _write(self, buf: bytes) -> None:
+        """Append records already serialized in this log's format."""
+        if not buf:
+            return
+        pending = _PendingWrite(buf)
+        self._pending.append(pending)
+        with self._write_lock:
+            # Another thread may already have written ours along with its own,
+            # and then its error is ours too
+            if pending.done:
+                if pending.error is not None:
+                    raise pending.error
+                return
+            batch = list(self._pending)
+            for _ in batch:
+                self._pending.popleft()
+            if len(batch) == 1:
+                buf = pending.buf
+            else:
+                # Coalesce into the reused scratch buffer rather than a new bytes
+                buf = self._scratch
+                buf.clear()
+                for queued in batch:
+                    buf += queued.buf
+            try:
+                self._write_batch(buf)
+            except BaseException as exc:
+                for queued in batch:
+                    queued.error = exc
+                raise
+            finally:
+                for queued in batch:
+                    queued.done = True
+            if len(self._scratch) > _SCRATCH_MAX_SIZE:
+                self._scratch = bytearray()
+            if self._rotate_bytes is not None:
+                self._writes_since_size_check += 1
+                if (not self._size_checked
+                        or self._writes_since_size_check >= _ROTATE_CHECK_INTERVAL):
+                    self._size_checked = True
+                    self._writes_since_size_check = 0
+                    self._maybe_rotate()
+
+    def _write_batch(self, buf: bytes) -> None:
+        """Write one coalesced batch.  Caller holds the write lock."""
+        self._ensure_parent()
+        if not self._in_place:
+            f = self._fh
+            if f is None:
+                f = self._open_append(_WRITE_BUFFER_SIZE if self._keep_open else -1)
+            if f is None:
+                self._in_place = True  # zero tail left by a preallocated writer
+            elif self._keep_open:
+                self._fh = f
+                f.write(buf)
+                if self._durable:
+                    self._sync(f)
+            else:
+                with f:
+                    f.write(buf)
+                    if self._durable:
+                        self._sync(f)
+        if self._in_place:
+            self._write_preallocated(buf)
+
+    def _write_preallocated(self, buf: bytes) -> None:
+        """pwrite ``buf`` at the data end, growing the file a step at a time."""
+        fd = self._fd
+        if fd is None:
+            flags = os.O_RDWR | os.O_CREAT | _O_CLOEXEC | (_O_DSYNC if self._durable else 0)
+            fd = os.open(self._path, flags, 0o644)
+            self._offset, torn = _find_data_end(fd)
+            if torn:
+                buf = b"\n" + buf  # end a record cut short by a crash
+        try:
+            size = os.fstat(fd).st_size
+            end = self._offset + len(buf)
+            step = self._preallocate_bytes
+            if end > size and step is not None:
+                _allocate(fd, size, -(-end // step) * step - size)
+            while buf:
+                n = _pwrite(fd, buf, self._offset)
+                self._offset += n
+                buf = buf[n:]
+            if self._durable and not _O_DSYNC:
+                os.fsync(fd)
+        finally:
+            if self._keep_open:
+                self._fd = fd
+            else:
+                os.close(fd)
+
+    def _maybe_rotate(self) -> None:
+        """Rotate the active file if it is over size.  Caller holds the write lock."""
+        if self._in_place:
+            if self._fd is not None:
+                size = self._offset
+            else:
+                fd = os.open(self._path, os.O_RDONLY | _O_CLOEXEC)
+                try:
+                    size = _find_data_end(fd)[0]
+                finally:
+                    os.close(fd)
+        else:
+            # tell() on the held handle includes bytes still in its buffer
+            size = self._fh.tell() if self._fh is not None else self._path.stat().st_size
+        if size <= self._rotate_bytes:
+            return
+        self._release_handles()
+        if self._in_place:
+            os.truncate(self._path, size)  # drop the zero tail from the segment
+            self._in_place = self._preallocate_bytes is not None
+        index = self._read_index()
+        segment = _segment_path(self._path, index["segments"] + 1)
+        index["segments"] += 1
+        index["count"] += _count_lines(self._path)
+        _summarize(self._path, index["summary"])
+        os.replace(self._path, segment)
+        tmp = _index_path(self._path).with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, _index_path(self._path))
+        if self._compressor is not None:
+            self._compressor.join()
+        self._compressor = threading.Thread(
+            target=_compress_segment, args=(segment,), name="failure-log-compress", daemon=True,
+        )
+        self._compressor.start()
+
+    def _read_index(self) -> Dict[str, Any]:
+        """Totals of the rotated segments (all zero when never rotated)."""
+        try:
+            return json.loads(_index_path(self._path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"segments": 0, "count": 0, "summary": {}}
+
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield parsed records, segments first, skipping malformed lines."""
+        self.flush()
+        if self._format == "msgpack":
+            yield from _unpack_records(self._path)
+            return
+        for n in range(1, self._read_index()["segments"] + 1):
+            with _open_segment(_segment_path(self._path, n)) as f:
+                yield from _records_from_lines(f)
+
+        with _map_log(self._path) as mm:
+            if mm is not None:
+                yield from _records_from_lines(_mapped_lines(mm))
+
+    def iter_entries(self) -> Iterator[FailureEntry]:
+        """Yield failure entries one at a time, in file order."""
+        return map(_entry_from_record, self._iter_records())
 
     def read_all(self) -> List[FailureEntry]:
         """Read all failure entries from the log file."""
-        if not self._path.exists():
-            return []
-
-        entries: List[FailureEntry] = []
-        with open(self._path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    entries.append(FailureEntry(
-                        timestamp=data.get("timestamp", ""),
-                        section=data.get("section", ""),
-                        category=data.get("category", ""),
-                        description=data.get("description", ""),
-                        command=data.get("command", ""),
-                        detection_source=data.get("detection_source", ""),
-                        patient_id=data.get("patient_id"),
-                        protocol_id=data.get("protocol_id"),
-                        metadata=data.get("metadata"),
-                    ))
-                except json.JSONDecodeError:
-                    continue  # Skip malformed lines
+        return list(self.iter_entries())
+
+    def read_columns(self) -> Dict[str, List[Any]]:
+        """
+        Read all entries as one list per field, in file order.
 
-        return entries
+        Row ``i`` of every list is entry ``i`` of read_all(), but no
+        FailureEntry (and no per-entry dict) is built, which keeps large logs
+        compact for filtering and aggregation.  category, section and
+        detection_source are interned, so their lists hold shared strings.
+        """
+        columns: Dict[str, List[Any]] = {name: [] for name in _FIELDS}
+        # Unrolled over FailureEntry's fields, as in _entry_from_record
+        (timestamp, section, category, description, command,
+         detection_source, patient_id, protocol_id, metadata) = (
+            columns[name].append for name in _FIELDS)
+        for data in self._iter_records():
+            get = data.get
+            timestamp(get("timestamp", ""))
+            section(_intern(get("section", "")))
+            category(_intern(get("category", "")))
+            description(get("description", ""))
+            command(get("command", ""))
+            detection_source(_intern(get("detection_source", "")))
+            patient_id(get("patient_id"))
+            protocol_id(get("protocol_id"))
+            metadata(get("metadata"))
+        return columns
 
     def count(self) -> int:
         """Count total entries without loading all into memory."""
-        if not self._path.exists():
-            return 0
-        count = 0
-        with open(self._path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    count += 1
-        return count
+        self.flush()
+        if self._format == "msgpack":
+            with _map_log(self._path) as mm:
+                return 0 if mm is None else sum(1 for _ in _frames(mm))
+        return self._read_index()["count"] + _count_lines(self._path)
 
     def summary(self) -> Dict[str, int]:
         """Return counts by category."""
-        counts: Dict[str, int] = {}
-        for entry in self.read_all():
-            counts[entry.category] = counts.get(entry.category, 0) + 1
+        if self._format == "msgpack":
+            counts: Dict[str, int] = {}
+            for data in self._iter_records():
+                category = data.get("category", "")
+                counts[category] = counts.get(category, 0) + 1
+            return counts
+        self.flush()
+        counts = dict(self._read_index()["summary"])
+        _summarize(self._path, counts)
         return counts
 
 
+# Length prefix of each record in a format="msgpack" log
+_FRAME_HEADER = struct.Struct("<I")
+
+
+def _pack_record(record: Dict[str, Any]) -> bytes:
+    """One length-prefixed MessagePack record; unknown types packed as str."""
+    payload = msgpack.packb(record, default=str)
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def _pack(entry: FailureEntry) -> bytes:
+    """_serialize for format="msgpack" logs, None fields omitted."""
+    d = entry.__dict__
+    return _pack_record({k: d[k] for k in _FIELDS if d[k] is not None})
+
+
+def _frames(mm: mmap.mmap) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each complete frame; a frame torn by a crash ends the log."""
+    pos, size = 0, len(mm)
+    while pos + _FRAME_HEADER.size <= size:
+        (length,) = _FRAME_HEADER.unpack_from(mm, pos)
+        start = pos + _FRAME_HEADER.size
+        pos = start + length
+        if pos > size:
+            return
+        yield start, pos
+
+
+def _unpack_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with _map_log(path) as mm:
+        if mm is None:
+            return
+        for start, end in _frames(mm):
+            try:
+                data = msgpack.unpackb(mm[start:end], strict_map_key=False)
+            except ValueError:
+                continue  # Skip malformed records
+            yield data
+
+
+def _records_from_lines(lines: Iterable[AnyStr]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        line = _after_nul(line)
+        if len(line) <= 1:
+            continue  # "\n" or an unterminated one-byte line; never a record
+        # Both parsers skip surrounding whitespace, so lines are not stripped;
+        # whitespace-only lines fail to parse and are skipped with the rest
+        try:
+            data = _loads(line)
+        except json.JSONDecodeError:
+            continue  # Skip malformed lines
+        yield data
+
+
+def _count_lines(path: Path) -> int:
+    """Non-blank lines in ``path``, counted over a memory map."""
+    with _map_log(path) as mm:
+        if mm is None:
+            return 0
+        end = _data_end(mm)
+        # mmap.count only exists from Python 3.13; bytes.count per slice
+        count = sum(mm[i:min(i + _READ_BUFFER_SIZE, end)].count(b"\n")
+                    for i in range(0, end, _READ_BUFFER_SIZE))
+        # Whitespace-only lines are not entries
+        count -= sum(1 for _ in _BLANK_LINE.finditer(mm, 0, end))
+        if _LEADING_BLANK_LINE.match(mm, 0, end):
+            count -= 1
+        if mm[mm.rfind(b"\n", 0, end) + 1:end].strip():
+            count += 1  # last line has no trailing newline
+    return count
+
+
+def _summarize(path: Path, counts: Dict[str, int]) -> None:
+    """Add the per-category record counts of ``path`` to ``counts``."""
+    with _map_log(path) as mm:
+        if mm is None:
+            return
+        names: Dict[bytes, str] = {}
+        for line in _mapped_lines(mm):
+            line = _after_nul(line)
+            m = _RECORD.fullmatch(line)
+            if m is not None:
+                raw = m.group(1)
+                category = names.get(raw)
+                if category is None:
+                    category = names[raw] = raw.decode("utf-8")
+            else:
+                try:
+                    data = _loads(line)
+                except json.JSONDecodeError:
+                    continue  # Skip malformed and blank lines
+                category = data.get("category", "")
+            counts[category] = counts.get(category, 0) + 1
+
+
+def _find_data_end(fd: int) -> Tuple[int, bool]:
+    """(data end, whether the last record lacks its newline) of an open log."""
+    if os.fstat(fd).st_size == 0:
+        return 0, False
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        end = _data_end(mm)
+        return end, end > 0 and mm[end - 1] != ord("\n")
+
+
+def _has_zero_tail(fd: int) -> bool:
+    """Whether the log open on ``fd`` ends in preallocated zero bytes."""
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return False
+    # Records never contain a raw NUL, so a NUL last byte means a zero tail
+    if hasattr(os, "pread"):
+        return os.pread(fd, 1, size - 1) == b"\x00"
+    os.lseek(fd, size - 1, os.SEEK_SET)
+    return os.read(fd, 1) == b"\x00"
+
+
+def _allocate(fd: int, offset: int, length: int) -> None:
+    """Extend ``fd`` by ``length`` zero bytes at ``offset``."""
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, offset, length)
+    else:
+        os.ftruncate(fd, offset + length)
+
+
+def _pwrite(fd: int, buf: bytes, offset: int) -> int:
+    if hasattr(os, "pwrite"):
+        return os.pwrite(fd, buf, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, buf)
+
+
+def _data_end(mm: mmap.mmap) -> int:
+    """
+    End of the records in a mapped log: the start of the run of NUL bytes
+    it ends with, if any.  A preallocated log is zero-filled past its last
+    record; NULs further in (left by a crash) are dropped line by line.
+    """
+    end = len(mm)
+    if end == 0 or mm[end - 1] != 0:
+        return end
+    while end > 0:
+        start = max(0, end - _READ_BUFFER_SIZE)
+        data = mm[start:end].rstrip(b"\x00")
+        if data:
+            return start + len(data)
+        end = start
+    return 0
+
+
+def _after_nul(line: AnyStr) -> AnyStr:
+    """
+    The part of ``line`` after its last NUL byte.  Serialized records never
+    contain a raw NUL (json escapes it), so anything up to one is debris from
+    a crash, and a record appended after it is still read.
+    """
+    nul = b"\x00" if isinstance(line, bytes) else "\x00"
+    cut = line.rfind(nul)
+    return line if cut < 0 else line[cut + 1:]
+
+
+def _mapped_lines(mm: mmap.mmap) -> Iterator[bytes]:
+    """Lines of a mapped log, up to its data end."""
+    end = _data_end(mm)
+    mm.seek(0)
+    while mm.tell() < end:
+        line = mm.readline()
+        over = mm.tell() - end
+        yield line[:-over] if over > 0 else line
+
+
+def _segment_path(path: Path, n: int) -> Path:
+    return path.with_name(f"{path.stem}.{n}{path.suffix}")
+
+
+def _gz_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".gz")
+
+
+def _zst_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".zst")
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.index.json")
+
+
+def _open_segment(segment: Path) -> BinaryIO:
+    """Open a rotated segment, compressed or not yet compressed."""
+    try:
+        # The uncompressed file is only removed once its .zst/.gz is complete
+        return open(segment, "rb")
+    except FileNotFoundError:
+        pass
+    zst = _zst_path(segment)
+    if zst.exists():
+        if zstandard is None:
+            raise RuntimeError(f"{zst} is zstd-compressed; install zstandard to read it")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(zst, "rb"), closefd=True)
+        return io.BufferedReader(reader, _READ_BUFFER_SIZE)
+    return gzip.open(_gz_path(segment), "rb")
+
+
+def _compress_segment(segment: Path) -> None:
+    """
+    Compress a rotated segment, replacing it only once the compressed copy
+    is complete: zstd when zstandard is installed, otherwise gzip.
+    """
+    with open(segment, "rb") as src:
+        if zstandard is not None:
+            out = _zst_path(segment)
+            tmp = out.with_name(out.name + ".tmp")
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+        else:
+            out = _gz_path(segment)
+            tmp = out.with_name(out.name + ".tmp")
+            # gzip.open defaults to level 9, which costs far more CPU than it saves
+            with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, _READ_BUFFER_SIZE)
+    os.replace(tmp, out)
+    segment.unlink()
+
+
+@contextmanager
+def _map_log(path: Path) -> Iterator[Optional[mmap.mmap]]:
+    """Read-only memory map of ``path``; None if it is missing or empty."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def failure_log_to_jsonl(src: Path, dst: Path) -> int:
+    """
+    Append every entry of the format="msgpack" log ``src`` to the JSON Lines
+    log ``dst``; returns the number of entries converted.
+    """
+    converted = 0
+    with FailureLog(dst) as out:
+        for entry in FailureLog(src, format="msgpack").iter_entries():
+            out.append(entry)
+            converted += 1
+    return converted
+
+
 # ---------------------------------------------------------------------------
 # Convenience functions for common failure types
 # ---------------------------------------------------------------------------
 
-def log_unanchored_evidence(
-    log: FailureLog,
+def _prerender(**constants: str) -> Dict[str, str]:
+    """JSON fragments (``"key": value``) for a helper's constant fields."""
+    return {k: _fragment(k, v) for k, v in constants.items()}
+
+
+def _render(fixed: Dict[str, str], **values: Any) -> bytes:
+    """
+    One record, byte-identical to _serialize(FailureEntry(...)), built from
+    pre-rendered constant fragments plus the per-call values.
+    """
+    parts = []
+    for k in _FIELDS:
+        frag = fixed.get(k)
+        if frag is None:
+            v = values.get(k)
+            if v is None:
+                continue
+            frag = _fragment(k, v)
+        parts.append(frag)
+    return ("{" + ", ".join(parts) + "}\n").encode("ascii")
+
+
+# (epoch second, its formatted local time) of the last _iso_now call
+_iso_second: Tuple[int, str] = (-1, "")
+
+
+def _iso_now() -> str:
+    """
+    datetime.now().isoformat() without building a datetime: the seconds part
+    is formatted once per second and only the microseconds change per call.
+    """
+    global _iso_second
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{us:06d}" if us else prefix
+
+
+_UNANCHORED_FIXED = _prerender(section="evidence_anchor", category="rule", detection_source="execution")
+_MISSING_ELEMENT_FIXED = _prerender(category="rule", detection_source="execution")
+_NEGATION_MISS_FIXED = _prerender(section="negation_detection", category="rule", detection_source="execution")
+_HISTORICAL_FIXED = _prerender(section="historical_filtering", category="rule", detection_source="execution")
+
+
+def _unanchored_evidence(
+    timestamp: str,
     patient_id: str,
     protocol_id: str,
     requirement_id: str,
     command: str = "",
-) -> None:
-    """Log a failure where evidence was used without proper anchoring."""
-    log.append(FailureEntry(
-        timestamp=datetime.now().isoformat(),
-        section="evidence_anchor",
-        category="rule",
+) -> bytes:
+    return _render(
+        _UNANCHORED_FIXED,
+        timestamp=timestamp,
         description=f"Evidence used for {requirement_id} lacks proper source anchoring",
         command=command,
-        detection_source="execution",
         patient_id=patient_id,
         protocol_id=protocol_id,
-    ))
+    )
 
 
-def log_missing_required_element(
-    log: FailureLog,
+def _missing_required_element(
+    timestamp: str,
     patient_id: str,
     element_name: str,
     section: str = "19A",
     command: str = "",
-) -> None:
-    """Log a failure where a required data element was missing."""
-    log.append(FailureEntry(
-        timestamp=datetime.now().isoformat(),
+) -> bytes:
+    return _render(
+        _MISSING_ELEMENT_FIXED,
+        timestamp=timestamp,
         section=section,
-        category="rule",
         description=f"Required element '{element_name}' not documented",
         command=command,
-        detection_source="execution",
         patient_id=patient_id,
-    ))
+    )
 
 
-def log_negation_miss(
-    log: FailureLog,
+def _negation_miss(
+    timestamp: str,
     patient_id: str,
     protocol_id: str,
     pattern_key: str,
     matched_text: str,
     command: str = "",
-) -> None:
-    """Log a case where negation detection may have missed a negated finding."""
-    log.append(FailureEntry(
-        timestamp=datetime.now().isoformat(),
-        section="negation_detection",
-        category="rule",
+) -> bytes:
+    return _render(
+        _NEGATION_MISS_FIXED,
+        timestamp=timestamp,
         description=f"Potential negation miss: '{matched_text}' matched on {pattern_key}",
         command=command,
-        detection_source="execution",
         patient_id=patient_id,
         protocol_id=protocol_id,
         metadata={"pattern_key": pattern_key, "matched_text": matched_text},
-    ))
+    )
 
 
-def log_historical_false_trigger(
-    log: FailureLog,
+def _historical_false_trigger(
+    timestamp: str,
     patient_id: str,
     protocol_id: str,
     matched_text: str,
     command: str = "",
-) -> None:
-    """Log a case where historical data may have caused a false trigger."""
-    log.append(FailureEntry(
-        timestamp=datetime.now().isoformat(),
-        section="historical_filtering",
-        category="rule",
+) -> bytes:
+    return _render(
+        _HISTORICAL_FIXED,
+        timestamp=timestamp,
         description=f"Potential historical false trigger: '{matched_text}'",
         command=command,
-        detection_source="execution",
         patient_id=patient_id,
         protocol_id=protocol_id,
         metadata={"matched_text": matched_text},
-    ))
+    )
+
+
+def log_unanchored_evidence(
+    log: FailureLog,
+    patient_id: str,
+    protocol_id: str,
+    requirement_id: str,
+    command: str = "",
+) -> None:
+    """Log a failure where evidence was used without proper anchoring."""
+    log._write_jsonl(_unanchored_evidence(_iso_now(), patient_id, protocol_id, requirement_id, command))
+
+
+def log_missing_required_element(
+    log: FailureLog,
+    patient_id: str,
+    element_name: str,
+    section: str = "19A",
+    command: str = "",
+) -> None:
+    """Log a failure where a required data element was missing."""
+    log._write_jsonl(_missing_required_element(_iso_now(), patient_id, element_name, section, command))
+
+
+def log_negation_miss(
+    log: FailureLog,
+    patient_id: str,
+    protocol_id: str,
+    pattern_key: str,
+    matched_text: str,
+    command: str = "",
+) -> None:
+    """Log a case where negation detection may have missed a negated finding."""
+    log._write_jsonl(_negation_miss(_iso_now(), patient_id, protocol_id, pattern_key, matched_text, command))
+
+
+def log_historical_false_trigger(
+    log: FailureLog,
+    patient_id: str,
+    protocol_id: str,
+    matched_text: str,
+    command: str = "",
+) -> None:
+    """Log a case where historical data may have caused a false trigger."""
+    log._write_jsonl(_historical_false_trigger(_iso_now(), patient_id, protocol_id, matched_text, command))
+
+
+# ---------------------------------------------------------------------------
+# Batched variants: one record per mapping of the single helper's keyword
+# arguments (without ``log``), all stamped with one timestamp and written
+# with a single append.
+# ---------------------------------------------------------------------------
+
+def log_unanchored_evidence_many(log: FailureLog, records: Sequence[Mapping[str, Any]]) -> None:
+    """Batched log_unanchored_evidence."""
+    ts = _iso_now()
+    log._write_jsonl(b"".join(_unanchored_evidence(ts, **r) for r in records))
+
+
+def log_missing_required_element_many(log: FailureLog, records: Sequence[Mapping[str, Any]]) -> None:
+    """Batched log_missing_required_element."""
+    ts = _iso_now()
+    log._write_jsonl(b"".join(_missing_required_element(ts, **r) for r in records))
+
+
+def log_negation_miss_many(log: FailureLog, records: Sequence[Mapping[str, Any]]) -> None:
+    """Batched log_negation_miss."""
+    ts = _iso_now()
+    log._write_jsonl(b"".join(_negation_miss(ts, **r) for r in records))
+
+
+def log_historical_false_trigger_many(log: FailureLog, records: Sequence[Mapping[str, Any]]) -> None:
+    """Batched log_historical_false_trigger."""
+    ts = _iso_now()
+    log._write_jsonl(b"".join(_historical_false_trigger(ts, **r) for r in records))
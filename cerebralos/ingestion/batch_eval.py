@@ -11,12 +11,23 @@ Usage:
 """
 from __future__ import annotations
 
+import dataclasses
+import functools
+import importlib
+import io
 import json
+import multiprocessing
 import os
+import pickle
+import platform
+import re
 import sys
-from datetime import datetime
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Any, Dict, FrozenSet, List, Optional
+from typing import Any, Callable, DefaultDict, Deque, Dict, FrozenSet, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
 # Add project to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
@@ -28,6 +39,11 @@ from cerebralos.ntds_logic.build_patientfacts_from_txt import build_patientfacts
 from cerebralos.ntds_logic.rules_loader import load_ruleset
 from cerebralos import GOVERNANCE_VERSION, ENGINE_VERSION, RULES_VERSIONS
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # Evidence serialization helpers
@@ -38,41 +54,39 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from cerebralos.reporting.evidence_utils import get_clean_snippet, is_historical_reference
 
 
-def _serialize_protocol_evidence(ev) -> Dict[str, Any]:
-    """Serialize a ProtocolEvidence object to a JSON-safe dict with cleaned text."""
-    source_type_str = ev.source_type.value if hasattr(ev.source_type, "value") else str(ev.source_type)
-
-    # For TRAUMA_HP, MAR, and LAB, preserve full text with newlines intact (don't use clean_evidence_text)
-    if source_type_str in ("TRAUMA_HP", "MAR", "LAB"):
-        if source_type_str == "TRAUMA_HP":
-            max_len = 15000
-        elif source_type_str == "MAR":
-            max_len = 50000  # MAR can be very large (40k+ chars)
-        else:  # LAB
-            max_len = 10000  # Lab tables can be large
-        raw_text = (ev.text or "")[:max_len] if hasattr(ev, 'text') else ""
-        is_hist = is_historical_reference(raw_text)
-        return {
-            "source_type": source_type_str,
-            "timestamp": ev.timestamp,
-            "text": raw_text,  # Preserve structure for section/table parsing
-            "text_raw": raw_text,
-            "is_historical": is_hist,
-            "pointer": ev.pointer.ref if ev.pointer else {},
-        }
-
+# Evidence text limits by source type.  The _PRESERVE_FULL types keep their
+# text verbatim (newlines intact) for section/table parsing; every other type
+# is cleaned with get_clean_snippet.  Types not listed get 1000 characters.
+_EVIDENCE_LIMITS: Dict[str, int] = {
+    "TRAUMA_HP": 15000,
+    "MAR": 50000,  # MAR can be very large (40k+ chars)
+    "LAB": 10000,  # Lab tables can be large
     # Per-type limits for clinical document extraction
-    _TYPE_LIMITS = {
-        "DISCHARGE": 8000,
-        "PHYSICIAN_NOTE": 8000,
-        "RADIOLOGY": 3000,
-        "CONSULT_NOTE": 3000,
-        "ED_NOTE": 3000,
-        "NURSING_NOTE": 2000,
-    }
-    max_len = _TYPE_LIMITS.get(source_type_str, 1000)
-    cleaned_text, is_hist = get_clean_snippet(ev, max_length=max_len, skip_if_historical=False)
-    raw_text = (ev.text or "")[:max_len] if hasattr(ev, 'text') else ""
+    "DISCHARGE": 8000,
+    "PHYSICIAN_NOTE": 8000,
+    "RADIOLOGY": 3000,
+    "CONSULT_NOTE": 3000,
+    "ED_NOTE": 3000,
+    "NURSING_NOTE": 2000,
+}
+_PRESERVE_FULL = frozenset({"TRAUMA_HP", "MAR", "LAB"})
+
+
+def _serialize_evidence(ev) -> Dict[str, Any]:
+    """Serialize a ProtocolEvidence or NTDS Evidence object to a JSON-safe dict with cleaned text."""
+    source_type = ev.source_type
+    try:
+        source_type_str = source_type.value  # SourceType enum (protocol or NTDS model)
+    except AttributeError:
+        source_type_str = str(source_type)
+    max_len = _EVIDENCE_LIMITS.get(source_type_str, 1000)
+    raw_text = (getattr(ev, "text", None) or "")[:max_len]
+
+    if source_type_str in _PRESERVE_FULL:
+        cleaned_text = raw_text  # Preserve structure for section/table parsing
+        is_hist = is_historical_reference(raw_text)
+    else:
+        cleaned_text, is_hist = get_clean_snippet(ev, max_length=max_len, skip_if_historical=False)
 
     return {
         "source_type": source_type_str,
@@ -84,50 +98,28 @@ def _serialize_protocol_evidence(ev) -> Dict[str, Any]:
     }
 
 
-def _serialize_ntds_evidence(ev) -> Dict[str, Any]:
-    """Serialize an NTDS Evidence object to a JSON-safe dict with cleaned text."""
-    source_type_str = ev.source_type.value if hasattr(ev.source_type, "value") else str(ev.source_type)
+def _evidence_serializer() -> Callable[[Any], Dict[str, Any]]:
+    """
+    _serialize_evidence memoized by object identity, for one patient.
 
-    # For TRAUMA_HP, MAR, and LAB, preserve full text with newlines intact
-    if source_type_str in ("TRAUMA_HP", "MAR", "LAB"):
-        if source_type_str == "TRAUMA_HP":
-            max_len = 15000
-        elif source_type_str == "MAR":
-            max_len = 50000  # MAR can be very large
-        else:  # LAB
-            max_len = 10000  # Lab tables can be large
-        raw_text = (ev.text or "")[:max_len] if hasattr(ev, 'text') else ""
-        is_hist = is_historical_reference(raw_text)
-        return {
-            "source_type": source_type_str,
-            "timestamp": ev.timestamp,
-            "text": raw_text,  # Preserve structure for section/table parsing
-            "text_raw": raw_text,
-            "is_historical": is_hist,
-            "pointer": ev.pointer.ref if ev.pointer else {},
-        }
+    Step and gate traces cite the same evidence objects over and over, so
+    each is cleaned once and its dict shared.  The cache keeps a reference
+    to every object it has seen, so no id can be reused while it lives.
+    """
+    cache: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
 
-    # Per-type limits for clinical document extraction
-    _TYPE_LIMITS = {
-        "DISCHARGE": 8000,
-        "PHYSICIAN_NOTE": 8000,
-        "RADIOLOGY": 3000,
-        "CONSULT_NOTE": 3000,
-        "ED_NOTE": 3000,
-        "NURSING_NOTE": 2000,
-    }
-    max_len = _TYPE_LIMITS.get(source_type_str, 1000)
-    cleaned_text, is_hist = get_clean_snippet(ev, max_length=max_len, skip_if_historical=False)
-    raw_text = (ev.text or "")[:max_len] if hasattr(ev, 'text') else ""
+    def serialize(ev) -> Dict[str, Any]:
+        hit = cache.get(id(ev))
+        if hit is None:
+            hit = cache[id(ev)] = (ev, _serialize_evidence(ev))
+        return hit[1]
 
-    return {
-        "source_type": source_type_str,
-        "timestamp": ev.timestamp,
-        "text": cleaned_text or raw_text,
-        "text_raw": raw_text,
-        "is_historical": is_hist,
-        "pointer": ev.pointer.ref if ev.pointer else {},
-    }
+    return serialize
+
+
+# Protocol and NTDS evidence share one serialization
+_serialize_protocol_evidence = _serialize_evidence
+_serialize_ntds_evidence = _serialize_evidence
 
 
 # ---------------------------------------------------------------------------
@@ -139,40 +131,129 @@ _PROTOCOLS_PATH = _PROJECT_ROOT / "rules" / "deaconess" / "protocols_deaconess_s
 _MAPPER_PATH = _PROJECT_ROOT / "rules" / "mappers" / "epic_deaconess_mapper_v1.json"
 _CONTRACT_PATH = _PROJECT_ROOT / "rules" / "ntds" / "logic" / "contract_v1.json"
 _SHARED_PATH = _PROJECT_ROOT / "rules" / "deaconess" / "shared_action_buckets_v1.json"
+_NTDS_LOGIC_DIR = _PROJECT_ROOT / "rules" / "ntds" / "logic"
+
+# Pickled resources keyed by rule-file stamp; bump the format on any change
+# to the resources layout or to the classes pickled inside it
+_COMPILED_RULES_PATH = _PROJECT_ROOT / "outputs" / "_compiled_rules.pkl"
+_COMPILED_RULES_FORMAT = 2
 
 
 _NTDS_YEAR = 2026
 _NTDS_EVENT_IDS = list(range(1, 22))  # Events 1-21
 
 
+def _resource_stamp() -> Tuple[Tuple[str, int], ...]:
+    """Return (path, mtime_ns) for every rule file read by _load_resources()."""
+    paths = [_PROTOCOLS_PATH, _MAPPER_PATH, _CONTRACT_PATH, _SHARED_PATH]
+    paths.extend(sorted(_NTDS_LOGIC_DIR.rglob("*.json")))
+    stamp = []
+    for p in paths:
+        try:
+            stamp.append((str(p), p.stat().st_mtime_ns))
+        except FileNotFoundError:
+            stamp.append((str(p), -1))
+    return tuple(stamp)
+
+
 def _load_resources() -> Dict[str, Any]:
-    """Load all protocol definitions, mapper, contract, shared buckets, and NTDS rulesets."""
-    protocols = json.loads(_PROTOCOLS_PATH.read_text(encoding="utf-8"))
-    mapper = json.loads(_MAPPER_PATH.read_text(encoding="utf-8"))
+    """
+    Load all protocol definitions, mapper, contract, shared buckets, and NTDS rulesets.
+
+    Memoized per process on the rule files' mtimes: repeated calls reuse one
+    parse until a rule file changes.  Across processes the parse is cached in
+    outputs/_compiled_rules.pkl under the same key.  Callers must treat the
+    result as read-only.
+    """
+    return _cached_resources(_resource_stamp())
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_resources(stamp: Tuple[Tuple[str, int], ...]) -> Dict[str, Any]:
+    """Parse resources once per distinct rule-file stamp.
+
+    Falls back to the on-disk compiled-rules artifact before re-parsing, so
+    a fresh process only pays for JSON parsing when a rule file changed.
+    """
+    key = (_COMPILED_RULES_FORMAT, ENGINE_VERSION, stamp)
+    resources = _read_compiled_rules(key)
+    if resources is None:
+        resources = _read_resources()
+        _write_compiled_rules(key, resources)
+    return resources
+
+
+def _read_compiled_rules(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Return the pickled resources if the artifact matches *key*, else None."""
+    try:
+        with open(_COMPILED_RULES_PATH, "rb") as fp:
+            cached_key, resources = pickle.load(fp)
+    except Exception:
+        return None  # missing, truncated, or written by incompatible code
+    return resources if cached_key == key else None
+
+
+def _write_compiled_rules(key: Tuple, resources: Dict[str, Any]) -> None:
+    """Atomically pickle (key, resources) to the compiled-rules artifact."""
+    tmp_path = _COMPILED_RULES_PATH.with_name(f"{_COMPILED_RULES_PATH.name}.{os.getpid()}.tmp")
+    try:
+        _COMPILED_RULES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as fp:
+            pickle.dump((key, resources), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _COMPILED_RULES_PATH)
+    except OSError:
+        # Read-only checkout: the in-process cache still applies
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON rule file, with orjson (straight from bytes) when installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _load_ntds_ruleset(event_id: int) -> Any:
+    """load_ruleset for one event, or None when its rule files are missing."""
+    try:
+        return load_ruleset(_NTDS_YEAR, event_id)
+    except SystemExit:
+        return None  # skip events with missing rule files
+
+
+def _read_resources() -> Dict[str, Any]:
+    """Read and parse every resource file from disk (uncached)."""
+    protocols = _read_json(_PROTOCOLS_PATH)
+    mapper = _read_json(_MAPPER_PATH)
     shared = {}
     if _SHARED_PATH.exists():
-        shared = json.loads(_SHARED_PATH.read_text(encoding="utf-8"))
+        shared = _read_json(_SHARED_PATH)
 
     contract = {"evidence": {"max_items_per_requirement": 8}}
     if _CONTRACT_PATH.exists():
-        contract = json.loads(_CONTRACT_PATH.read_text(encoding="utf-8"))
+        contract = _read_json(_CONTRACT_PATH)
 
     # Build action patterns
     action_patterns = {}
     action_patterns.update(shared.get("action_buckets", {}))
     action_patterns.update(mapper.get("query_patterns", {}))
 
-    # Load NTDS rulesets for all 21 events
-    ntds_rulesets: Dict[int, Any] = {}
-    for eid in _NTDS_EVENT_IDS:
-        try:
-            rs = load_ruleset(_NTDS_YEAR, eid)
-            ntds_rulesets[eid] = rs
-        except SystemExit:
-            pass  # skip events with missing rule files
+    # Load NTDS rulesets for all 21 events; each is a handful of file reads,
+    # so they are fetched concurrently (map keeps the event order)
+    workers = min(len(_NTDS_EVENT_IDS), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = pool.map(_load_ntds_ruleset, _NTDS_EVENT_IDS)
+        ntds_rulesets: Dict[int, Any] = {
+            eid: rs for eid, rs in zip(_NTDS_EVENT_IDS, loaded) if rs is not None
+        }
 
     return {
         "protocols": protocols,
+        # Filtered once here rather than by every evaluate_patient call
+        "evaluable_protocols": _get_evaluable_protocols(protocols),
         "action_patterns": action_patterns,
         "contract": contract,
         "ntds_rulesets": ntds_rulesets,
@@ -193,6 +274,14 @@ def _get_evaluable_protocols(protocols: Dict) -> List[Dict]:
     return evaluable
 
 
+def _evaluable_protocols(resources: Dict[str, Any]) -> List[Dict]:
+    """The EVALUABLE protocols of *resources*, precomputed by _read_resources()."""
+    evaluable = resources.get("evaluable_protocols")
+    if evaluable is None:  # hand-built resources dict
+        evaluable = _get_evaluable_protocols(resources["protocols"])
+    return evaluable
+
+
 # ---------------------------------------------------------------------------
 # Evaluation
 # ---------------------------------------------------------------------------
@@ -216,36 +305,16 @@ def evaluate_patient(
     arrival_time = (patient.facts or {}).get("arrival_time", "")
 
     # Read extra metadata lines (PATIENT_NAME, DOB, TRAUMA_CATEGORY)
-    extra_meta = {}
-    try:
-        with open(patient_path, "r", encoding="utf-8") as f:
-            for line in f:
-                stripped = line.strip()
-                if stripped.startswith("PATIENT_NAME:"):
-                    extra_meta["patient_name"] = stripped.split(":", 1)[1].strip()
-                elif stripped.startswith("DOB:"):
-                    extra_meta["dob"] = stripped.split(":", 1)[1].strip()
-                elif stripped.startswith("TRAUMA_CATEGORY:"):
-                    extra_meta["trauma_category"] = stripped.split(":", 1)[1].strip()
-                elif stripped.startswith("[") or not stripped:
-                    break
-    except Exception:
-        pass
+    extra_meta = _read_header_meta(patient_path)
 
-    evaluable = _get_evaluable_protocols(resources["protocols"])
+    evaluable = _evaluable_protocols(resources)
     results = []
 
-    # Detect live/discharge status
-    has_discharge = any(
-        e.source_type.value == "DISCHARGE" if hasattr(e.source_type, "value")
-        else str(e.source_type) == "DISCHARGE"
-        for e in patient.evidence
-    )
-
-    # Serialize all evidence blocks for trauma summary / daily notes
-    all_evidence_snippets = []
-    for e in patient.evidence:
-        all_evidence_snippets.append(_serialize_protocol_evidence(e))
+    # Serialize all evidence blocks for trauma summary / daily notes, and
+    # detect live/discharge status from the serialized source types
+    serialize = _evidence_serializer()
+    all_evidence_snippets = [serialize(e) for e in patient.evidence]
+    has_discharge = any(s["source_type"] == "DISCHARGE" for s in all_evidence_snippets)
 
     for proto in evaluable:
         try:
@@ -261,7 +330,7 @@ def evaluate_patient(
                         "reason": step.reason,
                         "missing_data": step.missing_data,
                         "evidence_count": len(step.evidence),
-                        "evidence_snippets": [_serialize_protocol_evidence(e) for e in step.evidence[:4]],
+                        "evidence_snippets": [serialize(e) for e in step.evidence[:4]],
                         "match_details": [
                             {
                                 "pattern_key": md.pattern_key,
@@ -305,6 +374,44 @@ def evaluate_patient(
     }
 
 
+# The metadata header ends at the first blank line or "[" block line
+_HEADER_END_RE = re.compile(r"^[^\S\n]*(?:\[|\n)", re.M)
+_HEADER_META_RE = re.compile(r"^[^\S\n]*(PATIENT_NAME|DOB|TRAUMA_CATEGORY):(.*)", re.M)
+_HEADER_META_KEYS = {"PATIENT_NAME": "patient_name", "DOB": "dob", "TRAUMA_CATEGORY": "trauma_category"}
+_HEADER_READ_SIZE = 4096
+
+
+def _read_header_meta(patient_path: Path) -> Dict[str, str]:
+    """
+    Return patient_name / dob / trauma_category from a patient file header.
+
+    The header is read in 4 KiB chunks until its end is found and scanned
+    with one regex, rather than stripping and prefix-testing every line.
+    Unreadable files yield whatever was found (usually nothing).
+    """
+    extra_meta: Dict[str, str] = {}
+    try:
+        with open(patient_path, "r", encoding="utf-8") as f:
+            head = f.read(_HEADER_READ_SIZE)
+            pos = 0
+            while True:
+                end = _HEADER_END_RE.search(head, pos)
+                if end is not None:
+                    head = head[:end.start()]
+                    break
+                chunk = f.read(_HEADER_READ_SIZE)
+                if not chunk:
+                    break
+                # Resume at the partial last line, which the chunk completes
+                pos = head.rfind("\n") + 1
+                head += chunk
+    except Exception:
+        return extra_meta
+    for m in _HEADER_META_RE.finditer(head):
+        extra_meta[_HEADER_META_KEYS[m.group(1)]] = m.group(2).strip()
+    return extra_meta
+
+
 def _evaluate_ntds(
     patient_path: Path,
     resources: Dict[str, Any],
@@ -322,6 +429,7 @@ def _evaluate_ntds(
     # Build NTDS PatientFacts from the same parsed patient file
     ntds_patient = build_patientfacts(patient_path, query_patterns)
 
+    serialize = _evidence_serializer()
     ntds_results: List[Dict[str, Any]] = []
     for eid in sorted(ntds_rulesets.keys()):
         rs = ntds_rulesets[eid]
@@ -334,7 +442,7 @@ def _evaluate_ntds(
                     "passed": g.passed,
                     "reason": g.reason,
                     "evidence_count": len(g.evidence),
-                    "evidence_snippets": [_serialize_ntds_evidence(e) for e in g.evidence[:4]],
+                    "evidence_snippets": [serialize(e) for e in g.evidence[:4]],
                 })
             ntds_results.append({
                 "event_id": result.event_id,
@@ -357,6 +465,153 @@ def _evaluate_ntds(
     return ntds_results
 
 
+# ---------------------------------------------------------------------------
+# Parallel evaluation (batch path)
+# ---------------------------------------------------------------------------
+
+# Per-worker resources: inherited from the parent when the pool forks,
+# otherwise populated once by _worker_init in each pool process
+_WORKER_RESOURCES: Optional[Dict[str, Any]] = None
+
+
+def _worker_init(shm_name: str, size: int) -> None:
+    """Pool initializer: unpickle the parent's resources from shared memory once."""
+    global _WORKER_RESOURCES
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _WORKER_RESOURCES = pickle.loads(shm.buf[:size])
+    finally:
+        shm.close()
+
+
+def _evaluate_in_worker(patient_path: Path) -> Dict[str, Any]:
+    """Evaluate one patient inside a pool worker using its cached resources."""
+    return evaluate_patient(patient_path, _WORKER_RESOURCES)
+
+
+def _default_workers() -> int:
+    """CPUs this process may run on (cpu_count overstates under an affinity mask)."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # not available on Windows / macOS
+        return os.cpu_count() or 1
+
+
+def evaluate_patients(
+    patient_files: Sequence[Path],
+    resources: Dict[str, Any],
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluate many patient files, yielding evaluations in input order.
+
+    Patients are independent, so with more than one worker the files are
+    fanned out across a process pool. Where the pool forks (the Linux
+    default) workers inherit the supplied resources as a module global;
+    otherwise they are pickled once into a shared-memory block that each
+    worker unpickles in the pool initializer. Either way they are never
+    sent with each task.
+    With one worker (or one file) evaluation runs in-process against the
+    supplied resources.
+
+    Args:
+        patient_files: Patient .txt files to evaluate.
+        resources: Resources from _load_resources().
+        workers: Worker process count (None = usable CPU count, 1 = serial).
+    """
+    if workers is None:
+        workers = _default_workers()
+    workers = min(workers, len(patient_files))
+
+    if workers <= 1:
+        for pf in patient_files:
+            yield evaluate_patient(pf, resources)
+        return
+
+    global _WORKER_RESOURCES
+    mp_context = multiprocessing.get_context()
+    if mp_context.get_start_method() == "fork":
+        # Forked workers see the parent's memory: nothing to pickle
+        saved, _WORKER_RESOURCES = _WORKER_RESOURCES, resources
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as ex:
+                yield from ex.map(_evaluate_in_worker, patient_files)
+        finally:
+            _WORKER_RESOURCES = saved
+        return
+
+    # Pickle the parsed resources once into a shared block; workers attach by
+    # name instead of each re-reading and re-parsing the rule files
+    payload = pickle.dumps(resources, protocol=pickle.HIGHEST_PROTOCOL)
+    shm = shared_memory.SharedMemory(create=True, size=len(payload))
+    try:
+        shm.buf[:len(payload)] = payload
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_worker_init,
+            initargs=(shm.name, len(payload)),
+        ) as ex:
+            yield from ex.map(_evaluate_in_worker, patient_files)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# ---------------------------------------------------------------------------
+# JSON output
+# ---------------------------------------------------------------------------
+
+# Write buffer for JSON sidecars: fewer write syscalls than the 8 KiB default
+_JSON_WRITE_BUFFER = 128 * 1024
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Encode types neither JSON backend handles natively.
+
+    orjson encodes datetimes and dataclasses in C and only calls this for
+    the rest (Path, Decimal, ...).  The stdlib path also routes datetimes
+    and dataclasses here so both backends emit the same JSON: ISO-8601
+    timestamps (naive values stay naive) and dataclasses as objects.
+    """
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+def _write_evaluation_json(
+    evaluation: Dict[str, Any],
+    json_path: Path,
+    compact: bool = False,
+) -> None:
+    """
+    Write an evaluation dict to json_path as 2-space indented JSON.
+
+    Uses orjson when installed (encodes straight to UTF-8 bytes in C) and
+    falls back to stdlib json otherwise.  The stdlib path streams chunks via
+    json.dump rather than building the whole document as one str.  Types
+    without a native encoding go through _json_default in both paths.
+    With compact=True the JSON is written without indentation or spaces
+    after separators, which is smaller and skips the pretty-printer.
+    """
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        payload = orjson.dumps(evaluation, default=_json_default, option=option)
+        with open(json_path, "wb", buffering=_JSON_WRITE_BUFFER) as fp:
+            fp.write(payload)
+        return
+    layout = {"separators": (",", ":")} if compact else {"indent": 2}
+    with open(json_path, "w", encoding="utf-8", buffering=_JSON_WRITE_BUFFER) as fp:
+        # orjson writes non-ASCII as UTF-8 rather than \u escapes
+        json.dump(evaluation, fp, default=_json_default, ensure_ascii=False, **layout)
+
+
 # ---------------------------------------------------------------------------
 # V5 Daily Notes generation (batch path)
 # ---------------------------------------------------------------------------
@@ -415,273 +670,344 @@ def _generate_v5_report(
 # ---------------------------------------------------------------------------
 # Report generation
 # ---------------------------------------------------------------------------
+# Write buffer for text reports: the report goes out in a few large writes
+_REPORT_WRITE_BUFFER = 128 * 1024
+
+_DASH_RULE = "-" * 70
+_EQUALS_RULE = "=" * 70
+
+_PROTOCOL_OUTCOMES = ("COMPLIANT", "NON_COMPLIANT", "INDETERMINATE", "ERROR", "NOT_TRIGGERED")
+_NTDS_OUTCOMES = ("YES", "NO", "EXCLUDED", "UNABLE_TO_DETERMINE", "ERROR")
+
+
+def _bucket_by_outcome(rows: List[Dict], outcomes: Sequence[str]) -> Dict[str, List[Dict]]:
+    """Split rows by their "outcome" in one pass; unlisted outcomes are dropped."""
+    buckets: Dict[str, List[Dict]] = {outcome: [] for outcome in outcomes}
+    get = buckets.get
+    for r in rows:
+        bucket = get(r["outcome"])
+        if bucket is not None:
+            bucket.append(r)
+    return buckets
+
+
 def generate_pi_report(
     evaluation: Dict[str, Any],
-    output_path: Optional[Path] = None,
-) -> str:
+    output_path: Optional[Union[Path, TextIO]] = None,
+    return_text: bool = True,
+) -> Optional[str]:
     """
     Generate a human-readable PI compliance report.
 
-    Returns the report text. Optionally writes to file.
+    Returns the report text. Optionally writes it to output_path, which may
+    be a path (opened with a 128 KiB buffer) or an already-open text file.
+    With return_text=False the report is streamed straight to output_path
+    without being held in memory, and None is returned.
     """
-    lines = []
-    lines.append("=" * 70)
-    lines.append("CEREBRAL OS — PROTOCOL COMPLIANCE REPORT")
-    lines.append("=" * 70)
-    lines.append("")
+    if isinstance(output_path, (str, os.PathLike)):
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8", buffering=_REPORT_WRITE_BUFFER) as fp:
+            return generate_pi_report(evaluation, fp, return_text)
+
+    if return_text or output_path is None:
+        buf: Optional[io.StringIO] = io.StringIO()
+        write = buf.write
+    else:
+        buf = None
+        write = output_path.write
+
+    def emit(line: str) -> None:
+        write(line)
+        write("\n")
+
+    def heading(title: str, rule: str = _DASH_RULE) -> None:
+        write(f"{rule}\n{title}\n{rule}\n")
+
+    # Fixed blocks are written as one template each rather than line by line
+    heading("CEREBRAL OS — PROTOCOL COMPLIANCE REPORT", _EQUALS_RULE)
 
     # Patient header
-    lines.append(f"Patient:          {evaluation.get('patient_name', 'Unknown')}")
-    lines.append(f"Patient ID/MRN:   {evaluation.get('patient_id', 'Unknown')}")
-    lines.append(f"DOB:              {evaluation.get('dob', 'Unknown')}")
-    lines.append(f"Arrival:          {evaluation.get('arrival_time', 'Unknown')}")
-    lines.append(f"Trauma Category:  {evaluation.get('trauma_category', 'N/A')}")
-    lines.append(f"Evidence Blocks:  {evaluation.get('evidence_blocks', 0)}")
-    lines.append(f"Source:           {evaluation.get('source_file', 'Unknown')}")
-    lines.append("")
+    write(
+        "\n"
+        f"Patient:          {evaluation.get('patient_name', 'Unknown')}\n"
+        f"Patient ID/MRN:   {evaluation.get('patient_id', 'Unknown')}\n"
+        f"DOB:              {evaluation.get('dob', 'Unknown')}\n"
+        f"Arrival:          {evaluation.get('arrival_time', 'Unknown')}\n"
+        f"Trauma Category:  {evaluation.get('trauma_category', 'N/A')}\n"
+        f"Evidence Blocks:  {evaluation.get('evidence_blocks', 0)}\n"
+        f"Source:           {evaluation.get('source_file', 'Unknown')}\n"
+        "\n"
+    )
 
     results = evaluation.get("results", [])
 
     # Categorize results
-    triggered = [r for r in results if r["outcome"] != "NOT_TRIGGERED"]
-    not_triggered = [r for r in results if r["outcome"] == "NOT_TRIGGERED"]
-    compliant = [r for r in triggered if r["outcome"] == "COMPLIANT"]
-    non_compliant = [r for r in triggered if r["outcome"] == "NON_COMPLIANT"]
-    indeterminate = [r for r in triggered if r["outcome"] == "INDETERMINATE"]
-    errors = [r for r in triggered if r["outcome"] == "ERROR"]
+    by_outcome = _bucket_by_outcome(results, _PROTOCOL_OUTCOMES)
+    not_triggered = by_outcome["NOT_TRIGGERED"]
+    compliant = by_outcome["COMPLIANT"]
+    non_compliant = by_outcome["NON_COMPLIANT"]
+    indeterminate = by_outcome["INDETERMINATE"]
+    errors = by_outcome["ERROR"]
+    triggered_count = len(results) - len(not_triggered)
 
     # Summary
-    lines.append("-" * 70)
-    lines.append("SUMMARY")
-    lines.append("-" * 70)
-    lines.append(f"Protocols evaluated:  {len(results)}")
-    lines.append(f"Triggered:            {len(triggered)}")
-    lines.append(f"  COMPLIANT:          {len(compliant)}")
-    lines.append(f"  NON_COMPLIANT:      {len(non_compliant)}")
-    lines.append(f"  INDETERMINATE:      {len(indeterminate)}")
+    heading("SUMMARY")
+    write(
+        f"Protocols evaluated:  {len(results)}\n"
+        f"Triggered:            {triggered_count}\n"
+        f"  COMPLIANT:          {len(compliant)}\n"
+        f"  NON_COMPLIANT:      {len(non_compliant)}\n"
+        f"  INDETERMINATE:      {len(indeterminate)}\n"
+    )
     if errors:
-        lines.append(f"  ERROR:              {len(errors)}")
-    lines.append(f"Not triggered:        {len(not_triggered)}")
-    lines.append("")
+        emit(f"  ERROR:              {len(errors)}")
+    write(f"Not triggered:        {len(not_triggered)}\n\n")
 
     # NON_COMPLIANT (highest priority for PI review)
     if non_compliant:
-        lines.append("-" * 70)
-        lines.append("NON-COMPLIANT PROTOCOLS (REQUIRES PI REVIEW)")
-        lines.append("-" * 70)
+        heading("NON-COMPLIANT PROTOCOLS (REQUIRES PI REVIEW)")
         for r in non_compliant:
-            _append_protocol_detail(lines, r)
-        lines.append("")
+            _append_protocol_detail(emit, r)
+        emit("")
 
     # INDETERMINATE (needs documentation review)
     if indeterminate:
-        lines.append("-" * 70)
-        lines.append("INDETERMINATE PROTOCOLS (DOCUMENTATION GAPS)")
-        lines.append("-" * 70)
+        heading("INDETERMINATE PROTOCOLS (DOCUMENTATION GAPS)")
         for r in indeterminate:
-            _append_protocol_detail(lines, r)
-        lines.append("")
+            _append_protocol_detail(emit, r)
+        emit("")
 
     # COMPLIANT (good news)
     if compliant:
-        lines.append("-" * 70)
-        lines.append("COMPLIANT PROTOCOLS")
-        lines.append("-" * 70)
+        heading("COMPLIANT PROTOCOLS")
         for r in compliant:
-            lines.append(f"  [COMPLIANT] {r['protocol_name']}")
-        lines.append("")
+            emit(f"  [COMPLIANT] {r['protocol_name']}")
+        emit("")
 
     # NOT_TRIGGERED (for reference)
     if not_triggered:
-        lines.append("-" * 70)
-        lines.append("NOT TRIGGERED (protocol did not apply)")
-        lines.append("-" * 70)
+        heading("NOT TRIGGERED (protocol did not apply)")
         for r in not_triggered:
-            lines.append(f"  [ — ] {r['protocol_name']}")
-        lines.append("")
+            emit(f"  [ — ] {r['protocol_name']}")
+        emit("")
 
     # ERRORS
     if errors:
-        lines.append("-" * 70)
-        lines.append("ERRORS")
-        lines.append("-" * 70)
+        heading("ERRORS")
         for r in errors:
-            lines.append(f"  [ERROR] {r['protocol_name']}: {r.get('error', 'Unknown error')}")
-        lines.append("")
+            emit(f"  [ERROR] {r['protocol_name']}: {r.get('error', 'Unknown error')}")
+        emit("")
 
     # ---- NTDS Hospital Events Section ----
     ntds_results = evaluation.get("ntds_results", [])
     if ntds_results:
-        ntds_yes = [r for r in ntds_results if r["outcome"] == "YES"]
-        ntds_no = [r for r in ntds_results if r["outcome"] == "NO"]
-        ntds_excluded = [r for r in ntds_results if r["outcome"] == "EXCLUDED"]
-        ntds_unable = [r for r in ntds_results if r["outcome"] == "UNABLE_TO_DETERMINE"]
-        ntds_errors = [r for r in ntds_results if r["outcome"] == "ERROR"]
-
-        lines.append("=" * 70)
-        lines.append("NTDS HOSPITAL EVENTS (2026)")
-        lines.append("=" * 70)
-        lines.append(f"Events evaluated:         {len(ntds_results)}")
-        lines.append(f"  YES (event occurred):   {len(ntds_yes)}")
-        lines.append(f"  NO:                     {len(ntds_no)}")
-        lines.append(f"  EXCLUDED:               {len(ntds_excluded)}")
-        lines.append(f"  UNABLE TO DETERMINE:    {len(ntds_unable)}")
+        ntds_by_outcome = _bucket_by_outcome(ntds_results, _NTDS_OUTCOMES)
+        ntds_yes = ntds_by_outcome["YES"]
+        ntds_no = ntds_by_outcome["NO"]
+        ntds_excluded = ntds_by_outcome["EXCLUDED"]
+        ntds_unable = ntds_by_outcome["UNABLE_TO_DETERMINE"]
+        ntds_errors = ntds_by_outcome["ERROR"]
+
+        heading("NTDS HOSPITAL EVENTS (2026)", _EQUALS_RULE)
+        write(
+            f"Events evaluated:         {len(ntds_results)}\n"
+            f"  YES (event occurred):   {len(ntds_yes)}\n"
+            f"  NO:                     {len(ntds_no)}\n"
+            f"  EXCLUDED:               {len(ntds_excluded)}\n"
+            f"  UNABLE TO DETERMINE:    {len(ntds_unable)}\n"
+        )
         if ntds_errors:
-            lines.append(f"  ERROR:                  {len(ntds_errors)}")
-        lines.append("")
+            emit(f"  ERROR:                  {len(ntds_errors)}")
+        emit("")
 
         # YES events — highest priority for PI review
         if ntds_yes:
-            lines.append("-" * 70)
-            lines.append("HOSPITAL EVENTS DETECTED (YES)")
-            lines.append("-" * 70)
+            heading("HOSPITAL EVENTS DETECTED (YES)")
             for r in ntds_yes:
                 eid = r["event_id"]
                 name = r["canonical_name"]
-                lines.append(f"  [YES] #{eid:02d} {name}")
+                emit(f"  [YES] #{eid:02d} {name}")
                 for g in r.get("gate_trace", []):
                     status = "PASS" if g["passed"] else "FAIL"
-                    lines.append(f"    {g['gate']}: {status} — {g['reason']}")
+                    emit(f"    {g['gate']}: {status} — {g['reason']}")
                     # Evidence snippets for passed gates
                     if g["passed"]:
                         for s in g.get("evidence_snippets", [])[:2]:
                             src = s.get("source_type", "")
                             ts = s.get("timestamp") or ""
-                            text = (s.get("text") or "").strip()
-                            lines.append(f"      [{src}] {ts}")
-                            if text:
-                                display = text[:120].replace('\n', ' ')
-                                if len(text) > 120:
-                                    display += "..."
-                                lines.append(f'        "{display}"')
-            lines.append("")
+                            display = _snippet_display(s.get("text") or "")
+                            emit(f"      [{src}] {ts}")
+                            if display:
+                                emit(f'        "{display}"')
+            emit("")
 
         # UNABLE_TO_DETERMINE — documentation gaps
         if ntds_unable:
-            lines.append("-" * 70)
-            lines.append("UNABLE TO DETERMINE (documentation gaps)")
-            lines.append("-" * 70)
+            heading("UNABLE TO DETERMINE (documentation gaps)")
             for r in ntds_unable:
                 eid = r["event_id"]
                 name = r["canonical_name"]
-                lines.append(f"  [UNABLE] #{eid:02d} {name}")
+                emit(f"  [UNABLE] #{eid:02d} {name}")
                 for g in r.get("gate_trace", []):
                     if not g["passed"]:
-                        lines.append(f"    {g['gate']}: FAIL — {g['reason']}")
-            lines.append("")
+                        emit(f"    {g['gate']}: FAIL — {g['reason']}")
+            emit("")
 
         # NO events — confirmed absent (compact list)
         if ntds_no:
-            lines.append("-" * 70)
-            lines.append("NO EVENTS DETECTED")
-            lines.append("-" * 70)
+            heading("NO EVENTS DETECTED")
             for r in ntds_no:
-                lines.append(f"  [NO] #{r['event_id']:02d} {r['canonical_name']}")
-            lines.append("")
+                emit(f"  [NO] #{r['event_id']:02d} {r['canonical_name']}")
+            emit("")
 
         # EXCLUDED events
         if ntds_excluded:
-            lines.append("-" * 70)
-            lines.append("EXCLUDED (present on arrival or other exclusion)")
-            lines.append("-" * 70)
+            heading("EXCLUDED (present on arrival or other exclusion)")
             for r in ntds_excluded:
-                lines.append(f"  [EXCLUDED] #{r['event_id']:02d} {r['canonical_name']}")
-            lines.append("")
+                emit(f"  [EXCLUDED] #{r['event_id']:02d} {r['canonical_name']}")
+            emit("")
 
         # NTDS ERRORS
         if ntds_errors:
-            lines.append("-" * 70)
-            lines.append("NTDS ERRORS")
-            lines.append("-" * 70)
+            heading("NTDS ERRORS")
             for r in ntds_errors:
-                lines.append(f"  [ERROR] #{r['event_id']:02d} {r['canonical_name']}: {r.get('error', 'Unknown error')}")
-            lines.append("")
+                emit(f"  [ERROR] #{r['event_id']:02d} {r['canonical_name']}: {r.get('error', 'Unknown error')}")
+            emit("")
 
     # ---- Narrative Trauma Summary ----
     try:
-        from cerebralos.reporting.narrative_report import (
-            generate_narrative_trauma_summary,
-            generate_daily_notes,
-        )
-        from cerebralos.reporting.medication_timeline import (
-            extract_blood_thinner_timeline,
-            format_blood_thinner_report,
-        )
-        from cerebralos.reporting.lab_values import (
-            extract_lab_values,
-            format_lab_report,
-        )
-        from cerebralos.reporting.progress_note_delta import (
-            extract_note_deltas,
-            format_note_deltas_report,
-        )
+        (
+            generate_narrative_trauma_summary, generate_daily_notes,
+            extract_blood_thinner_timeline, format_blood_thinner_report,
+            extract_lab_values, format_lab_report,
+            extract_note_deltas, format_note_deltas_report,
+        ) = _narrative_builders()
 
         narrative = generate_narrative_trauma_summary(evaluation)
         if narrative:
-            lines.append("=" * 70)
-            lines.append("NARRATIVE TRAUMA SUMMARY")
-            lines.append("=" * 70)
-            lines.append("")
-            lines.append(narrative)
-            lines.append("")
+            heading("NARRATIVE TRAUMA SUMMARY", _EQUALS_RULE)
+            emit("")
+            emit(narrative)
+            emit("")
 
         # Add blood thinner timeline
         blood_thinners = extract_blood_thinner_timeline(evaluation)
         if blood_thinners:
-            lines.append("=" * 70)
+            emit(_EQUALS_RULE)
             blood_thinner_report = format_blood_thinner_report(blood_thinners)
-            lines.append(blood_thinner_report)
-            lines.append("")
+            emit(blood_thinner_report)
+            emit("")
 
         # Add lab values
         lab_values = extract_lab_values(evaluation)
         if lab_values:
-            lines.append("=" * 70)
+            emit(_EQUALS_RULE)
             lab_report = format_lab_report(lab_values)
-            lines.append(lab_report)
-            lines.append("")
+            emit(lab_report)
+            emit("")
 
         # Add progress note deltas (what changed day-to-day)
         note_deltas = extract_note_deltas(evaluation)
         if note_deltas:
-            lines.append("=" * 70)
+            emit(_EQUALS_RULE)
             delta_report = format_note_deltas_report(note_deltas)
-            lines.append(delta_report)
-            lines.append("")
+            emit(delta_report)
+            emit("")
 
         # Add daily notes
         daily = generate_daily_notes(evaluation)
         if daily:
-            lines.append("=" * 70)
-            lines.append(daily)
-            lines.append("")
+            emit(_EQUALS_RULE)
+            emit(daily)
+            emit("")
     except Exception as e:
         # If narrative generation fails, continue without it
-        lines.append("")
-        lines.append(f"(Narrative summary generation error: {e})")
-        lines.append("")
+        emit("")
+        emit(f"(Narrative summary generation error: {e})")
+        emit("")
+
+    write(
+        f"{_EQUALS_RULE}\n"
+        f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"CerebralOS Governance Engine {GOVERNANCE_VERSION} (engine {ENGINE_VERSION})\n"
+        f"{_EQUALS_RULE}"  # last line, no trailing newline
+    )
 
-    lines.append("=" * 70)
-    lines.append(f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"CerebralOS Governance Engine {GOVERNANCE_VERSION} (engine {ENGINE_VERSION})")
-    lines.append("=" * 70)
+    if buf is None:
+        return None
+    report = buf.getvalue()
+    if output_path is not None:
+        output_path.write(report)
+    return report
 
-    report = "\n".join(lines)
 
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(report, encoding="utf-8")
+@functools.lru_cache(maxsize=1)
+def _narrative_builders() -> Tuple[Callable[..., Any], ...]:
+    """
+    Import the narrative report section builders on the first report only.
 
-    return report
+    Kept out of module import so loading batch_eval stays cheap; a failed
+    import is not cached, so it is retried (and reported) per report.
+    """
+    from cerebralos.reporting.narrative_report import (
+        generate_narrative_trauma_summary,
+        generate_daily_notes,
+    )
+    from cerebralos.reporting.medication_timeline import (
+        extract_blood_thinner_timeline,
+        format_blood_thinner_report,
+    )
+    from cerebralos.reporting.lab_values import (
+        extract_lab_values,
+        format_lab_report,
+    )
+    from cerebralos.reporting.progress_note_delta import (
+        extract_note_deltas,
+        format_note_deltas_report,
+    )
+    return (
+        generate_narrative_trauma_summary, generate_daily_notes,
+        extract_blood_thinner_timeline, format_blood_thinner_report,
+        extract_lab_values, format_lab_report,
+        extract_note_deltas, format_note_deltas_report,
+    )
 
 
-def _append_protocol_detail(lines: List[str], result: Dict) -> None:
-    """Append detailed protocol evaluation info to report lines."""
+@functools.lru_cache(maxsize=1)
+def _protocol_explainers() -> Tuple[Callable[[str], str], Callable[[str], str]]:
+    """(explain_pattern_key, explain_requirement), imported on first use."""
     from cerebralos.reporting.protocol_explainer import explain_pattern_key, explain_requirement
+    return explain_pattern_key, explain_requirement
+
+
+_SNIPPET_DISPLAY_CHARS = 120
+_NON_SPACE_RE = re.compile(r"\S")
+
+
+def _snippet_display(text: str) -> str:
+    """First 120 chars of the stripped text on one line, "..." if cut; "" if blank.
+
+    Same result as ``text.strip()[:120]`` with newlines flattened, but
+    without copying the rest of a long (MAR/TRAUMA_HP) evidence text.
+    """
+    first = _NON_SPACE_RE.search(text)
+    if first is None:
+        return ""
+    start = first.start()
+    end = start + _SNIPPET_DISPLAY_CHARS
+    if _NON_SPACE_RE.search(text, end) is None:
+        return text[start:end].rstrip().replace("\n", " ")
+    return text[start:end].replace("\n", " ") + "..."
+
+
+def _append_protocol_detail(emit: Callable[[str], None], result: Dict) -> None:
+    """Emit detailed protocol evaluation info as report lines."""
+    explain_pattern_key, explain_requirement = _protocol_explainers()
 
     outcome = result["outcome"]
     name = result["protocol_name"]
-    lines.append(f"  [{outcome}] {name}")
+    emit(f"  [{outcome}] {name}")
 
     for step in result.get("step_trace", []):
         req_id = step["requirement_id"]
@@ -690,47 +1016,159 @@ def _append_protocol_detail(lines: List[str], result: Dict) -> None:
 
         # Use plain language requirement name
         req_name = explain_requirement(req_id)
-        lines.append(f"    {req_name}: {passed}")
-        lines.append(f"      {reason}")
+        emit(f"    {req_name}: {passed}")
+        emit(f"      {reason}")
 
         if step.get("missing_data"):
             # Convert pattern keys to plain language
             missing_explained = [explain_pattern_key(key) for key in step['missing_data']]
-            lines.append(f"      Missing:")
+            emit(f"      Missing:")
             for explained in missing_explained:
-                lines.append(f"        • {explained}")
+                emit(f"        • {explained}")
         # Match details — explain WHY evidence matched
         match_details = step.get("match_details", [])
         if match_details:
-            lines.append(f"      Matched on:")
+            emit(f"      Matched on:")
             for md in match_details[:4]:
                 pkey = explain_pattern_key(md.get("pattern_key", ""))
                 matched_text = md.get("matched_text", "")
-                lines.append(f"        • {pkey}: \"{matched_text}\"")
+                emit(f"        • {pkey}: \"{matched_text}\"")
         # Evidence snippets
         snippets = step.get("evidence_snippets", [])
         if snippets:
-            lines.append(f"      Evidence ({step.get('evidence_count', len(snippets))} items):")
+            emit(f"      Evidence ({step.get('evidence_count', len(snippets))} items):")
             for s in snippets[:3]:
                 src = s.get("source_type", "")
                 ts = s.get("timestamp") or ""
-                text = (s.get("text") or "").strip()
-                lines.append(f"        [{src}] {ts}")
-                if text:
-                    # Show first 120 chars of evidence text
-                    display = text[:120].replace('\n', ' ')
-                    if len(text) > 120:
-                        display += "..."
-                    lines.append(f'          "{display}"')
-    lines.append("")
+                # Show first 120 chars of evidence text
+                display = _snippet_display(s.get("text") or "")
+                emit(f"        [{src}] {ts}")
+                if display:
+                    emit(f'          "{display}"')
+    emit("")
+
+
+# ---------------------------------------------------------------------------
+# Per-patient report rendering (batch path)
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass(frozen=True)
+class _RenderOptions:
+    """Which per-patient reports main() writes, resolved once from the CLI."""
+    report_dir: Path
+    html: bool = False
+    v5: bool = False
+    v5_ntds: bool = False
+    v5_protocols: bool = False
+    json: bool = False
+    json_compact: bool = False
+
+
+# Modules behind the lazy imports in each report, by _RenderOptions flag
+_REPORT_MODULES = {
+    "html": ("cerebralos.reporting.html_report",),
+    "v5": (
+        "cerebralos.ingest.parse_patient_txt",
+        "cerebralos.timeline.build_patient_days",
+        "cerebralos.features.build_patient_features_v1",
+        "cerebralos.reporting.render_trauma_daily_notes_v5",
+    ),
+}
+
+
+def _preload_report_modules(options: _RenderOptions) -> None:
+    """
+    Import the report modules a run needs once, before the render pool starts.
+
+    Forked render workers then inherit them (and the cached narrative and
+    explainer builders) instead of each importing them for its first
+    patient.  Import errors are left to surface where each report handles
+    them.
+    """
+    names = [name for flag, modules in _REPORT_MODULES.items()
+             if getattr(options, flag) for name in modules]
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    for builders in (_narrative_builders, _protocol_explainers):
+        try:
+            builders()
+        except ImportError:
+            pass
+
+
+def _render_patient_reports(
+    patient_path: Path,
+    evaluation: Dict[str, Any],
+    options: _RenderOptions,
+) -> Tuple[List[str], Optional[Path]]:
+    """
+    Write one patient's text, HTML, v5 and JSON reports.
+
+    Self-contained so it can run in a pool worker.  Returns the status lines
+    to print and the HTML report path (None when HTML is off).
+    """
+    stem = patient_path.stem
+    report_dir = options.report_dir
+    lines: List[str] = []
+    html_path = None
+
+    # Generate text report
+    report_path = report_dir / f"{stem}_pi_report.txt"
+    generate_pi_report(evaluation, report_path, return_text=False)
+    lines.append(f"  → Text: {report_path}")
+
+    # Generate HTML report
+    if options.html:
+        from cerebralos.reporting.html_report import generate_patient_html
+        html_path = report_dir / f"{stem}_report.html"
+        generate_patient_html(evaluation, html_path)
+        lines.append(f"  → HTML: {html_path}")
+
+    # Generate v5 daily notes with NTDS signal summary and protocol results
+    if options.v5:
+        v5_path = report_dir / f"{stem}_TRAUMA_DAILY_NOTES_v5.txt"
+        try:
+            _generate_v5_report(
+                patient_path,
+                evaluation.get("ntds_results", []) if options.v5_ntds else [],
+                v5_path,
+                protocol_results=evaluation.get("results", []) if options.v5_protocols else None,
+            )
+            lines.append(f"  → V5:   {v5_path}")
+        except Exception as exc:
+            lines.append(f"  → V5:   error — {exc}")
+
+    # Save JSON
+    if options.json:
+        json_path = report_dir / f"{stem}_results.json"
+        _write_evaluation_json(evaluation, json_path, compact=options.json_compact)
+        lines.append(f"  → JSON: {json_path}")
+
+    return lines, html_path
+
+
+def _split_workers(workers: int) -> Tuple[int, int]:
+    """
+    Split a process budget into (evaluation, render) worker counts.
+
+    Both pools run at once, so together they stay within ``workers``, with
+    evaluation taking the odd one.  A render count of 0 renders in-process.
+    """
+    if workers <= 1:
+        return workers, 0
+    render_workers = workers // 2
+    return workers - render_workers, render_workers
 
 
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
+
 def main():
     import argparse
-    import platform
     import subprocess
 
     ap = argparse.ArgumentParser(
@@ -740,6 +1178,8 @@ def main():
     ap.add_argument("--patient-dir", help="Directory of parsed patient files")
     ap.add_argument("--report", "-r", help="Output report file path")
     ap.add_argument("--json", action="store_true", help="Also output JSON results")
+    ap.add_argument("--json-compact", action="store_true",
+                    help="Write --json output without indentation (smaller and faster to encode)")
     ap.add_argument("--html", action="store_true", help="Generate HTML reports per patient")
     ap.add_argument("--dashboard", action="store_true", help="Generate dashboard index.html (implies --html for batch)")
     ap.add_argument("--excel", action="store_true", help="Update Excel trauma dashboard")
@@ -751,6 +1191,9 @@ def main():
     ap.add_argument("--output-dir", help="Custom output directory (default: outputs/pi_reports)")
     ap.add_argument("--open", action="store_true", default=False, help="Auto-open HTML report in browser")
     ap.add_argument("--no-open", action="store_true", help="Suppress auto-open")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Worker processes for batch evaluation and report rendering, "
+                         "split between the two (default: usable CPU count; 1 = serial)")
 
     args = ap.parse_args()
 
@@ -779,7 +1222,7 @@ def main():
 
     print("Loading resources...")
     resources = _load_resources()
-    evaluable_count = len(_get_evaluable_protocols(resources["protocols"]))
+    evaluable_count = len(_evaluable_protocols(resources))
     ntds_count = len(resources.get("ntds_rulesets", {}))
     print(f"  {len(resources['action_patterns'])} pattern keys")
     print(f"  {evaluable_count} evaluable protocols")
@@ -793,100 +1236,91 @@ def main():
         pdir = Path(args.patient_dir)
         patient_files = sorted(pdir.glob("*.txt"))
 
-    all_evaluations = []
-    last_html_path = None
-
+    existing_files = []
     for pf in patient_files:
         if not pf.exists():
             print(f"ERROR: File not found: {pf}")
             continue
+        existing_files.append(pf)
 
-        print(f"Evaluating: {pf.name}")
-        evaluation = evaluate_patient(pf, resources)
-
-        # Force live mode if --live flag
-        if args.live:
-            evaluation["is_live"] = True
-            evaluation["has_discharge"] = False
-
-        all_evaluations.append(evaluation)
-
-        # Count protocol outcomes
-        outcomes = {}
-        for r in evaluation["results"]:
-            o = r["outcome"]
-            outcomes[o] = outcomes.get(o, 0) + 1
-
-        triggered = sum(v for k, v in outcomes.items() if k != "NOT_TRIGGERED")
-        live_tag = " [LIVE]" if evaluation.get("is_live") else ""
-        print(f"  → Protocols: {triggered} triggered: {outcomes}{live_tag}")
-
-        # Count NTDS outcomes
-        ntds_outcomes = {}
-        for r in evaluation.get("ntds_results", []):
-            o = r["outcome"]
-            ntds_outcomes[o] = ntds_outcomes.get(o, 0) + 1
-        if ntds_outcomes:
-            print(f"  → NTDS: {ntds_outcomes}")
-
-        # Generate text report
-        report_path = report_dir / f"{pf.stem}_pi_report.txt"
-        generate_pi_report(evaluation, report_path)
-        print(f"  → Text: {report_path}")
-
-        # Generate HTML report
-        if args.html:
-            from cerebralos.reporting.html_report import generate_patient_html
-            html_path = report_dir / f"{pf.stem}_report.html"
-            generate_patient_html(evaluation, html_path)
-            last_html_path = html_path
-            print(f"  → HTML: {html_path}")
-
-        # Generate v5 daily notes with NTDS signal summary and protocol results
-        if args.v5:
-            v5_path = report_dir / f"{pf.stem}_TRAUMA_DAILY_NOTES_v5.txt"
-            try:
-                # Gate NTDS section: --ntds flag OR CEREBRAL_NTDS=1 env var
-                _ntds_enabled = (
-                    getattr(args, "ntds", False)
-                    or os.environ.get("CEREBRAL_NTDS") == "1"
-                )
-                _ntds_results = (
-                    evaluation.get("ntds_results", [])
-                    if _ntds_enabled
-                    else []
-                )
-                # Gate protocol section: --protocols flag OR CEREBRAL_PROTOCOLS=1 env var
-                _proto_enabled = (
-                    getattr(args, "protocols", False)
-                    or os.environ.get("CEREBRAL_PROTOCOLS") == "1"
-                )
-                _proto_results = (
-                    evaluation.get("results", [])
-                    if _proto_enabled
-                    else None
-                )
-                _generate_v5_report(
-                    pf,
-                    _ntds_results,
-                    v5_path,
-                    protocol_results=_proto_results,
-                )
-                print(f"  → V5:   {v5_path}")
-            except Exception as exc:
-                print(f"  → V5:   error — {exc}")
-
-        # Save JSON
-        if args.json:
-            json_path = report_dir / f"{pf.stem}_results.json"
-            json_path.parent.mkdir(parents=True, exist_ok=True)
-            json_path.write_text(
-                json.dumps(evaluation, indent=2, default=str),
-                encoding="utf-8",
-            )
-            print(f"  → JSON: {json_path}")
+    all_evaluations = []
+    last_html_path = None
+
+    render_options = _RenderOptions(
+        report_dir=report_dir,
+        html=args.html,
+        v5=args.v5,
+        # Gate NTDS section: --ntds flag OR CEREBRAL_NTDS=1 env var
+        v5_ntds=getattr(args, "ntds", False) or os.environ.get("CEREBRAL_NTDS") == "1",
+        # Gate protocol section: --protocols flag OR CEREBRAL_PROTOCOLS=1 env var
+        v5_protocols=getattr(args, "protocols", False) or os.environ.get("CEREBRAL_PROTOCOLS") == "1",
+        json=args.json,
+        json_compact=args.json_compact,
+    )
+
+    workers = args.workers if args.workers is not None else _default_workers()
+    workers = min(workers, len(existing_files))
+    # Reports for several patients render on their own process pool while
+    # later patients are still being evaluated; results print in input order.
+    # The two pools share the worker budget rather than each taking all of it.
+    eval_workers, render_workers = _split_workers(workers)
+    render_pool = None
+    if render_workers:
+        _preload_report_modules(render_options)
+        render_pool = ProcessPoolExecutor(max_workers=render_workers)
+    pending: Deque[Tuple[List[str], Any]] = deque()
+
+    def flush(block: bool) -> None:
+        nonlocal last_html_path
+        while pending and (block or render_pool is None or pending[0][1].done()):
+            status, rendered = pending.popleft()
+            lines, html_path = rendered if render_pool is None else rendered.result()
+            if html_path is not None:
+                last_html_path = html_path
+            print("\n".join(status + lines))
+            print()
 
-        print()
+    try:
+        evaluations = evaluate_patients(existing_files, resources, workers=eval_workers)
+        for pf, evaluation in zip(existing_files, evaluations):
+            # Force live mode if --live flag; marked so the JSON sidecar is
+            # not mistaken for a plain evaluation later
+            if args.live:
+                evaluation["is_live"] = True
+                evaluation["has_discharge"] = False
+                evaluation["live_forced"] = True
+
+            all_evaluations.append(evaluation)
+            status = [f"Evaluating: {pf.name}"]
+
+            # Count protocol outcomes
+            outcomes = {}
+            for r in evaluation["results"]:
+                o = r["outcome"]
+                outcomes[o] = outcomes.get(o, 0) + 1
+
+            triggered = sum(v for k, v in outcomes.items() if k != "NOT_TRIGGERED")
+            live_tag = " [LIVE]" if evaluation.get("is_live") else ""
+            status.append(f"  → Protocols: {triggered} triggered: {outcomes}{live_tag}")
+
+            # Count NTDS outcomes
+            ntds_outcomes = {}
+            for r in evaluation.get("ntds_results", []):
+                o = r["outcome"]
+                ntds_outcomes[o] = ntds_outcomes.get(o, 0) + 1
+            if ntds_outcomes:
+                status.append(f"  → NTDS: {ntds_outcomes}")
+
+            if render_pool is not None:
+                pending.append((status, render_pool.submit(
+                    _render_patient_reports, pf, evaluation, render_options)))
+            else:
+                pending.append((status, _render_patient_reports(pf, evaluation, render_options)))
+            flush(block=False)
+        flush(block=True)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
 
     # Dashboard
     if args.dashboard and len(all_evaluations) > 0:
@@ -897,12 +1331,13 @@ def main():
     # Excel
     if args.excel:
         try:
-            from cerebralos.reporting.excel_dashboard import update_excel_dashboard
-            from cerebralos.classification.vrc_categories import classify_vrc_categories
+            from cerebralos.reporting.excel_dashboard import update_excel_dashboard_batch
+            from cerebralos.classification.vrc_categories import classify_vrc_categories_batch
             excel_path = Path("outputs") / "trauma_dashboard.xlsx"
-            for ev in all_evaluations:
-                vrc = classify_vrc_categories(ev)
-                update_excel_dashboard(ev, vrc, excel_path)
+            # One workbook load and save for the whole batch
+            update_excel_dashboard_batch(
+                all_evaluations, classify_vrc_categories_batch(all_evaluations), excel_path,
+            )
             print(f"Excel: {excel_path}")
         except ImportError as ie:
             print(f"Excel: skipped ({ie})")
@@ -920,6 +1355,10 @@ def main():
     print("Done.")
 
 
+# Resolved once at import; _open_file branches on it per call
+_SYSTEM = platform.system()
+
+
 def _open_file(path: Path) -> None:
     """Open a file using the platform's default application.
 
@@ -928,93 +1367,89 @@ def _open_file(path: Path) -> None:
     import os
     if os.environ.get("CEREBRAL_NO_OPEN") == "1":
         return
-    import platform
     import subprocess
-    system = platform.system()
     try:
-        if system == "Darwin":
-            subprocess.run(["open", str(path)], check=False)
-        elif system == "Linux":
-            subprocess.run(["xdg-open", str(path)], check=False)
-        elif system == "Windows":
-            subprocess.run(["start", "", str(path)], shell=True, check=False)
+        if _SYSTEM == "Windows":
+            # ShellExecute directly — no intermediate cmd.exe
+            os.startfile(str(path))
+            return
+        opener = {"Darwin": "open", "Linux": "xdg-open"}.get(_SYSTEM)
+        if opener:
+            # Detached launcher: the CLI does not wait on it
+            subprocess.Popen(
+                [opener, str(path)],
+                start_new_session=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
     except Exception:
         pass
 
 
 def _print_aggregate_summary(evaluations: List[Dict]) -> None:
     """Print aggregate summary across all patients."""
-    print("=" * 70)
-    print("AGGREGATE SUMMARY")
-    print("=" * 70)
-    print(f"Patients evaluated: {len(evaluations)}")
-    print()
+    # Collected and written to stdout in one go
+    lines = [_EQUALS_RULE, "AGGREGATE SUMMARY", _EQUALS_RULE,
+             f"Patients evaluated: {len(evaluations)}", ""]
 
-    # Aggregate protocol outcome counts
-    protocol_outcomes: Dict[str, Dict[str, int]] = {}
+    # Aggregate protocol and NTDS event outcome counts in one pass
+    protocol_outcomes: DefaultDict[str, Counter] = defaultdict(Counter)
+    ntds_event_outcomes: DefaultDict[int, Counter] = defaultdict(Counter)
+    ntds_event_names: Dict[int, str] = {}
     for ev in evaluations:
         for r in ev["results"]:
-            pid = r["protocol_id"]
-            outcome = r["outcome"]
-            if pid not in protocol_outcomes:
-                protocol_outcomes[pid] = {}
-            protocol_outcomes[pid][outcome] = protocol_outcomes[pid].get(outcome, 0) + 1
+            protocol_outcomes[r["protocol_id"]][r["outcome"]] += 1
+        for r in ev.get("ntds_results", []):
+            eid = r["event_id"]
+            ntds_event_names[eid] = r["canonical_name"]
+            ntds_event_outcomes[eid][r["outcome"]] += 1
 
     # Show protocols with non-compliant or indeterminate results
-    print("Protocols with findings:")
+    lines.append("Protocols with findings:")
     for pid, outcomes in sorted(protocol_outcomes.items()):
-        nc = outcomes.get("NON_COMPLIANT", 0)
-        ind = outcomes.get("INDETERMINATE", 0)
-        comp = outcomes.get("COMPLIANT", 0)
+        nc = outcomes["NON_COMPLIANT"]
+        ind = outcomes["INDETERMINATE"]
+        comp = outcomes["COMPLIANT"]
         if nc > 0 or ind > 0 or comp > 0:
             parts = []
             if comp: parts.append(f"{comp} compliant")
             if nc: parts.append(f"{nc} non-compliant")
             if ind: parts.append(f"{ind} indeterminate")
-            print(f"  {pid}: {', '.join(parts)}")
-    print()
-
-    # Aggregate NTDS event outcome counts
-    ntds_event_outcomes: Dict[int, Dict[str, int]] = {}
-    ntds_event_names: Dict[int, str] = {}
-    for ev in evaluations:
-        for r in ev.get("ntds_results", []):
-            eid = r["event_id"]
-            outcome = r["outcome"]
-            ntds_event_names[eid] = r["canonical_name"]
-            if eid not in ntds_event_outcomes:
-                ntds_event_outcomes[eid] = {}
-            ntds_event_outcomes[eid][outcome] = ntds_event_outcomes[eid].get(outcome, 0) + 1
+            lines.append(f"  {pid}: {', '.join(parts)}")
+    lines.append("")
 
     if ntds_event_outcomes:
-        print("NTDS Hospital Events with YES findings:")
+        lines.append("NTDS Hospital Events with YES findings:")
         any_yes = False
         for eid in sorted(ntds_event_outcomes.keys()):
             outcomes = ntds_event_outcomes[eid]
-            yes_count = outcomes.get("YES", 0)
+            yes_count = outcomes["YES"]
             if yes_count > 0:
                 any_yes = True
                 name = ntds_event_names.get(eid, "Unknown")
                 total = sum(outcomes.values())
-                print(f"  #{eid:02d} {name}: {yes_count}/{total} patients")
+                lines.append(f"  #{eid:02d} {name}: {yes_count}/{total} patients")
         if not any_yes:
-            print("  (none)")
-        print()
+            lines.append("  (none)")
+        lines.append("")
 
         # NTDS summary totals
-        total_yes = sum(o.get("YES", 0) for o in ntds_event_outcomes.values())
-        total_no = sum(o.get("NO", 0) for o in ntds_event_outcomes.values())
-        total_excl = sum(o.get("EXCLUDED", 0) for o in ntds_event_outcomes.values())
-        total_unable = sum(o.get("UNABLE_TO_DETERMINE", 0) for o in ntds_event_outcomes.values())
-        total_err = sum(o.get("ERROR", 0) for o in ntds_event_outcomes.values())
-        print(f"NTDS totals across {len(evaluations)} patients × {len(ntds_event_outcomes)} events:")
-        print(f"  YES: {total_yes}  NO: {total_no}  EXCLUDED: {total_excl}  UNABLE: {total_unable}", end="")
+        totals: Counter = Counter()
+        for outcomes in ntds_event_outcomes.values():
+            totals.update(outcomes)
+        total_yes = totals["YES"]
+        total_no = totals["NO"]
+        total_excl = totals["EXCLUDED"]
+        total_unable = totals["UNABLE_TO_DETERMINE"]
+        total_err = totals["ERROR"]
+        lines.append(f"NTDS totals across {len(evaluations)} patients × {len(ntds_event_outcomes)} events:")
+        totals_line = f"  YES: {total_yes}  NO: {total_no}  EXCLUDED: {total_excl}  UNABLE: {total_unable}"
         if total_err:
-            print(f"  ERROR: {total_err}")
-        else:
-            print()
+            totals_line += f"  ERROR: {total_err}"
+        lines.append(totals_line)
 
-    print("=" * 70)
+    lines.append(_EQUALS_RULE)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -33,6 +33,9 @@ _EPIC_NOISE_PATTERNS = [
     r"^={5,}",  # Separator lines (=====)
 ]
 
+# All line-level noise patterns as one compiled alternation (matches iff any does)
+_EPIC_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in _EPIC_NOISE_PATTERNS), re.IGNORECASE)
+
 # Inline noise patterns: substrings within lines that should be stripped
 _EPIC_INLINE_NOISE = [
     re.compile(r"Signed\s+Expand\s+All\s+Collapse\s+All\s*", re.IGNORECASE),
@@ -44,6 +47,11 @@ _EPIC_INLINE_NOISE = [
     re.compile(r"Revision\s+History\s*", re.IGNORECASE),
 ]
 
+# Every inline noise pattern contains one of these words; lines without any
+# of them skip the substitutions entirely
+_INLINE_NOISE_HINT_RE = re.compile(r"signed|expand|pended|routing|revision", re.IGNORECASE)
+_MULTI_SPACE_RE = re.compile(r"  +")
+
 # Provider header patterns (name + credentials)
 _PROVIDER_HEADER_RE = re.compile(
     r"^[A-Z][a-zA-Z'\-]+,\s+[A-Z][a-zA-Z'\-]+.*(?:MD|DO|PA-C|PA|NP|RN|FNP|APRN|CRNA)",
@@ -82,9 +90,8 @@ def _is_noise_line(line: str) -> bool:
         return False
 
     # Check noise patterns
-    for pattern in _EPIC_NOISE_PATTERNS:
-        if re.match(pattern, stripped, re.IGNORECASE):
-            return True
+    if _EPIC_NOISE_RE.match(stripped):
+        return True
 
     # Check provider headers
     if _PROVIDER_HEADER_RE.match(stripped):
@@ -148,10 +155,11 @@ def _extract_clinical_sections(text: str) -> Dict[str, str]:
 def _strip_inline_noise(text: str) -> str:
     """Strip Epic UI noise that appears inline within text (not on separate lines)."""
     result = text
-    for pattern in _EPIC_INLINE_NOISE:
-        result = pattern.sub("", result)
+    if _INLINE_NOISE_HINT_RE.search(result):
+        for pattern in _EPIC_INLINE_NOISE:
+            result = pattern.sub("", result)
     # Collapse multiple spaces left by stripping
-    result = re.sub(r"  +", " ", result)
+    result = _MULTI_SPACE_RE.sub(" ", result)
     return result.strip()
 
 
@@ -175,6 +183,7 @@ def clean_evidence_text(text: str, max_length: int = 500) -> str:
 
     lines = text.split("\n")
     clean_lines: List[str] = []
+    joined_len = -1  # length of " ".join(clean_lines)
 
     for line in lines:
         stripped = line.strip()
@@ -192,6 +201,9 @@ def clean_evidence_text(text: str, max_length: int = 500) -> str:
             cleaned = _strip_inline_noise(stripped)
             if cleaned:
                 clean_lines.append(cleaned)
+                joined_len += len(cleaned) + 1
+                if joined_len > max_length >= 0:
+                    break  # the rest would be truncated away
 
     # Join and truncate
     result = " ".join(clean_lines)
@@ -379,6 +391,23 @@ def extract_procedure_name(procedure_text: str) -> Optional[str]:
     return None
 
 
+# Historical time references, searched in lowercased text
+_HISTORICAL_PATTERNS = [
+    r"history of",
+    r"past (?:medical|surgical) history",
+    r"pmh",
+    r"psh",
+    r"previous(?:ly)?",
+    r"prior to (?:admission|this)",
+    r"\d+\s+(?:months?|years?|weeks?)\s+ago",
+    r"remote history",
+    r"old fracture",
+    r"healed fracture",
+    r"status post.*\d+\s+(?:months?|years?)",
+]
+_HISTORICAL_RE = re.compile("|".join(f"(?:{p})" for p in _HISTORICAL_PATTERNS))
+
+
 def is_historical_reference(text: str) -> bool:
     """
     Check if text refers to historical/past events rather than current admission.
@@ -388,28 +417,7 @@ def is_historical_reference(text: str) -> bool:
     if not text:
         return False
 
-    text_lower = text.lower()
-
-    # Historical time references
-    historical_patterns = [
-        r"history of",
-        r"past (?:medical|surgical) history",
-        r"pmh",
-        r"psh",
-        r"previous(?:ly)?",
-        r"prior to (?:admission|this)",
-        r"\d+\s+(?:months?|years?|weeks?)\s+ago",
-        r"remote history",
-        r"old fracture",
-        r"healed fracture",
-        r"status post.*\d+\s+(?:months?|years?)",
-    ]
-
-    for pattern in historical_patterns:
-        if re.search(pattern, text_lower):
-            return True
-
-    return False
+    return _HISTORICAL_RE.search(text.lower()) is not None
 
 
 def get_clean_snippet(
@@ -14,7 +14,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 try:
     from openpyxl import Workbook, load_workbook
@@ -361,35 +361,41 @@ def _create_workbook() -> Workbook:
 # Public API
 # ---------------------------------------------------------------------------
 
-def update_excel_dashboard(
-    evaluation: Dict[str, Any],
-    vrc_results: List[Dict[str, Any]],
-    output_path: Path,
-) -> Path:
+def open_excel_dashboard(output_path: Path) -> Workbook:
     """
-    Add or update a patient row in the Excel trauma dashboard.
-
-    If the file exists, opens it and updates/appends.
-    If not, creates a new workbook with all sheets and formatting.
+    Load the dashboard workbook, or create it with all sheets if absent.
 
     Args:
-        evaluation: Patient evaluation dict from batch_eval.evaluate_patient()
-        vrc_results: VRC classification results from classify_vrc_categories()
         output_path: Path to Excel file
 
     Returns:
-        Path to the Excel file
+        In-memory workbook; the caller saves it.
     """
     if not HAS_OPENPYXL:
         raise ImportError("openpyxl is required for Excel dashboard generation")
 
-    # Load or create workbook
     if output_path.exists():
-        wb = load_workbook(output_path)
-    else:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        wb = _create_workbook()
+        return load_workbook(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return _create_workbook()
+
 
+def update_excel_dashboard_ws(
+    evaluation: Dict[str, Any],
+    vrc_results: List[Dict[str, Any]],
+    wb: Workbook,
+) -> None:
+    """
+    Add or update a patient row in an already-open dashboard workbook.
+
+    Only touches the in-memory workbook, so a batch can update many
+    patients and save once.
+
+    Args:
+        evaluation: Patient evaluation dict from batch_eval.evaluate_patient()
+        vrc_results: VRC classification results from classify_vrc_categories()
+        wb: Workbook from open_excel_dashboard()
+    """
     patient_id = str(evaluation.get("patient_id", ""))
 
     # Update/append to each sheet
@@ -409,5 +415,52 @@ def update_excel_dashboard(
                 row = 2  # First data row
         builder(row)
 
+
+def update_excel_dashboard_batch(
+    evaluations: Iterable[Dict[str, Any]],
+    vrc_results: Iterable[List[Dict[str, Any]]],
+    output_path: Path,
+) -> Path:
+    """
+    Add or update many patients' rows, loading and saving the workbook once.
+
+    Args:
+        evaluations: Patient evaluation dicts from batch_eval.evaluate_patient()
+        vrc_results: VRC classification results, one list per evaluation
+        output_path: Path to Excel file
+
+    Returns:
+        Path to the Excel file
+    """
+    wb = open_excel_dashboard(output_path)
+    for evaluation, vrc in zip(evaluations, vrc_results):
+        update_excel_dashboard_ws(evaluation, vrc, wb)
+    wb.save(output_path)
+    return output_path
+
+
+def update_excel_dashboard(
+    evaluation: Dict[str, Any],
+    vrc_results: List[Dict[str, Any]],
+    output_path: Path,
+) -> Path:
+    """
+    Add or update a patient row in the Excel trauma dashboard.
+
+    If the file exists, opens it and updates/appends.
+    If not, creates a new workbook with all sheets and formatting.
+    For many patients, use update_excel_dashboard_batch() (or
+    open_excel_dashboard() + update_excel_dashboard_ws()) to save once.
+
+    Args:
+        evaluation: Patient evaluation dict from batch_eval.evaluate_patient()
+        vrc_results: VRC classification results from classify_vrc_categories()
+        output_path: Path to Excel file
+
+    Returns:
+        Path to the Excel file
+    """
+    wb = open_excel_dashboard(output_path)
+    update_excel_dashboard_ws(evaluation, vrc_results, wb)
     wb.save(output_path)
     return output_path
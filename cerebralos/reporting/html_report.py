@@ -17,9 +17,10 @@ Open the .html file directly in any browser.
 from __future__ import annotations
 
 import html
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, TextIO, Union
 
 
 def _e(text: str) -> str:
@@ -849,16 +850,21 @@ function toggleAll(sectionId) {
 # Public API
 # ---------------------------------------------------------------------------
 
+# Write buffer for the HTML report: a few large writes instead of many 8 KiB ones
+_HTML_WRITE_BUFFER = 128 * 1024
+
+
 def generate_patient_html(
     evaluation: Dict[str, Any],
-    output_path: Optional[Path] = None,
+    output_path: Optional[Union[Path, TextIO]] = None,
 ) -> str:
     """
     Generate a self-contained HTML patient report.
 
     Args:
         evaluation: Patient evaluation dict from batch_eval.evaluate_patient()
-        output_path: Optional path to write HTML file
+        output_path: Optional path (opened with a 128 KiB buffer) or open
+            text file to write the HTML to
 
     Returns:
         Complete HTML string.
@@ -924,8 +930,12 @@ def generate_patient_html(
 
     result = "\n".join(html_parts)
 
-    if output_path:
+    if isinstance(output_path, (str, os.PathLike)):
+        output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(result, encoding="utf-8")
+        with open(output_path, "w", encoding="utf-8", buffering=_HTML_WRITE_BUFFER) as fp:
+            fp.write(result)
+    elif output_path is not None:
+        output_path.write(result)
 
     return result
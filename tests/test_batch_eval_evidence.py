@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval._serialize_evidence.
+
+Covers:
+  - TRAUMA_HP / MAR / LAB text is kept verbatim up to its per-type limit
+  - Other source types are cleaned with get_clean_snippet at their limit
+  - Unlisted source types fall back to 1000 characters
+  - Enum and plain-string source types serialize the same
+  - Evidence without a text attribute serializes as empty text
+  - Protocol and NTDS serializers are the same function
+  - _evidence_serializer cleans each evidence object once and shares the dict
+  - evaluate_patient flags discharge status from the serialized source types
+"""
+from __future__ import annotations
+
+import enum
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+from cerebralos.reporting.evidence_utils import get_clean_snippet
+
+_PATIENT_TXT = textwrap.dedent("""\
+    PATIENT_NAME: Test Patient
+    PATIENT_ID: P001
+    ARRIVAL_TIME: 2026-01-15 08:00
+
+    [TRAUMA_HP 2026-01-15 08:30]
+    Patient is a 76 year old male admitted after fall from standing. GCS 15. Hx of afib on Eliquis.
+
+    [RADIOLOGY 2026-01-15 09:00]
+    CT head: no acute intracranial hemorrhage. Rib fractures 4-6 on the left.
+
+    [PHYSICIAN_NOTE 2026-01-15 12:00]
+    Tertiary survey completed. Pain controlled. Enoxaparin 40 mg daily started.
+""")
+
+
+class _SourceType(enum.Enum):
+    MAR = "MAR"
+    RADIOLOGY = "RADIOLOGY"
+
+
+def _ev(source_type, text, pointer=None):
+    return SimpleNamespace(source_type=source_type, text=text,
+                           timestamp="2026-01-01 08:00", pointer=pointer)
+
+
+class TestSerializeEvidence(unittest.TestCase):
+
+    def test_preserved_types_keep_raw_text(self):
+        text = "Line one\n  Line two\n" * 5000
+        for stype, limit in (("TRAUMA_HP", 15000), ("MAR", 50000), ("LAB", 10000)):
+            out = be_mod._serialize_evidence(_ev(stype, text))
+            self.assertEqual(out["text"], text[:limit])
+            self.assertEqual(out["text_raw"], text[:limit])
+            self.assertEqual(out["source_type"], stype)
+            self.assertEqual(out["pointer"], {})
+
+    def test_other_types_cleaned_at_limit(self):
+        text = "CT head:   no acute   intracranial\nabnormality. " * 400
+        ev = _ev("RADIOLOGY", text, pointer=SimpleNamespace(ref={"line": 3}))
+        out = be_mod._serialize_evidence(ev)
+        cleaned, is_hist = get_clean_snippet(ev, max_length=3000, skip_if_historical=False)
+        self.assertEqual(out["text"], cleaned)
+        self.assertEqual(out["text_raw"], text[:3000])
+        self.assertEqual(out["is_historical"], is_hist)
+        self.assertEqual(out["pointer"], {"line": 3})
+
+    def test_unlisted_type_default_limit(self):
+        out = be_mod._serialize_evidence(_ev("SOMETHING_ELSE", "x" * 5000))
+        self.assertEqual(len(out["text_raw"]), 1000)
+
+    def test_enum_and_string_source_types_match(self):
+        text = "Heparin 5000 units\nsubcut"
+        self.assertEqual(be_mod._serialize_evidence(_ev(_SourceType.MAR, text)),
+                         be_mod._serialize_evidence(_ev("MAR", text)))
+        self.assertEqual(be_mod._serialize_evidence(_ev(_SourceType.RADIOLOGY, text)),
+                         be_mod._serialize_evidence(_ev("RADIOLOGY", text)))
+
+    def test_empty_text(self):
+        out = be_mod._serialize_evidence(_ev("PHYSICIAN_NOTE", None))
+        self.assertEqual((out["text"], out["text_raw"], out["is_historical"]), ("", "", False))
+
+    def test_missing_text_attribute(self):
+        ev = SimpleNamespace(source_type="LAB", timestamp=None, pointer=None)
+        out = be_mod._serialize_evidence(ev)
+        self.assertEqual((out["text"], out["text_raw"], out["is_historical"]), ("", "", False))
+
+    def test_aliases(self):
+        self.assertIs(be_mod._serialize_protocol_evidence, be_mod._serialize_evidence)
+        self.assertIs(be_mod._serialize_ntds_evidence, be_mod._serialize_evidence)
+
+
+class TestEvidenceSerializer(unittest.TestCase):
+
+    def test_serializes_each_object_once(self):
+        a, b = _ev("RADIOLOGY", "CT head negative"), _ev("RADIOLOGY", "CT head negative")
+        serialize = be_mod._evidence_serializer()
+        with patch.object(be_mod, "_serialize_evidence", wraps=be_mod._serialize_evidence) as inner:
+            first = serialize(a)
+            self.assertIs(serialize(a), first)
+            other = serialize(b)
+        self.assertEqual(inner.call_count, 2)
+        self.assertIsNot(other, first)
+        self.assertEqual(other, first)
+
+    def test_holds_references_so_ids_stay_unique(self):
+        serialize = be_mod._evidence_serializer()
+        seen = [serialize(_ev("LAB", f"Hgb {i}"))["text"] for i in range(50)]
+        self.assertEqual(seen, [f"Hgb {i}" for i in range(50)])
+
+    def test_evaluate_patient_shares_step_snippets(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "P001.txt"
+            path.write_text(_PATIENT_TXT, encoding="utf-8")
+            evaluation = be_mod.evaluate_patient(path, be_mod._load_resources())
+        by_id = {id(s) for s in evaluation["all_evidence_snippets"]}
+        step_snippets = [s for r in evaluation["results"] for step in r["step_trace"]
+                         for s in step["evidence_snippets"]]
+        self.assertTrue(step_snippets)
+        self.assertTrue(all(id(s) in by_id for s in step_snippets))
+
+    def test_evaluate_patient_discharge_status(self):
+        discharged = _PATIENT_TXT + textwrap.dedent("""\
+
+            [DISCHARGE] 2026-01-20 10:00
+            Discharged home in stable condition.
+        """)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            flags = []
+            for name, text in (("live.txt", _PATIENT_TXT), ("dc.txt", discharged)):
+                path = Path(tmpdir) / name
+                path.write_text(text, encoding="utf-8")
+                evaluation = be_mod.evaluate_patient(path, be_mod._load_resources())
+                flags.append((evaluation["has_discharge"], evaluation["is_live"]))
+        self.assertEqual(flags, [(False, True), (True, False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
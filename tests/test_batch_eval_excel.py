@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch_eval --excel dashboard update.
+
+Covers:
+  - update_excel_dashboard_batch opens and saves the workbook once
+  - batch_eval main() applies every patient to one workbook, in order
+  - A missing openpyxl is reported as skipped
+"""
+from __future__ import annotations
+
+import io
+import sys
+import tempfile
+import textwrap
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+from cerebralos.reporting import excel_dashboard as xl_mod
+
+_PATIENT_TXT = textwrap.dedent("""\
+    PATIENT_NAME: {name}
+    PATIENT_ID: {pid}
+    ARRIVAL_TIME: 2026-01-15 08:00
+
+    [PHYSICIAN_NOTE] 2026-01-15 09:00
+    Patient is a 76 year old male admitted for fall.
+""")
+
+
+class TestUpdateExcelDashboardBatch(unittest.TestCase):
+
+    def test_single_open_and_save(self):
+        wb = MagicMock()
+        path = Path("dash.xlsx")
+        with patch.object(xl_mod, "open_excel_dashboard", return_value=wb) as open_wb, \
+                patch.object(xl_mod, "update_excel_dashboard_ws") as update_ws:
+            out = xl_mod.update_excel_dashboard_batch(
+                [{"patient_id": "A"}, {"patient_id": "B"}], [["va"], ["vb"]], path)
+        self.assertEqual(out, path)
+        open_wb.assert_called_once_with(path)
+        wb.save.assert_called_once_with(path)
+        self.assertEqual([c.args for c in update_ws.call_args_list],
+                         [({"patient_id": "A"}, ["va"], wb), ({"patient_id": "B"}, ["vb"], wb)])
+
+
+class TestBatchEvalExcel(unittest.TestCase):
+
+    def _main(self, tmpdir, **patches):
+        pdir = Path(tmpdir) / "patients"
+        pdir.mkdir()
+        for i in range(3):
+            (pdir / f"P{i}.txt").write_text(
+                _PATIENT_TXT.format(name=f"Patient {i}", pid=f"P{i:03d}"), encoding="utf-8")
+        argv = ["batch_eval", "--patient-dir", str(pdir), "--excel", "--workers", "1",
+                "--output-dir", str(Path(tmpdir) / "out")]
+        out = io.StringIO()
+        with patch.object(sys, "argv", argv), redirect_stdout(out):
+            be_mod.main()
+        return out.getvalue()
+
+    def test_one_workbook_for_batch(self):
+        wb = MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(xl_mod, "open_excel_dashboard", return_value=wb) as open_wb, \
+                patch.object(xl_mod, "update_excel_dashboard_ws") as update_ws:
+            out = self._main(tmpdir)
+        open_wb.assert_called_once()
+        wb.save.assert_called_once()
+        self.assertEqual([c.args[0]["patient_id"] for c in update_ws.call_args_list],
+                         ["P000", "P001", "P002"])
+        self.assertIn("Excel: outputs/trauma_dashboard.xlsx", out)
+
+    def test_missing_openpyxl_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(xl_mod, "HAS_OPENPYXL", False):
+            out = self._main(tmpdir)
+        self.assertIn("Excel: skipped (openpyxl is required", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval._read_header_meta (patient file header metadata).
+
+Covers:
+  - PATIENT_NAME / DOB / TRAUMA_CATEGORY are read, stripped, last one wins
+  - The header ends at the first blank line or "[" block line
+  - Headers longer than one read chunk are scanned to their end
+  - CRLF files and missing files
+"""
+from __future__ import annotations
+
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from cerebralos.ingestion import batch_eval as be_mod
+
+
+class TestReadHeaderMeta(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "patient.txt"
+
+    def _meta(self, text, newline="\n"):
+        self.path.write_text(text, encoding="utf-8", newline=newline)
+        return be_mod._read_header_meta(self.path)
+
+    def test_reads_header_fields(self):
+        meta = self._meta(textwrap.dedent("""\
+            PATIENT_NAME:  Zoë Test
+            PATIENT_ID: P001
+              DOB: 01/01/1950
+            TRAUMA_CATEGORY: Level II
+            TRAUMA_CATEGORY: Level I
+
+            [PHYSICIAN_NOTE 2026-01-15 09:00]
+            PATIENT_NAME: Not The Header
+        """))
+        self.assertEqual(meta, {"patient_name": "Zoë Test", "dob": "01/01/1950",
+                                "trauma_category": "Level I"})
+
+    def test_block_line_ends_header(self):
+        meta = self._meta("DOB: 1/1/1950\n  [ED_NOTE]\nPATIENT_NAME: late\n")
+        self.assertEqual(meta, {"dob": "1/1/1950"})
+
+    def test_whitespace_line_ends_header(self):
+        self.assertEqual(self._meta("DOB: x\n \t \nPATIENT_NAME: late\n"), {"dob": "x"})
+
+    def test_header_longer_than_read_chunk(self):
+        filler = "".join(f"NOTE_{i}: {'x' * 90}\n" for i in range(200))
+        meta = self._meta(filler + "PATIENT_NAME: Far Down\n\nDOB: late\n")
+        self.assertEqual(meta, {"patient_name": "Far Down"})
+
+    def test_crlf(self):
+        meta = self._meta("PATIENT_NAME: A B\nDOB: 2/2/1960\n\n[LAB]\n", newline="\r\n")
+        self.assertEqual(meta, {"patient_name": "A B", "dob": "2/2/1960"})
+
+    def test_missing_file(self):
+        self.assertEqual(be_mod._read_header_meta(self.path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval.evaluate_patients (parallel batch evaluation).
+
+Covers:
+  - Serial path yields one evaluation per file, in input order
+  - Process-pool path yields results identical to the serial path
+  - Empty input yields nothing
+  - The default worker count follows the CPU affinity mask
+  - Forked workers inherit the resources without a shared-memory block
+  - Spawned workers receive the parent's resources via shared memory
+  - main() renders reports on a pool with the same files and output as serial
+  - Evaluation and render pools split the worker budget between them
+  - Report modules for the enabled formats are preloaded before the pool forks
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import re
+import sys
+import pickle
+import tempfile
+import textwrap
+import unittest
+from contextlib import redirect_stdout
+from multiprocessing import shared_memory
+from pathlib import Path
+from unittest.mock import patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+from cerebralos.ingestion.batch_eval import _load_resources, evaluate_patients
+
+
+_PATIENT_TXT = textwrap.dedent("""\
+    PATIENT_NAME: {name}
+    PATIENT_ID: {pid}
+    DOB: 01/01/1950
+    ARRIVAL_TIME: 2026-01-15 08:00
+    TRAUMA_CATEGORY: Level II
+
+    [PHYSICIAN_NOTE 2026-01-15 09:00]
+    Patient is a 76 year old male admitted for fall.
+    GCS: 15.  Alert and oriented.
+""")
+
+
+def _write_patients(tmpdir: str, count: int) -> list:
+    paths = []
+    for i in range(count):
+        p = Path(tmpdir) / f"Patient_{i}.txt"
+        p.write_text(_PATIENT_TXT.format(name=f"Patient {i}", pid=f"P{i:03d}"), encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+class TestEvaluatePatients(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.resources = _load_resources()
+
+    def test_serial_preserves_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = _write_patients(tmpdir, 3)
+            evals = list(evaluate_patients(files, self.resources, workers=1))
+        self.assertEqual([e["patient_id"] for e in evals], ["P000", "P001", "P002"])
+
+    def test_pool_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = _write_patients(tmpdir, 3)
+            serial = list(evaluate_patients(files, self.resources, workers=1))
+            pooled = list(evaluate_patients(files, self.resources, workers=2))
+        self.assertEqual(serial, pooled)
+
+    def test_default_workers_respects_affinity(self):
+        with patch.object(be_mod.os, "sched_getaffinity", create=True, return_value={0, 3}):
+            self.assertEqual(be_mod._default_workers(), 2)
+        with patch.object(be_mod.os, "sched_getaffinity", create=True, side_effect=AttributeError), \
+                patch.object(be_mod.os, "cpu_count", return_value=None):
+            self.assertEqual(be_mod._default_workers(), 1)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "fork is not the default")
+    def test_fork_pool_skips_shared_memory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = _write_patients(tmpdir, 2)
+            with patch.object(be_mod.shared_memory, "SharedMemory",
+                              side_effect=AssertionError("pickled")):
+                pooled = list(evaluate_patients(files, self.resources, workers=2))
+        self.assertEqual([e["patient_id"] for e in pooled], ["P000", "P001"])
+        self.assertIsNone(be_mod._WORKER_RESOURCES)
+
+    def test_spawn_pool_matches_serial(self):
+        spawn = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = _write_patients(tmpdir, 2)
+            serial = list(evaluate_patients(files, self.resources, workers=1))
+            with patch.object(be_mod.multiprocessing, "get_context", return_value=spawn):
+                pooled = list(evaluate_patients(files, self.resources, workers=2))
+        self.assertEqual(serial, pooled)
+
+    def test_empty_input(self):
+        self.assertEqual(list(evaluate_patients([], self.resources, workers=4)), [])
+
+    def test_worker_init_reads_shared_block(self):
+        payload = pickle.dumps({"marker": [1, 2, 3]})
+        shm = shared_memory.SharedMemory(create=True, size=len(payload))
+        saved = be_mod._WORKER_RESOURCES
+        try:
+            shm.buf[:len(payload)] = payload
+            be_mod._worker_init(shm.name, len(payload))
+            self.assertEqual(be_mod._WORKER_RESOURCES, {"marker": [1, 2, 3]})
+        finally:
+            be_mod._WORKER_RESOURCES = saved
+            shm.close()
+            shm.unlink()
+
+
+class TestMainRenderPool(unittest.TestCase):
+
+    def _run(self, pdir, out_dir, workers):
+        argv = ["batch_eval", "--patient-dir", str(pdir), "--html", "--json", "--v5",
+                "--workers", str(workers), "--output-dir", str(out_dir), "--no-open"]
+        out = io.StringIO()
+        with patch.object(sys, "argv", argv), redirect_stdout(out):
+            be_mod.main()
+        stamp = re.compile(r".*[Gg]enerated.*\n")
+        files = {p.name: stamp.sub("", p.read_text(encoding="utf-8"))
+                 for p in sorted(out_dir.iterdir())}
+        return out.getvalue().replace(str(out_dir), "OUT"), files
+
+    def test_pool_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_patients(tmpdir, 3)
+            serial = self._run(tmpdir, Path(tmpdir) / "serial", 1)
+            pooled = self._run(tmpdir, Path(tmpdir) / "pooled", 2)
+        self.assertEqual(serial, pooled)
+        self.assertEqual(len(serial[1]), 12)
+        blocks = serial[0].split("Evaluating: ")[1:]
+        self.assertEqual([b.split("\n", 1)[0] for b in blocks],
+                         ["Patient_0.txt", "Patient_1.txt", "Patient_2.txt"])
+        self.assertIn("  → JSON: OUT/Patient_0_results.json\n\n", blocks[0])
+
+    def test_split_workers(self):
+        self.assertEqual(be_mod._split_workers(0), (0, 0))
+        self.assertEqual(be_mod._split_workers(1), (1, 0))
+        self.assertEqual(be_mod._split_workers(2), (1, 1))
+        self.assertEqual(be_mod._split_workers(7), (4, 3))
+        self.assertEqual(be_mod._split_workers(8), (4, 4))
+
+    def test_pools_share_worker_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_patients(tmpdir, 4)
+            with patch.object(be_mod, "evaluate_patients", wraps=be_mod.evaluate_patients) as ev, \
+                    patch.object(be_mod, "ProcessPoolExecutor", wraps=be_mod.ProcessPoolExecutor) as pool:
+                self._run(tmpdir, Path(tmpdir) / "out", 4)
+        self.assertEqual(ev.call_args.kwargs["workers"], 2)
+        self.assertEqual([c.kwargs["max_workers"] for c in pool.call_args_list], [2, 2])
+
+    def test_render_patient_reports(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pf = _write_patients(tmpdir, 1)[0]
+            evaluation = be_mod.evaluate_patient(pf, _load_resources())
+            options = be_mod._RenderOptions(report_dir=Path(tmpdir) / "out", json=True)
+            lines, html_path = be_mod._render_patient_reports(pf, evaluation, options)
+            self.assertTrue((options.report_dir / "Patient_0_results.json").exists())
+        self.assertIsNone(html_path)
+        self.assertEqual([l.split(":")[0] for l in lines], ["  → Text", "  → JSON"])
+
+    def test_preload_report_modules(self):
+        imported = []
+        with patch.object(be_mod.importlib, "import_module", side_effect=imported.append), \
+                patch.object(be_mod, "_narrative_builders") as narrative, \
+                patch.object(be_mod, "_protocol_explainers", side_effect=ImportError):
+            be_mod._preload_report_modules(be_mod._RenderOptions(report_dir=Path("out"), html=True))
+            narrative.assert_called_once_with()
+            self.assertEqual(imported, ["cerebralos.reporting.html_report"])
+            imported.clear()
+            be_mod._preload_report_modules(be_mod._RenderOptions(report_dir=Path("out"), v5=True))
+        self.assertIn("cerebralos.reporting.render_trauma_daily_notes_v5", imported)
+        self.assertNotIn("cerebralos.reporting.html_report", imported)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval._print_aggregate_summary.
+
+Covers:
+  - Per-protocol compliant / non-compliant / indeterminate counts
+  - NTDS YES events with per-event patient totals
+  - NTDS totals line, with ERROR only when present
+  - Batches without NTDS results or findings
+"""
+from __future__ import annotations
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from cerebralos.ingestion import batch_eval as be_mod
+
+
+def _ev(protocols, events):
+    return {
+        "results": [{"protocol_id": pid, "outcome": o} for pid, o in protocols],
+        "ntds_results": [{"event_id": eid, "canonical_name": f"Event {eid}", "outcome": o}
+                         for eid, o in events],
+    }
+
+
+def _summary(evaluations):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        be_mod._print_aggregate_summary(evaluations)
+    return out.getvalue()
+
+
+class TestAggregateSummary(unittest.TestCase):
+
+    def test_full_summary(self):
+        text = _summary([
+            _ev([("B", "COMPLIANT"), ("A", "NON_COMPLIANT"), ("C", "NOT_TRIGGERED")],
+                [(8, "YES"), (1, "NO"), (14, "ERROR")]),
+            _ev([("B", "INDETERMINATE"), ("A", "NON_COMPLIANT"), ("C", "NOT_TRIGGERED")],
+                [(8, "NO"), (1, "EXCLUDED"), (14, "UNABLE_TO_DETERMINE")]),
+        ])
+        rule = "=" * 70
+        self.assertEqual(text, (
+            f"{rule}\nAGGREGATE SUMMARY\n{rule}\n"
+            "Patients evaluated: 2\n\n"
+            "Protocols with findings:\n"
+            "  A: 2 non-compliant\n"
+            "  B: 1 compliant, 1 indeterminate\n\n"
+            "NTDS Hospital Events with YES findings:\n"
+            "  #08 Event 8: 1/2 patients\n\n"
+            "NTDS totals across 2 patients × 3 events:\n"
+            "  YES: 1  NO: 2  EXCLUDED: 1  UNABLE: 1  ERROR: 1\n"
+            f"{rule}\n"))
+
+    def test_no_findings(self):
+        text = _summary([_ev([("A", "NOT_TRIGGERED")], [(2, "NO")])] * 2)
+        self.assertIn("Protocols with findings:\n\n", text)
+        self.assertIn("NTDS Hospital Events with YES findings:\n  (none)\n\n", text)
+        self.assertIn("  YES: 0  NO: 2  EXCLUDED: 0  UNABLE: 0\n" + "=" * 70 + "\n", text)
+
+    def test_without_ntds(self):
+        text = _summary([{"results": []}, {"results": []}])
+        self.assertNotIn("NTDS", text)
+        self.assertTrue(text.endswith("Protocols with findings:\n\n" + "=" * 70 + "\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos/__main__.py main() command dispatch.
+
+Covers:
+  - Each command name routes to its handler with the remaining args
+  - Command names are case-insensitive
+  - Unknown commands and no args fall back to help
+  - Importing the CLI loads no command-only modules
+"""
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cerebralos.__main__ as main_mod
+
+
+class TestMainDispatch(unittest.TestCase):
+
+    def _dispatch(self, argv):
+        with patch("sys.argv", ["cerebralos", *argv]):
+            return main_mod.main()
+
+    def test_routes_each_command(self):
+        for name, handler in [
+            ("run", "cmd_run"),
+            ("run-all", "cmd_run_all"),
+            ("live", "cmd_live"),
+            ("excel", "cmd_excel"),
+            ("help", "cmd_help"),
+        ]:
+            self.assertIs(main_mod._COMMANDS[name], getattr(main_mod, handler))
+            fn = MagicMock(return_value=7)
+            with self.subTest(command=name), patch.dict(main_mod._COMMANDS, {name: fn}):
+                self.assertEqual(self._dispatch([name, "a", "--b"]), 7)
+                fn.assert_called_once_with(["a", "--b"])
+
+    def test_case_insensitive(self):
+        fn = MagicMock(return_value=0)
+        with patch.dict(main_mod._COMMANDS, {"live": fn}):
+            self._dispatch(["LIVE", "x"])
+        fn.assert_called_once_with(["x"])
+
+    def test_unknown_command_shows_help(self):
+        buf = io.StringIO()
+        with patch("sys.stdout", buf), \
+             patch.object(main_mod, "cmd_help", return_value=0) as fn:
+            self.assertEqual(self._dispatch(["bogus"]), 0)
+        self.assertIn("Unknown command: bogus", buf.getvalue())
+        fn.assert_called_once_with([])
+
+    def test_no_args_shows_help(self):
+        with patch.object(main_mod, "cmd_help", return_value=0) as fn:
+            self._dispatch([])
+        fn.assert_called_once_with([])
+
+
+class TestColdStart(unittest.TestCase):
+
+    def test_import_defers_command_modules(self):
+        probe = ("import sys, cerebralos.__main__; "
+                 "print(sorted(m for m in ('json', 'concurrent.futures', 'openpyxl', "
+                 "'cerebralos.ingestion.batch_eval') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                             check=True, cwd=main_mod._PROJECT_ROOT)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos/__main__.py cmd_excel workbook handling.
+
+Covers:
+  - The dashboard workbook is opened once and saved once for N patients
+  - Every patient is applied to the same in-memory workbook
+  - Progress and summary lines reach stdout in order
+  - Only *.txt files in data_raw/ are evaluated, sorted by name
+  - Patients with an up-to-date JSON sidecar are not re-evaluated
+  - --force, a newer patient file, or a version change re-evaluates
+  - Sidecars from a batch_eval --live run are re-evaluated
+  - The evaluation generator is finished before the workbook is saved
+  - A missing data_raw/ means no patients rather than an error
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import cerebralos.__main__ as main_mod
+from cerebralos import GOVERNANCE_VERSION, ENGINE_VERSION, RULES_VERSIONS
+from cerebralos.ingestion import batch_eval as be_mod
+from cerebralos.reporting import excel_dashboard as xl_mod
+from cerebralos.classification import vrc_categories as vrc_mod
+
+
+def _evaluation(pid):
+    return {
+        "patient_id": pid,
+        "governance_version": GOVERNANCE_VERSION,
+        "engine_version": ENGINE_VERSION,
+        "rules_versions": RULES_VERSIONS,
+    }
+
+
+class TestCmdExcelSingleSave(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.data_dir = self.root / "data_raw"
+        self.data_dir.mkdir()
+        self.out_dir = self.root / "outputs" / "pi_reports"
+        for name in ("C.txt", "A.txt", "B.txt", "notes.md"):
+            (self.data_dir / name).write_text("PATIENT_ID: X\n", encoding="utf-8")
+        (self.data_dir / "subdir.txt").mkdir()
+        self.excel_path = self.root / "outputs" / "trauma_dashboard.xlsx"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, args=(), evaluated=("A", "B", "C")):
+        self.wb = MagicMock()
+        self.open_wb = MagicMock(return_value=self.wb)
+        self.update_ws = MagicMock()
+        self.out = io.StringIO()
+        with patch.object(main_mod, "_DATA_DIR", self.data_dir), \
+             patch.object(main_mod, "_PROJECT_ROOT", self.root), \
+             patch.object(main_mod, "_OUTPUT_DIR", self.out_dir), \
+             patch.object(be_mod, "_load_resources", return_value={}), \
+             patch.object(be_mod, "evaluate_patients",
+                          return_value=iter([_evaluation(p) for p in evaluated])) as ev_mock, \
+             patch.object(vrc_mod, "classify_vrc_categories", return_value=[]), \
+             patch.object(xl_mod, "open_excel_dashboard", self.open_wb), \
+             patch.object(xl_mod, "update_excel_dashboard_ws", self.update_ws), \
+             patch("sys.stdout", self.out):
+            rc = main_mod.cmd_excel(list(args))
+        self.assertEqual(rc, 0)
+        return [p.name for p in ev_mock.call_args.args[0]] if ev_mock.called else []
+
+    def _age_inputs(self):
+        # Push patient and rule mtimes into the past so sidecars are newer
+        for pf in self.data_dir.glob("*.txt"):
+            os.utime(pf, ns=(0, 0))
+
+    def test_open_and_save_once(self):
+        self.assertEqual(self._run(), ["A.txt", "B.txt", "C.txt"])
+        self.open_wb.assert_called_once_with(self.excel_path)
+        self.assertEqual(self.update_ws.call_count, 3)
+        for call, pid in zip(self.update_ws.call_args_list, ("A", "B", "C")):
+            self.assertEqual(call.args[0]["patient_id"], pid)
+            self.assertIs(call.args[2], self.wb)
+        self.wb.save.assert_called_once_with(self.excel_path)
+        self.assertEqual(self.out.getvalue().splitlines(), [
+            "CerebralOS -- Regenerating Excel dashboard",
+            "  Evaluating: A.txt",
+            "  Evaluating: B.txt",
+            "  Evaluating: C.txt",
+            f"  Excel: {self.excel_path}",
+            "Done.",
+        ])
+
+    def test_missing_data_dir_has_no_patients(self):
+        for pf in self.data_dir.iterdir():
+            pf.rmdir() if pf.is_dir() else pf.unlink()
+        self.data_dir.rmdir()
+        self.assertEqual(self._run(), [])
+        self.update_ws.assert_not_called()
+        self.wb.save.assert_called_once_with(self.excel_path)
+
+    def test_up_to_date_sidecars_skip_evaluation(self):
+        self._run()
+        self._age_inputs()
+        with patch.object(be_mod, "_resource_stamp", return_value=(("rules", 0),)):
+            evaluated = self._run(evaluated=())
+        self.assertEqual(evaluated, [])
+        self.assertEqual(self.update_ws.call_count, 3)
+        self.assertIn("  Up to date: B.txt", self.out.getvalue().splitlines())
+
+    def test_newer_patient_file_reevaluated(self):
+        self._run()
+        self._age_inputs()
+        os.utime(self.data_dir / "B.txt", ns=(0, 2**62))
+        with patch.object(be_mod, "_resource_stamp", return_value=(("rules", 0),)):
+            self.assertEqual(self._run(evaluated=("B",)), ["B.txt"])
+        self.assertEqual([c.args[0]["patient_id"] for c in self.update_ws.call_args_list],
+                         ["A", "B", "C"])
+
+    def test_version_mismatch_reevaluated(self):
+        self._run()
+        self._age_inputs()
+        sidecar = self.out_dir / "C_results.json"
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+        data["governance_version"] = "v0"
+        sidecar.write_text(json.dumps(data), encoding="utf-8")
+        with patch.object(be_mod, "_resource_stamp", return_value=(("rules", 0),)):
+            self.assertEqual(self._run(evaluated=("C",)), ["C.txt"])
+
+    def test_forced_live_sidecar_reevaluated(self):
+        self._run()
+        self._age_inputs()
+        sidecar = self.out_dir / "A_results.json"
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+        data.update(is_live=True, has_discharge=False, live_forced=True)
+        sidecar.write_text(json.dumps(data), encoding="utf-8")
+        with patch.object(be_mod, "_resource_stamp", return_value=(("rules", 0),)):
+            self.assertEqual(self._run(evaluated=("A",)), ["A.txt"])
+
+    def test_evaluation_pool_finished_before_save(self):
+        events = []
+
+        def evaluations(files, resources):
+            try:
+                for pf in files:
+                    yield _evaluation(pf.stem)
+            finally:
+                events.append("pool closed")
+
+        self.wb = MagicMock()
+        self.wb.save.side_effect = lambda path: events.append("save")
+        with patch.object(main_mod, "_DATA_DIR", self.data_dir), \
+             patch.object(main_mod, "_PROJECT_ROOT", self.root), \
+             patch.object(main_mod, "_OUTPUT_DIR", self.out_dir), \
+             patch.object(be_mod, "_load_resources", return_value={}), \
+             patch.object(be_mod, "evaluate_patients", evaluations), \
+             patch.object(vrc_mod, "classify_vrc_categories", return_value=[]), \
+             patch.object(xl_mod, "open_excel_dashboard", return_value=self.wb), \
+             patch.object(xl_mod, "update_excel_dashboard_ws"), \
+             patch("sys.stdout", io.StringIO()):
+            self.assertEqual(main_mod.cmd_excel([]), 0)
+        self.assertEqual(events, ["pool closed", "save"])
+
+    def test_force_reevaluates_everything(self):
+        self._run()
+        self._age_inputs()
+        with patch.object(be_mod, "_resource_stamp", return_value=(("rules", 0),)):
+            self.assertEqual(self._run(["--force"]), ["A.txt", "B.txt", "C.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
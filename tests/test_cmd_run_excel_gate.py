@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the Excel step gating in cerebralos/__main__.py cmd_run.
+
+Covers:
+  - Excel update runs by default when openpyxl is importable
+  - --no-excel skips the Excel update
+  - CEREBRAL_EXCEL=0 skips the Excel update
+  - Missing openpyxl skips the Excel update without importing it
+  - Concurrent report writers still report in fixed order
+  - A failed report writer waits for the Excel update before raising
+"""
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+def _fake_evaluation():
+    return {
+        "patient_id": "TP001",
+        "patient_name": "Test Patient",
+        "dob": "01/01/1950",
+        "trauma_category": "Level II",
+        "arrival_time": "2026-01-15 08:00",
+        "source_file": "Test_Patient.txt",
+        "evidence_blocks": 1,
+        "has_discharge": False,
+        "is_live": True,
+        "all_evidence_snippets": [],
+        "protocols_evaluated": 0,
+        "results": [],
+        "ntds_results": [],
+        "governance_version": "test",
+        "engine_version": "test",
+        "rules_versions": {},
+    }
+
+
+class TestCmdRunExcelGate(unittest.TestCase):
+
+    def _run(self, extra_args=(), env=None, openpyxl_present=True, stdout=None):
+        import cerebralos.__main__ as main_mod
+        from cerebralos.ingestion import batch_eval as be_mod
+        from cerebralos.reporting import excel_dashboard as xl_mod
+
+        update = MagicMock()
+        spec = MagicMock() if openpyxl_present else None
+        with tempfile.TemporaryDirectory() as tmpdir:
+            patient_path = Path(tmpdir) / "Test_Patient.txt"
+            patient_path.write_text("PATIENT_ID: TP001\n", encoding="utf-8")
+            with patch.object(main_mod, "_OUTPUT_DIR", Path(tmpdir) / "pi_reports"), \
+                 patch.object(main_mod, "_PROJECT_ROOT", Path(tmpdir)), \
+                 patch.object(main_mod, "_open_file", lambda p: None), \
+                 patch.object(main_mod, "_resolve_patient_file", return_value=patient_path), \
+                 patch.object(be_mod, "evaluate_patient", return_value=_fake_evaluation()), \
+                 patch.object(be_mod, "_generate_v5_report", return_value=""), \
+                 patch.object(xl_mod, "update_excel_dashboard", update), \
+                 patch("importlib.util.find_spec", return_value=spec), \
+                 patch("sys.stdout", stdout or io.StringIO()), \
+                 patch.dict(os.environ, env or {}):
+                rc = main_mod.cmd_run([str(patient_path), *extra_args])
+        self.assertEqual(rc, 0)
+        return update
+
+    def test_excel_runs_by_default(self):
+        self._run().assert_called_once()
+
+    def test_no_excel_flag_skips(self):
+        self._run(["--no-excel"]).assert_not_called()
+
+    def test_env_zero_skips(self):
+        self._run(env={"CEREBRAL_EXCEL": "0"}).assert_not_called()
+
+    def test_missing_openpyxl_skips(self):
+        self._run(openpyxl_present=False).assert_not_called()
+
+    def test_status_order(self):
+        out = io.StringIO()
+        self._run(stdout=out)
+        labels = [line.split(":", 1)[0].strip() for line in out.getvalue().splitlines()
+                  if line.startswith("  ") and ":" in line]
+        self.assertEqual(labels[-6:], ["Text", "HTML", "JSON", "V5", "Bundle", "Excel"])
+
+    def test_failed_writer_waits_for_excel(self):
+        import cerebralos.__main__ as main_mod
+        from cerebralos.ingestion import batch_eval as be_mod
+        from cerebralos.reporting import excel_dashboard as xl_mod
+
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_update(*args):
+            release.wait(5)
+            finished.set()
+
+        def failing_report(*args, **kwargs):
+            release.set()
+            raise OSError("disk full")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            patient_path = Path(tmpdir) / "Test_Patient.txt"
+            patient_path.write_text("PATIENT_ID: TP001\n", encoding="utf-8")
+            with patch.object(main_mod, "_OUTPUT_DIR", Path(tmpdir) / "pi_reports"), \
+                 patch.object(main_mod, "_PROJECT_ROOT", Path(tmpdir)), \
+                 patch.object(main_mod, "_resolve_patient_file", return_value=patient_path), \
+                 patch.object(be_mod, "evaluate_patient", return_value=_fake_evaluation()), \
+                 patch.object(be_mod, "generate_pi_report", failing_report), \
+                 patch.object(be_mod, "_generate_v5_report", return_value=""), \
+                 patch.object(xl_mod, "update_excel_dashboard", slow_update), \
+                 patch("importlib.util.find_spec", return_value=MagicMock()), \
+                 patch("sys.stdout", io.StringIO()):
+                with self.assertRaises(OSError):
+                    main_mod.cmd_run([str(patient_path)])
+                self.assertTrue(finished.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval._write_evaluation_json (per-patient JSON sidecar).
+
+Covers:
+  - orjson and stdlib backends produce equivalent JSON, non-ASCII as raw UTF-8
+  - datetimes are ISO-8601 and dataclasses are objects in both backends
+  - Other unknown types (Path, Decimal) are stringified
+  - Parent directories are created
+  - compact=True drops indentation in both backends, same data
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+
+
+@dataclass
+class _Pointer:
+    source: str
+    line: int
+
+
+def _sample_evaluation():
+    return {
+        "patient_id": "P001",
+        "patient_name": "Zoë Test",
+        "source_file": Path("data_raw/P001.txt"),
+        "arrival_time": datetime(2026, 1, 15, 8, 0),
+        "results": [{"protocol_id": "X", "outcome": "COMPLIANT", "step_trace": []}],
+        "ntds_results": [],
+        "rules_versions": {"ntds": "2026_v1"},
+        "pointer": _Pointer("PHYSICIAN_NOTE", 12),
+        "iss": Decimal("17.5"),
+    }
+
+
+class TestWriteEvaluationJson(unittest.TestCase):
+
+    def _write(self, tmpdir, orjson_mod, compact=False, raw=False):
+        path = Path(tmpdir) / "nested" / "P001_results.json"
+        with patch.object(be_mod, "orjson", orjson_mod):
+            be_mod._write_evaluation_json(_sample_evaluation(), path, compact=compact)
+        text = path.read_text(encoding="utf-8")
+        return text if raw else json.loads(text)
+
+    def test_stdlib_fallback(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = self._write(tmpdir, None)
+        self.assertEqual(data["patient_id"], "P001")
+        self.assertEqual(data["source_file"], str(Path("data_raw/P001.txt")))
+        self.assertEqual(data["arrival_time"], "2026-01-15T08:00:00")
+        self.assertEqual(data["pointer"], {"source": "PHYSICIAN_NOTE", "line": 12})
+        self.assertEqual(data["iss"], "17.5")
+
+    @unittest.skipIf(be_mod.orjson is None, "orjson not installed")
+    def test_orjson_matches_stdlib(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fast = self._write(tmpdir, be_mod.orjson)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            slow = self._write(tmpdir, None)
+        self.assertEqual(fast["patient_name"], "Zoë Test")
+        self.assertEqual(fast["results"], slow["results"])
+        self.assertEqual(fast, slow)
+
+    def test_non_ascii_written_as_utf8(self):
+        backends = [None] + ([be_mod.orjson] if be_mod.orjson is not None else [])
+        texts = []
+        for orjson_mod in backends:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                texts.append(self._write(tmpdir, orjson_mod, raw=True))
+        for text in texts:
+            self.assertIn('"patient_name": "Zoë Test"', text)
+        self.assertEqual(len(set(texts)), 1)
+
+    def test_compact(self):
+        backends = [None] + ([be_mod.orjson] if be_mod.orjson is not None else [])
+        for orjson_mod in backends:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                text = self._write(tmpdir, orjson_mod, compact=True, raw=True)
+                pretty = self._write(tmpdir, orjson_mod)
+            self.assertNotIn("\n", text)
+            self.assertIn('"patient_id":"P001","patient_name":', text)
+            self.assertEqual(json.loads(text), pretty)
+
+
+if __name__ == "__main__":
+    unittest.main()
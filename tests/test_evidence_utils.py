@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos.reporting.evidence_utils text cleaning.
+
+Covers:
+  - The combined noise regex agrees with matching each pattern separately
+  - Inline Epic noise is stripped and repeated spaces collapsed
+  - clean_evidence_text truncates long text the same as join-then-slice
+  - is_historical_reference matches each historical pattern
+"""
+from __future__ import annotations
+
+import re
+import unittest
+from types import SimpleNamespace
+
+from cerebralos.reporting import evidence_utils as eu
+
+_LINES = [
+    "Signed", "Expand All Collapse All", "Revision History", "1/2/2026 1430", "*****",
+    "Electronically signed by Smith, John MD on 1/2/2026 1430", "Smith, John MD",
+    "Physician", "Status: Signed", "Date of Service: 1/3/2026", "Cosigned by Doe, Jane NP",
+    "Patient resting comfortably.  Pain  controlled.", "Plan: continue enoxaparin 40 mg",
+    "Signed Expand All Collapse All Tertiary survey done", "  Vitals stable, GCS 15  ", "",
+]
+
+
+class TestNoiseLines(unittest.TestCase):
+
+    def test_combined_regex_matches_pattern_list(self):
+        for line in _LINES + ["signed", "COMPONENT", "Pended by", "----- x", "Result  Date "]:
+            expected = any(re.match(p, line.strip(), re.IGNORECASE)
+                           for p in eu._EPIC_NOISE_PATTERNS)
+            self.assertEqual(bool(eu._EPIC_NOISE_RE.match(line.strip())), expected, line)
+
+    def test_strip_inline_noise(self):
+        self.assertEqual(eu._strip_inline_noise("Signed Expand All Collapse All Tertiary survey done"),
+                         "Tertiary survey done")
+        self.assertEqual(eu._strip_inline_noise("Pain  controlled.   Ambulating"),
+                         "Pain controlled. Ambulating")
+        self.assertEqual(eu._strip_inline_noise("Note ROUTING HISTORY  end"), "Note end")
+
+
+class TestCleanEvidenceText(unittest.TestCase):
+
+    def test_clean_text(self):
+        text = "\n".join(_LINES)
+        self.assertEqual(eu.clean_evidence_text(text, 500),
+                         "Patient resting comfortably. Pain controlled. "
+                         "Plan: continue enoxaparin 40 mg Tertiary survey done Vitals stable, GCS 15")
+
+    def test_truncation_matches_full_join(self):
+        text = "\n".join(_LINES * 40)
+        full = eu.clean_evidence_text(text, 10 ** 6)
+        for limit in (0, 1, 29, 30, 31, 200, len(full) - 1, len(full)):
+            expected = full if len(full) <= limit else full[:limit].rstrip() + "..."
+            self.assertEqual(eu.clean_evidence_text(text, limit), expected, limit)
+
+    def test_get_clean_snippet(self):
+        ev = SimpleNamespace(text="History of afib\nPatient stable.")
+        self.assertEqual(eu.get_clean_snippet(ev, 300), ("History of afib Patient stable.", True))
+        self.assertEqual(eu.get_clean_snippet(ev, 300, skip_if_historical=True), ("", True))
+        self.assertEqual(eu.get_clean_snippet(SimpleNamespace(text=""), 300), ("", False))
+
+
+class TestHistoricalReference(unittest.TestCase):
+
+    def test_patterns(self):
+        for text in ("History of DVT", "PMH: afib", "previously on warfarin",
+                     "prior to admission", "fell 3 years ago", "Old fracture of radius",
+                     "status post ORIF 2 years"):
+            self.assertTrue(eu.is_historical_reference(text), text)
+        for text in ("", "Acute rib fractures", "status post ORIF today"):
+            self.assertFalse(eu.is_historical_reference(text), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
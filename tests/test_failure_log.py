@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos/governance/failure_log.py.
+
+Covers:
+  - append() writes one JSON Lines record with None fields omitted
+  - The hand-rolled serializer matches json.dumps of the entry
+  - append_many() writes a batch with one open and creates the directory once
+  - Inside a with-block one buffered handle serves every append
+  - Concurrent appends are written together by whichever thread holds the lock
+  - A failed group write raises in every thread whose records it held
+  - durable=True opens the log O_DSYNC (or fsyncs where that is missing)
+  - rotate_bytes rotates and compresses segments and keeps totals in an index
+  - A log checks its size on its first append, so per-use instances rotate too
+  - Segments are zstd-compressed when zstandard is installed, gzipped otherwise
+  - preallocate_bytes pwrites into a zero-filled file that readers stop short of
+  - A log without preallocate_bytes writes in place over another writer's zero tail
+  - A NUL run mid-file (crash debris) does not hide the records after it
+  - format="msgpack" writes length-prefixed records that convert back to JSON Lines
+  - Entries round-trip through read_all(), count() and summary()
+  - iter_entries() streams records and skips malformed lines
+  - Records parse the same with or without orjson
+  - Integer microsecond timestamps round-trip; timestamp_us/_iso read either form
+  - Parsed entries share one string per category, section and detection_source
+  - read_columns() holds the same rows as read_all(), one list per field
+  - count() and summary() scan a memory map and ignore blank lines
+  - summary() counts exactly the records read_all() returns, torn or joined lines excluded
+  - The log_* helpers write exactly what append(FailureEntry(...)) would
+  - _iso_now() matches datetime.now().isoformat()
+  - The log_*_many helpers write what the single helpers would, in one append
+"""
+from __future__ import annotations
+
+import builtins
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import MISSING, asdict, fields
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from cerebralos.governance import failure_log as fl
+
+_ZSTANDARD = fl.zstandard  # the rotation tests patch it out
+
+
+def _entry(i=0, category="rule", section="19A", **kw):
+    return fl.FailureEntry(
+        timestamp=f"2026-01-01T00:00:{i:02d}",
+        section=section,
+        category=category,
+        description=f"entry {i}",
+        command="test",
+        detection_source="execution",
+        **kw,
+    )
+
+
+class TestFailureLogAppend(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "nested" / "failure_log.jsonl"
+        self.log = fl.FailureLog(self.path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_append_omits_none_fields(self):
+        self.log.append(_entry(1, patient_id="P1", metadata={"k": 1}))
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record["patient_id"], "P1")
+        self.assertEqual(record["metadata"], {"k": 1})
+        self.assertNotIn("protocol_id", record)
+
+    def test_serialize_matches_json_dumps(self):
+        for entry in (_entry(0), _entry(1, patient_id='é "q"\n\\', protocol_id="\u2028😀",
+                                        metadata={"when": date(2026, 1, 1), "n": None, "x": [1.5]}),
+                      _entry(2, section=None, patient_id=3, metadata=[datetime(2026, 1, 1)])):
+            record = {k: v for k, v in asdict(entry).items() if v is not None}
+            self.assertEqual(fl._serialize(entry),
+                             json.dumps(record, default=str).encode("utf-8") + b"\n")
+
+    def test_append_many_single_open(self):
+        real_open = builtins.open
+        with patch("builtins.open", side_effect=real_open) as open_mock, \
+             patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir_mock:
+            self.log.append_many(_entry(i) for i in range(5))
+            self.log.append_many([_entry(5)])
+            self.log.append_many([])
+        self.assertEqual(open_mock.call_count, 2)
+        self.assertEqual(mkdir_mock.call_count, 1)
+        self.assertEqual([e.description for e in self.log.read_all()],
+                         [f"entry {i}" for i in range(6)])
+
+    def test_append_many_matches_append(self):
+        other = fl.FailureLog(self.path.with_name("single.jsonl"))
+        entries = [_entry(i, patient_id=f"P{i}") for i in range(3)]
+        for e in entries:
+            other.append(e)
+        self.log.append_many(entries)
+        self.assertEqual(self.path.read_bytes(), other.path.read_bytes())
+
+    def test_context_manager_holds_one_handle(self):
+        real_open = builtins.open
+        with patch("builtins.open", side_effect=real_open) as open_mock:
+            with self.log as log:
+                for i in range(5):
+                    log.append(_entry(i))
+                self.assertEqual(open_mock.call_count, 1)
+                self.assertEqual(log.count(), 5)
+            self.assertIsNone(self.log._fh)
+            self.log.append(_entry(5))
+        self.assertEqual(open_mock.call_count, 3)
+        self.assertEqual(self.log.count(), 6)
+
+    def test_flush_fsync(self):
+        with self.log as log:
+            log.append(_entry(0))
+            with patch.object(fl.os, "fsync") as fsync_mock:
+                log.flush()
+                fsync_mock.assert_not_called()
+                log.flush(fsync=True)
+            fsync_mock.assert_called_once_with(log._fh.fileno())
+        self.log.flush(fsync=True)  # no handle held: no-op
+
+    def test_concurrent_appends_group_committed(self):
+        real_open = builtins.open
+        threads = [threading.Thread(target=self.log.append, args=(_entry(i),)) for i in range(5)]
+        scratch = self.log._scratch
+        with patch("builtins.open", side_effect=real_open) as open_mock:
+            with self.log._write_lock:
+                for t in threads:
+                    t.start()
+                deadline = time.monotonic() + 5
+                while len(self.log._pending) < 5 and time.monotonic() < deadline:
+                    time.sleep(0.001)
+            for t in threads:
+                t.join()
+        self.assertEqual(open_mock.call_count, 1)
+        self.assertEqual(sorted(e.description for e in self.log.read_all()),
+                         [f"entry {i}" for i in range(5)])
+        self.assertIs(self.log._scratch, scratch)
+
+    def test_group_commit_error_reaches_every_writer(self):
+        errors = []
+
+        def append(i):
+            try:
+                self.log.append(_entry(i))
+            except OSError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=append, args=(i,)) for i in range(3)]
+        with patch.object(self.log, "_open_append", side_effect=OSError("disk full")):
+            with self.log._write_lock:
+                for t in threads:
+                    t.start()
+                deadline = time.monotonic() + 5
+                while len(self.log._pending) < 3 and time.monotonic() < deadline:
+                    time.sleep(0.001)
+            for t in threads:
+                t.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(self.log._pending, fl.deque())
+        self.log.append(_entry(3))  # the log still works once the error clears
+        self.assertEqual([e.description for e in self.log.read_all()], ["entry 3"])
+
+    def test_oversized_scratch_released(self):
+        big = [b"{}\n" * (fl._SCRATCH_MAX_SIZE // 3), b"{}\n" * 10]
+        with self.log._write_lock:
+            self.log._pending.append(fl._PendingWrite(big[0]))
+        self.log._write(big[1])
+        self.assertEqual(self.log._scratch, bytearray())
+        self.assertEqual(self.log.count(), fl._SCRATCH_MAX_SIZE // 3 + 10)
+
+    def test_many_threads_no_lost_or_torn_records(self):
+        def work(t):
+            for i in range(50):
+                self.log.append(_entry(i, patient_id=f"T{t}"))
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        entries = self.log.read_all()
+        self.assertEqual(len(entries), 400)
+        self.assertEqual(self.log.count(), 400)
+        for t in range(8):
+            self.assertEqual([e.description for e in entries if e.patient_id == f"T{t}"],
+                             [f"entry {i}" for i in range(50)])
+
+    def test_durable_opens_dsync(self):
+        log = fl.FailureLog(self.path, durable=True)
+        with patch.object(fl, "_O_DSYNC", 0), patch.object(fl.os, "fsync") as fsync_mock:
+            log.append(_entry(0))
+        self.assertEqual(fsync_mock.call_count, 1)  # no O_DSYNC: fsync instead
+        with patch.object(fl.os, "open", side_effect=os.open) as os_open:
+            with log:
+                log.append(_entry(1))
+                log.append(_entry(2))
+                self.assertEqual(log.path.read_bytes().count(b"\n"), 3)  # not left buffered
+        self.assertEqual(os_open.call_count, 1)
+        flags = os_open.call_args.args[1]
+        self.assertTrue(flags & os.O_APPEND)
+        self.assertEqual(flags & fl._O_DSYNC, fl._O_DSYNC)
+        self.assertEqual(log.count(), 3)
+
+    def test_round_trip_count_summary(self):
+        self.log.append_many([_entry(0), _entry(1, "drift"), _entry(2)])
+        self.assertEqual(self.log.read_all()[1], _entry(1, "drift"))
+        self.assertEqual(self.log.count(), 3)
+        self.assertEqual(self.log.summary(), {"rule": 2, "drift": 1})
+
+    def test_iter_entries_streams_and_skips_malformed(self):
+        self.log.append(_entry(0))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n \t\n\r\n{not json\n  " + json.dumps({"category": "drift"}) + " \r\n")
+        it = self.log.iter_entries()
+        self.assertEqual(next(it), _entry(0))
+        partial = next(it)
+        self.assertEqual((partial.category, partial.section, partial.patient_id), ("drift", "", None))
+        self.assertEqual(list(it), [])
+        with patch.object(fl.FailureLog, "read_all", side_effect=AssertionError):
+            self.assertEqual(self.log.summary(), {"rule": 1, "drift": 1})
+
+    def test_entry_from_record_covers_every_field(self):
+        full = fl._entry_from_record(asdict(_entry(3, patient_id="P", protocol_id="X", metadata={})))
+        self.assertEqual(full, _entry(3, patient_id="P", protocol_id="X", metadata={}))
+        self.assertEqual(list(vars(full)), list(fl._FIELDS))
+        empty = fl._entry_from_record({"extra": 1})
+        self.assertEqual(vars(empty), {f.name: "" if f.default is MISSING else None
+                                       for f in fields(fl.FailureEntry)})
+
+    def test_repeated_strings_shared(self):
+        log = fl.FailureLog(self.path)
+        log.append_many([_entry(i, section=f"sec{i % 2}") for i in range(4)])
+        with self.path.open("a") as f:
+            f.write('{"category": 7, "section": null}\n')
+        entries = log.read_all()
+        self.assertIs(entries[0].category, fl._INTERN["rule"])
+        self.assertIs(entries[0].detection_source, entries[3].detection_source)
+        self.assertIs(entries[0].section, entries[2].section)
+        self.assertEqual(entries[1].section, "sec1")
+        self.assertEqual((entries[4].category, entries[4].section), (7, None))
+
+    def test_read_columns_matches_read_all(self):
+        self.assertEqual(self.log.read_columns(), {name: [] for name in fl._FIELDS})
+        self.log.append_many([_entry(i, category="drift" if i % 2 else "rule",
+                                     patient_id=f"p{i}" if i % 3 else None,
+                                     metadata={"i": i})
+                              for i in range(5)])
+        columns = self.log.read_columns()
+        self.assertEqual(list(columns), list(fl._FIELDS))
+        rows = [asdict(e) for e in self.log.read_all()]
+        self.assertEqual(columns, {name: [r[name] for r in rows] for name in fl._FIELDS})
+        self.assertIs(columns["category"][1], columns["category"][3])
+
+    def test_loads_with_and_without_orjson(self):
+        odd = json.dumps({"category": "rule", "metadata": {"x": float("nan"), "s": "\ud800"}})
+        for impl in (fl.orjson, None):
+            with patch.object(fl, "orjson", impl):
+                self.assertEqual(fl._loads('{"category": "drift"}\n'), {"category": "drift"})
+                self.assertEqual(fl._loads(odd)["metadata"]["s"], "\ud800")
+                with self.assertRaises(json.JSONDecodeError):
+                    fl._loads("{not json")
+
+    def test_summary_fast_path_matches_full_parse(self):
+        self.log.append_many([
+            _entry(0),
+            _entry(1, "drift", metadata={"category": "structural"}),
+            fl.FailureEntry("t", 'a "quoted" \\ section', "structural",
+                            ', "category": "rule"', "c", "execution"),
+            fl.FailureEntry("t", "s", "caf\u00e9", "d", "c", "execution"),
+            fl.FailureEntry(1767225600000000, "s", "drift", "d", "c", "execution"),
+        ])
+        with open(self.path, "ab") as f:
+            f.write(b'{"category": "drift", "timestamp": "t"}\n')
+            f.write(b'{"timestamp": "t", "section": "s", "category": "rule", "descr\n')
+        expected = {}
+        for e in self.log.iter_entries():
+            expected[e.category] = expected.get(e.category, 0) + 1
+        self.assertEqual(self.log.summary(), expected)
+        self.assertEqual(expected, {"rule": 1, "drift": 3, "structural": 1, "caf\u00e9": 1})
+        int_line = fl._serialize(fl.FailureEntry(1767225600000000, "s", "drift", "d", "c", "execution"))
+        self.assertEqual(fl._RECORD.fullmatch(int_line).group(1), b"drift")
+        helper_line = fl._negation_miss("t", "P1", "PROT", "key", 'a "b"', "cmd")
+        self.assertEqual(fl._RECORD.fullmatch(helper_line).group(1), b"rule")
+
+    def test_summary_rejects_torn_and_joined_lines(self):
+        record = fl._serialize(_entry(0))
+        self.path.parent.mkdir(parents=True)
+        with open(self.path, "wb") as f:
+            f.write(record[:60] + b"}\n")  # torn, but ends like a record
+            f.write(record[:-1] + record)  # two records run together
+            f.write(b'{"timestamp": "t", "section": "s", "category": "rule", "description": "d", '
+                    b'"command": "c", "detection_source": "e", "metadata": {"a": 1}\n')  # torn metadata
+        self.assertEqual(self.log.read_all(), [])
+        self.assertEqual(self.log.summary(), {})
+
+    def test_int_timestamps(self):
+        now = datetime(2026, 3, 1, 12, 30, 5, 123456)
+        us = int(now.replace(microsecond=0).timestamp()) * 1_000_000 + 123456
+        iso = fl.FailureEntry(now.isoformat(), "s", "rule", "d", "c", "execution")
+        self.assertEqual(iso.timestamp_us, us)
+        self.assertEqual(iso.timestamp_iso, now.isoformat())
+        self.log.append(fl.FailureEntry(us, "s", "rule", "d", "c", "execution"))
+        self.assertIn(f'{{"timestamp": {us}, '.encode(), self.path.read_bytes())
+        [entry] = self.log.read_all()
+        self.assertEqual(entry.timestamp, us)
+        self.assertEqual(entry.timestamp_us, us)
+        self.assertEqual(entry.timestamp_iso, now.isoformat())
+        self.assertEqual(fl.FailureEntry(us - 123456, "s", "rule", "d", "c", "e").timestamp_iso,
+                         now.replace(microsecond=0).isoformat())
+
+    def test_count_ignores_blank_lines(self):
+        self.path.parent.mkdir(parents=True)
+        for content, expected in [
+            (b"", 0), (b"\n\n", 0), (b"{}", 1), (b"{}\n", 1),
+            (b" \n{}\n\t\n\n{}\n  ", 2), (b"{}\n{}\n{}", 3),
+        ]:
+            self.path.write_bytes(content)
+            self.assertEqual(self.log.count(), expected, content)
+
+    def test_summary_counts_missing_category_as_empty(self):
+        self.log.append(_entry(0))
+        with open(self.path, "ab") as f:
+            f.write(b'{"section": "19A"}\n\n')
+        self.assertEqual(self.log.summary(), {"rule": 1, "": 1})
+
+    def test_missing_file(self):
+        self.assertEqual(self.log.read_all(), [])
+        self.assertEqual(self.log.count(), 0)
+        self.assertEqual(self.log.summary(), {})
+
+
+# 2026-01-02 03:04:05.000678 local time
+_NOW = datetime(2026, 1, 2, 3, 4, 5, 678)
+_NOW_NS = (int(_NOW.replace(microsecond=0).timestamp()) * 1_000_000 + 678) * 1000
+
+
+class TestConvenienceHelpers(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log = fl.FailureLog(Path(self._tmp.name) / "failure_log.jsonl")
+        self._patches = [patch.object(fl.time, "time_ns", return_value=_NOW_NS),
+                         patch.object(fl, "_iso_second", (-1, ""))]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        self._tmp.cleanup()
+
+    def _assert_written(self, **fields):
+        entry = fl.FailureEntry(timestamp="2026-01-02T03:04:05.000678", category="rule",
+                                detection_source="execution", **fields)
+        self.assertEqual(self.log.path.read_bytes(), fl._serialize(entry))
+        self.assertEqual(self.log.read_all(), [entry])
+
+    def test_iso_now_matches_isoformat(self):
+        self.assertEqual(fl._iso_now(), _NOW.isoformat())
+        with patch.object(fl.time, "strftime", side_effect=AssertionError("reformatted")):
+            self.assertEqual(fl._iso_now(), _NOW.isoformat())
+        whole = _NOW.replace(microsecond=0)
+        with patch.object(fl.time, "time_ns", return_value=int(whole.timestamp()) * 10**9):
+            self.assertEqual(fl._iso_now(), whole.isoformat())
+        later = datetime(2026, 7, 1, 23, 59, 59, 999999)
+        with patch.object(fl.time, "time_ns",
+                          return_value=(int(later.replace(microsecond=0).timestamp()) * 10**6
+                                        + 999999) * 1000):
+            self.assertEqual(fl._iso_now(), later.isoformat())
+
+    def test_unanchored_evidence(self):
+        fl.log_unanchored_evidence(self.log, "P1", "PROT", "REQ_1", command="run")
+        self._assert_written(section="evidence_anchor", command="run", patient_id="P1",
+                             protocol_id="PROT",
+                             description="Evidence used for REQ_1 lacks proper source anchoring")
+
+    def test_missing_required_element(self):
+        fl.log_missing_required_element(self.log, "P1", "GCS", section="19B")
+        self._assert_written(section="19B", command="", patient_id="P1",
+                             description="Required element 'GCS' not documented")
+
+    def test_negation_miss(self):
+        fl.log_negation_miss(self.log, "P1", "PROT", "key", 'no "café"')
+        self._assert_written(section="negation_detection", command="", patient_id="P1",
+                             protocol_id="PROT",
+                             description="Potential negation miss: 'no \"café\"' matched on key",
+                             metadata={"pattern_key": "key", "matched_text": 'no "café"'})
+
+    def test_historical_false_trigger(self):
+        fl.log_historical_false_trigger(self.log, "P1", "PROT", "old fx")
+        self._assert_written(section="historical_filtering", command="", patient_id="P1",
+                             protocol_id="PROT",
+                             description="Potential historical false trigger: 'old fx'",
+                             metadata={"matched_text": "old fx"})
+
+
+class TestBatchedHelpers(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self._patches = [patch.object(fl.time, "time_ns", return_value=_NOW_NS),
+                         patch.object(fl, "_iso_second", (-1, ""))]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        self._tmp.cleanup()
+
+    def test_many_matches_single_calls(self):
+        cases = [
+            (fl.log_unanchored_evidence, fl.log_unanchored_evidence_many,
+             [{"patient_id": "P1", "protocol_id": "X", "requirement_id": "R1"},
+              {"patient_id": "P2", "protocol_id": "X", "requirement_id": "R2", "command": "run"}]),
+            (fl.log_missing_required_element, fl.log_missing_required_element_many,
+             [{"patient_id": "P1", "element_name": "GCS"},
+              {"patient_id": "P2", "element_name": "ISS", "section": "19B"}]),
+            (fl.log_negation_miss, fl.log_negation_miss_many,
+             [{"patient_id": "P1", "protocol_id": "X", "pattern_key": "k", "matched_text": "no fx"}]),
+            (fl.log_historical_false_trigger, fl.log_historical_false_trigger_many,
+             [{"patient_id": "P1", "protocol_id": "X", "matched_text": "h/o fx"},
+              {"patient_id": "P2", "protocol_id": "Y", "matched_text": "remote"}]),
+        ]
+        for single, many, records in cases:
+            single_log = fl.FailureLog(self.dir / f"{single.__name__}.jsonl")
+            many_log = fl.FailureLog(self.dir / f"{many.__name__}.jsonl")
+            for r in records:
+                single(single_log, **r)
+            with patch.object(many_log, "_write", wraps=many_log._write) as write_mock:
+                many(many_log, records)
+            write_mock.assert_called_once()
+            self.assertEqual(many_log.path.read_bytes(), single_log.path.read_bytes(), many.__name__)
+
+    def test_exported(self):
+        for name in fl.__all__:
+            self.assertTrue(hasattr(fl, name), name)
+        self.assertIn("log_negation_miss_many", fl.__all__)
+
+
+class TestFailureLogRotation(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "failure_log.jsonl"
+        self._patch = patch.object(fl, "_ROTATE_CHECK_INTERVAL", 1)
+        self._patch.start()
+        self._zstd_patch = patch.object(fl, "zstandard", None)
+        self._zstd_patch.start()
+
+    def tearDown(self):
+        self._zstd_patch.stop()
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def test_rotates_compresses_and_indexes(self):
+        log = fl.FailureLog(self.path, rotate_bytes=400)
+        for i in range(10):
+            log.append(_entry(i, "drift" if i % 3 == 0 else "rule"))
+        log.close()  # waits for background compression
+        names = sorted(p.name for p in self.dir.iterdir())
+        self.assertIn("failure_log.index.json", names)
+        self.assertIn("failure_log.1.jsonl.gz", names)
+        self.assertNotIn("failure_log.1.jsonl", names)
+        self.assertLess(self.path.stat().st_size, 400 + 200)
+        self.assertEqual([e.description for e in log.iter_entries()],
+                         [f"entry {i}" for i in range(10)])
+        self.assertEqual(log.count(), 10)
+        self.assertEqual(log.summary(), {"drift": 4, "rule": 6})
+        self.assertEqual(log.read_columns()["description"],
+                         [f"entry {i}" for i in range(10)])
+        with patch.object(fl, "gzip", side_effect=AssertionError("segment read")):
+            log.count()
+            log.summary()
+
+    @unittest.skipUnless(_ZSTANDARD is not None, "zstandard not installed")
+    def test_zstd_segments(self):
+        log = fl.FailureLog(self.path, rotate_bytes=400)
+        with patch.object(fl, "zstandard", _ZSTANDARD):
+            for i in range(10):
+                log.append(_entry(i))
+            log.close()
+            names = sorted(p.name for p in self.dir.iterdir())
+            self.assertIn("failure_log.1.jsonl.zst", names)
+            self.assertFalse([n for n in names if n.endswith((".gz", ".tmp"))])
+            self.assertEqual([e.description for e in log.iter_entries()],
+                             [f"entry {i}" for i in range(10)])
+
+    def test_zstd_segment_without_zstandard(self):
+        (self.dir / "failure_log.1.jsonl.zst").write_bytes(b"")
+        (self.dir / "failure_log.index.json").write_text(
+            json.dumps({"segments": 1, "count": 1, "summary": {"rule": 1}}))
+        with self.assertRaises(RuntimeError):
+            fl.FailureLog(self.path).read_all()
+
+    def test_uncompressed_segment_readable(self):
+        log = fl.FailureLog(self.path, rotate_bytes=200)
+        with patch.object(fl.threading, "Thread") as thread_mock:
+            log.append(_entry(0))
+            log.append(_entry(1))
+        thread_mock.return_value.start.assert_called_once()
+        self.assertTrue((self.dir / "failure_log.1.jsonl").exists())
+        self.assertEqual([e.description for e in log.read_all()], ["entry 0", "entry 1"])
+
+    def test_held_handle_rotates(self):
+        with fl.FailureLog(self.path, rotate_bytes=300) as log:
+            for i in range(6):
+                log.append(_entry(i))
+        self.assertEqual(log.count(), 6)
+        self.assertEqual([e.description for e in log.read_all()],
+                         [f"entry {i}" for i in range(6)])
+
+    def test_per_use_instances_rotate(self):
+        with patch.object(fl, "_ROTATE_CHECK_INTERVAL", 64):
+            for i in range(20):
+                log = fl.FailureLog(self.path, rotate_bytes=400)
+                log.append(_entry(i))
+                log.close()  # waits for background compression
+        log = fl.FailureLog(self.path)
+        self.assertLess(self.path.stat().st_size, 400 + 200)
+        self.assertTrue((self.dir / "failure_log.index.json").exists())
+        self.assertEqual(log.count(), 20)
+        self.assertEqual([e.description for e in log.iter_entries()],
+                         [f"entry {i}" for i in range(20)])
+
+    def test_no_rotation_by_default(self):
+        log = fl.FailureLog(self.path)
+        for i in range(10):
+            log.append(_entry(i))
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["failure_log.jsonl"])
+
+
+class TestFailureLogPreallocate(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "failure_log.jsonl"
+
+    def test_grows_in_steps_and_reads_back(self):
+        with fl.FailureLog(self.path, preallocate_bytes=1024) as log:
+            for i in range(10):
+                log.append(_entry(i, category="drift" if i % 3 == 0 else "rule"))
+                self.assertEqual(self.path.stat().st_size % 1024, 0)
+        self.assertEqual(self.path.stat().st_size, 2048)
+        data = self.path.read_bytes()
+        self.assertEqual(data.index(b"\0"), 10 * 153 + 4)  # "drift" is one byte longer
+        self.assertEqual(log.count(), 10)
+        self.assertEqual(log.summary(), {"drift": 4, "rule": 6})
+        self.assertEqual([e.description for e in log.iter_entries()],
+                         [f"entry {i}" for i in range(10)])
+
+    def test_reopen_continues_at_data_end(self):
+        fl.FailureLog(self.path, preallocate_bytes=4096).append(_entry(0))
+        with fl.FailureLog(self.path, preallocate_bytes=4096) as log:
+            log.append_many([_entry(1), _entry(2)])
+        self.assertEqual(self.path.stat().st_size, 4096)
+        self.assertEqual([e.description for e in log.read_all()],
+                         ["entry 0", "entry 1", "entry 2"])
+
+    def test_torn_record_terminated(self):
+        self.path.write_bytes(b'{"category": "ru' + bytes(100))
+        log = fl.FailureLog(self.path, preallocate_bytes=4096)
+        log.append(_entry(0))
+        self.assertEqual(log.count(), 2)
+        self.assertEqual([e.description for e in log.read_all()], ["entry 0"])
+
+    def test_plain_writer_continues_at_data_end(self):
+        fl.FailureLog(self.path, preallocate_bytes=4096).append(_entry(0))
+        fl.log_negation_miss(fl.FailureLog(self.path), "P1", "PROT", "no fever", "fever")
+        with fl.FailureLog(self.path) as log:
+            log.append(_entry(2))
+        self.assertEqual(self.path.stat().st_size, 4096)
+        self.assertEqual(log.count(), 3)
+        self.assertEqual([e.category for e in log.read_all()], ["rule", "rule", "rule"])
+        self.assertEqual(log.read_all()[1].patient_id, "P1")
+
+    def test_mid_file_nul_run_skipped(self):
+        log = fl.FailureLog(self.path)
+        log.append_many([_entry(i) for i in range(3)])
+        with open(self.path, "ab") as f:
+            f.write(bytes(64) + b"\n" + bytes(16))  # crash debris, then a record right after it
+        log.append_many([_entry(i, category="drift") for i in range(3, 6)])
+        self.assertEqual([e.description for e in log.read_all()],
+                         [f"entry {i}" for i in range(6)])
+        self.assertEqual(log.summary(), {"rule": 3, "drift": 3})
+        self.assertEqual(log.count(), 7)  # the NUL-only line is counted, as any non-blank line
+
+    def test_rotation_drops_zero_tail(self):
+        with patch.object(fl, "_ROTATE_CHECK_INTERVAL", 1), \
+                fl.FailureLog(self.path, rotate_bytes=300, preallocate_bytes=4096) as log:
+            for i in range(6):
+                log.append(_entry(i))
+        segments = sorted(Path(self._tmp.name).glob("failure_log.*.jsonl.*"))
+        self.assertTrue(segments)
+        self.assertEqual(log.count(), 6)
+        self.assertEqual([e.description for e in log.read_all()],
+                         [f"entry {i}" for i in range(6)])
+
+
+@unittest.skipUnless(fl.msgpack is not None, "msgpack not installed")
+class TestMsgpackFormat(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "failure_log.msgpack"
+        self.log = fl.FailureLog(self.path, format="msgpack")
+
+    def test_round_trip_and_convert(self):
+        entries = [_entry(i, category="drift" if i % 2 else "rule",
+                          metadata={"i": i, "when": date(2026, 1, 1)} if i == 3 else None)
+                   for i in range(5)]
+        with self.log:
+            self.log.append_many(entries[:4])
+            self.log.append(entries[4])
+        self.assertEqual(self.log.count(), 5)
+        self.assertEqual(self.log.summary(), {"rule": 3, "drift": 2})
+        self.assertEqual(self.log.read_all()[3].metadata, {"i": 3, "when": "2026-01-01"})
+        self.assertEqual(self.log.read_columns()["description"], [e.description for e in entries])
+
+        dst = Path(self._tmp.name) / "failure_log.jsonl"
+        fl.FailureLog(dst).append_many(entries)
+        expected = dst.read_bytes()
+        dst.unlink()
+        self.assertEqual(fl.failure_log_to_jsonl(self.path, dst), 5)
+        self.assertEqual(dst.read_bytes(), expected)
+
+    def test_helpers_write_msgpack(self):
+        fl.log_missing_required_element(self.log, "P1", "arrival_time", "19A", "cmd")
+        fl.log_negation_miss_many(self.log, [
+            {"patient_id": "P2", "protocol_id": "X", "pattern_key": "k", "matched_text": "no"},
+        ])
+        self.assertNotIn(b"\n", self.path.read_bytes()[:8])
+        self.assertEqual([e.patient_id for e in self.log.read_all()], ["P1", "P2"])
+
+    def test_torn_tail_ignored(self):
+        self.log.append(_entry(0))
+        with open(self.path, "ab") as f:
+            f.write(fl._FRAME_HEADER.pack(500) + b"\x80")
+        self.assertEqual(self.log.count(), 1)
+        self.assertEqual(len(self.log.read_all()), 1)
+
+
+class TestFormatValidation(unittest.TestCase):
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            fl.FailureLog(format="csv")
+
+    def test_msgpack_needs_package_and_plain_file(self):
+        with patch.object(fl, "msgpack", None), self.assertRaises(ImportError):
+            fl.FailureLog(format="msgpack")
+        with patch.object(fl, "msgpack", object()), self.assertRaises(ValueError):
+            fl.FailureLog(format="msgpack", rotate_bytes=1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval._load_resources memoization.
+
+Covers:
+  - Repeated calls return the same parsed resources object
+  - A changed rule-file stamp forces a re-parse
+  - The stamp covers the NTDS logic rule files
+  - A fresh process reuses the on-disk compiled-rules artifact
+  - A stale or corrupt artifact is ignored and rewritten
+  - Rule files parse the same with or without orjson
+  - The EVALUABLE protocol filter is precomputed into the resources
+  - NTDS rulesets load in event order; missing rule files are skipped
+"""
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+
+
+class TestLoadResourcesCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._patch = patch.object(be_mod, "_COMPILED_RULES_PATH",
+                                   Path(self._tmp.name) / "_compiled_rules.pkl")
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def test_repeated_calls_share_result(self):
+        first = be_mod._load_resources()
+        second = be_mod._load_resources()
+        self.assertIs(first, second)
+
+    def test_changed_stamp_reparses(self):
+        first = be_mod._load_resources()
+        real_stamp = be_mod._resource_stamp()
+        bumped = real_stamp[:-1] + ((real_stamp[-1][0], real_stamp[-1][1] + 1),)
+        with patch.object(be_mod, "_resource_stamp", return_value=bumped):
+            second = be_mod._load_resources()
+        self.assertIsNot(first, second)
+        self.assertEqual(first["action_patterns"], second["action_patterns"])
+        self.assertEqual(sorted(first["ntds_rulesets"]), sorted(second["ntds_rulesets"]))
+
+    def test_stamp_includes_ntds_rules(self):
+        stamped = {path for path, _ in be_mod._resource_stamp()}
+        self.assertIn(str(be_mod._PROTOCOLS_PATH), stamped)
+        self.assertTrue(any("/ntds/logic/2026/" in p for p in stamped))
+
+    def test_read_resources_without_orjson(self):
+        if be_mod.orjson is None:
+            self.skipTest("orjson not installed")
+        with_orjson = be_mod._read_resources()
+        with patch.object(be_mod, "orjson", None):
+            without = be_mod._read_resources()
+        self.assertEqual(with_orjson["protocols"], without["protocols"])
+        self.assertEqual(with_orjson["action_patterns"], without["action_patterns"])
+        self.assertEqual(with_orjson["contract"], without["contract"])
+
+    def test_evaluable_protocols_precomputed(self):
+        resources = be_mod._load_resources()
+        self.assertEqual(resources["evaluable_protocols"],
+                         be_mod._get_evaluable_protocols(resources["protocols"]))
+        self.assertIs(be_mod._evaluable_protocols(resources), resources["evaluable_protocols"])
+        self.assertEqual(be_mod._evaluable_protocols({"protocols": resources["protocols"]}),
+                         resources["evaluable_protocols"])
+
+    def test_ntds_rulesets_ordered_and_missing_skipped(self):
+        real = be_mod.load_ruleset
+
+        def load(year, eid):
+            if eid == 5:
+                raise SystemExit("Missing JSON")
+            return real(year, eid)
+
+        with patch.object(be_mod, "load_ruleset", side_effect=load):
+            rulesets = be_mod._read_resources()["ntds_rulesets"]
+        self.assertEqual(list(rulesets), [e for e in be_mod._NTDS_EVENT_IDS if e != 5])
+        self.assertEqual(rulesets[8].event["meta"]["event_id"], 8)
+
+
+class TestCompiledRulesArtifact(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "_compiled_rules.pkl"
+        self._patch = patch.object(be_mod, "_COMPILED_RULES_PATH", self.path)
+        self._patch.start()
+        self.stamp = be_mod._resource_stamp()
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def _load(self, stamp):
+        # Bypass the in-process lru_cache to simulate a fresh process
+        return be_mod._cached_resources.__wrapped__(stamp)
+
+    def test_artifact_written_then_reused(self):
+        first = self._load(self.stamp)
+        self.assertTrue(self.path.exists())
+        with patch.object(be_mod, "_read_resources", side_effect=AssertionError("re-parsed")):
+            second = self._load(self.stamp)
+        self.assertEqual(first["action_patterns"], second["action_patterns"])
+        self.assertEqual(sorted(first["ntds_rulesets"]), sorted(second["ntds_rulesets"]))
+
+    def test_stale_artifact_reparsed(self):
+        self._load(self.stamp)
+        bumped = self.stamp[:-1] + ((self.stamp[-1][0], self.stamp[-1][1] + 1),)
+        with patch.object(be_mod, "_read_resources", wraps=be_mod._read_resources) as read:
+            self._load(bumped)
+        read.assert_called_once()
+
+    def test_corrupt_artifact_reparsed(self):
+        self.path.write_bytes(b"not a pickle")
+        with patch.object(be_mod, "_read_resources", wraps=be_mod._read_resources) as read:
+            resources = self._load(self.stamp)
+        read.assert_called_once()
+        self.assertIn("protocols", resources)
+        self.assertEqual(be_mod._read_compiled_rules(
+            (be_mod._COMPILED_RULES_FORMAT, be_mod.ENGINE_VERSION, self.stamp))["protocols"],
+            resources["protocols"])
+
+
+if __name__ == "__main__":
+    unittest.main()
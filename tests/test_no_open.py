@@ -7,11 +7,14 @@ Covers:
   - __main__._open_file proceeds when env var absent
   - batch_eval._open_file skips when CEREBRAL_NO_OPEN=1
   - batch_eval._open_file proceeds when env var absent
+  - _open_file uses os.startfile on Windows (no shell)
+  - --no-open and a non-terminal stdout skip opening the report
   - run_patient.sh exports CEREBRAL_NO_OPEN=1
 """
 from __future__ import annotations
 
 import os
+import sys
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -25,21 +28,21 @@ class TestMainOpenFile(unittest.TestCase):
         return mod._open_file
 
     def test_skips_when_no_open_set(self):
-        """CEREBRAL_NO_OPEN=1 → subprocess.run never called."""
+        """CEREBRAL_NO_OPEN=1 → subprocess.Popen never called."""
         fn = self._import_open_file()
         with patch.dict(os.environ, {"CEREBRAL_NO_OPEN": "1"}), \
-             patch("subprocess.run") as mock_run:
+             patch("subprocess.Popen") as mock_run:
             fn(Path("/tmp/fake_report.html"))
             mock_run.assert_not_called()
 
     def test_proceeds_when_no_open_unset(self):
-        """No CEREBRAL_NO_OPEN → subprocess.run called (on Darwin)."""
+        """No CEREBRAL_NO_OPEN → subprocess.Popen called (on Darwin)."""
         fn = self._import_open_file()
         env = os.environ.copy()
         env.pop("CEREBRAL_NO_OPEN", None)
         with patch.dict(os.environ, env, clear=True), \
-             patch("platform.system", return_value="Darwin"), \
-             patch("subprocess.run") as mock_run:
+             patch.object(sys.modules[fn.__module__], "_SYSTEM", "Darwin"), \
+             patch("subprocess.Popen") as mock_run:
             fn(Path("/tmp/fake_report.html"))
             mock_run.assert_called_once()
 
@@ -47,8 +50,8 @@ class TestMainOpenFile(unittest.TestCase):
         """CEREBRAL_NO_OPEN=0 (not '1') → proceeds normally."""
         fn = self._import_open_file()
         with patch.dict(os.environ, {"CEREBRAL_NO_OPEN": "0"}), \
-             patch("platform.system", return_value="Darwin"), \
-             patch("subprocess.run") as mock_run:
+             patch.object(sys.modules[fn.__module__], "_SYSTEM", "Darwin"), \
+             patch("subprocess.Popen") as mock_run:
             fn(Path("/tmp/fake_report.html"))
             mock_run.assert_called_once()
 
@@ -61,25 +64,77 @@ class TestBatchEvalOpenFile(unittest.TestCase):
         return _open_file
 
     def test_skips_when_no_open_set(self):
-        """CEREBRAL_NO_OPEN=1 → subprocess.run never called."""
+        """CEREBRAL_NO_OPEN=1 → subprocess.Popen never called."""
         fn = self._import_open_file()
         with patch.dict(os.environ, {"CEREBRAL_NO_OPEN": "1"}), \
-             patch("subprocess.run") as mock_run:
+             patch("subprocess.Popen") as mock_run:
             fn(Path("/tmp/fake_report.html"))
             mock_run.assert_not_called()
 
     def test_proceeds_when_no_open_unset(self):
-        """No CEREBRAL_NO_OPEN → subprocess.run called."""
+        """No CEREBRAL_NO_OPEN → subprocess.Popen called."""
         fn = self._import_open_file()
         env = os.environ.copy()
         env.pop("CEREBRAL_NO_OPEN", None)
         with patch.dict(os.environ, env, clear=True), \
-             patch("platform.system", return_value="Darwin"), \
-             patch("subprocess.run") as mock_run:
+             patch.object(sys.modules[fn.__module__], "_SYSTEM", "Darwin"), \
+             patch("subprocess.Popen") as mock_run:
             fn(Path("/tmp/fake_report.html"))
             mock_run.assert_called_once()
 
 
+class TestOpenFileWindows(unittest.TestCase):
+    """On Windows both _open_file helpers call os.startfile, not a shell."""
+
+    def _check(self, fn):
+        env = os.environ.copy()
+        env.pop("CEREBRAL_NO_OPEN", None)
+        with patch.dict(os.environ, env, clear=True), \
+             patch.object(sys.modules[fn.__module__], "_SYSTEM", "Windows"), \
+             patch("os.startfile", create=True) as mock_start, \
+             patch("subprocess.Popen") as mock_popen:
+            fn(Path("/tmp/fake_report.html"))
+            mock_start.assert_called_once_with(str(Path("/tmp/fake_report.html")))
+            mock_popen.assert_not_called()
+
+    def test_main_open_file(self):
+        import cerebralos.__main__ as mod
+        self._check(mod._open_file)
+
+    def test_batch_eval_open_file(self):
+        from cerebralos.ingestion.batch_eval import _open_file
+        self._check(_open_file)
+
+
+class TestShouldOpen(unittest.TestCase):
+    """cerebralos/__main__.py --no-open / non-tty gating."""
+
+    def _should_open(self, flag, tty):
+        import cerebralos.__main__ as mod
+        stdout = MagicMock()
+        stdout.isatty.return_value = tty
+        with patch("sys.stdout", stdout):
+            return mod._should_open(flag)
+
+    def test_tty_without_flag_opens(self):
+        self.assertTrue(self._should_open(False, True))
+
+    def test_no_open_flag_skips(self):
+        self.assertFalse(self._should_open(True, True))
+
+    def test_non_tty_skips(self):
+        self.assertFalse(self._should_open(False, False))
+
+    def test_live_accepts_no_open_flag(self):
+        import io
+        import cerebralos.__main__ as mod
+        buf = io.StringIO()
+        with patch("sys.stdout", buf):
+            rc = mod.cmd_live(["--no-open"])
+        self.assertEqual(rc, 1)
+        self.assertIn("--no-open", buf.getvalue())
+
+
 class TestRunPatientShExport(unittest.TestCase):
     """run_patient.sh must export CEREBRAL_NO_OPEN=1."""
 
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_eval.generate_pi_report content.
+
+Covers:
+  - The banner, patient header and summary blocks
+  - Protocol outcomes are grouped into their report sections
+  - NTDS events are grouped, with evidence for passed gates of YES events
+  - The report ends with the engine footer and no trailing newline
+  - Reports stream to a path or open file without being returned
+  - Narrative section builders are imported once and reused
+  - A failing narrative import is reported inline, not raised
+  - Unknown outcomes count as triggered but appear in no section
+  - Evidence display text matches strip/slice/flatten of the snippet
+"""
+from __future__ import annotations
+
+import io
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cerebralos.ingestion import batch_eval as be_mod
+from cerebralos.ingestion.batch_eval import generate_pi_report
+
+
+def _snippet(text):
+    return {"source_type": "PHYSICIAN_NOTE", "timestamp": "2026-01-15 09:00", "text": text}
+
+
+def _step(req, passed):
+    return {
+        "requirement_id": req,
+        "passed": passed,
+        "reason": f"reason {req}",
+        "missing_data": [] if passed else ["ct_head"],
+        "match_details": [{"pattern_key": "anticoag", "matched_text": "Eliquis"}] if passed else [],
+        "evidence_count": 1,
+        "evidence_snippets": [_snippet("x" * 130)],
+    }
+
+
+def _evaluation():
+    outcomes = ["COMPLIANT", "NON_COMPLIANT", "INDETERMINATE", "ERROR", "NOT_TRIGGERED"]
+    gate = lambda passed: {"gate": "g1", "passed": passed, "reason": "why",
+                           "evidence_snippets": [_snippet("line one\nline two")]}
+    return {
+        "patient_id": "P001",
+        "patient_name": "Test Patient",
+        "results": [
+            {"protocol_id": f"P{i}", "protocol_name": f"Proto {o}", "outcome": o,
+             "step_trace": [_step("REQ_A", True), _step("REQ_B", False)],
+             "warnings": [], "error": "boom"}
+            for i, o in enumerate(outcomes)
+        ],
+        "ntds_results": [
+            {"event_id": i, "canonical_name": f"Event {o}", "outcome": o,
+             "gate_trace": [gate(True), gate(False)], "error": "bad"}
+            for i, o in enumerate(["YES", "NO", "EXCLUDED", "UNABLE_TO_DETERMINE", "ERROR"], 1)
+        ],
+        "all_evidence_snippets": [],
+    }
+
+
+class TestGeneratePiReport(unittest.TestCase):
+
+    def test_header_and_summary(self):
+        report = generate_pi_report(_evaluation())
+        rule = "=" * 70
+        self.assertTrue(report.startswith(
+            f"{rule}\nCEREBRAL OS — PROTOCOL COMPLIANCE REPORT\n{rule}\n\n"
+            "Patient:          Test Patient\n"
+            "Patient ID/MRN:   P001\n"
+            "DOB:              Unknown\n"
+            "Arrival:          Unknown\n"
+            "Trauma Category:  N/A\n"
+            "Evidence Blocks:  0\n"
+            "Source:           Unknown\n"
+            "\n"
+            f"{'-' * 70}\nSUMMARY\n{'-' * 70}\n"
+            "Protocols evaluated:  5\n"
+            "Triggered:            4\n"
+            "  COMPLIANT:          1\n"
+            "  NON_COMPLIANT:      1\n"
+            "  INDETERMINATE:      1\n"
+            "  ERROR:              1\n"
+            "Not triggered:        1\n"
+            "\n"))
+        self.assertIn(f"{rule}\nNTDS HOSPITAL EVENTS (2026)\n{rule}\n"
+                      "Events evaluated:         5\n", report)
+
+    def test_sections(self):
+        report = generate_pi_report(_evaluation())
+        for heading, line in (
+            ("NON-COMPLIANT PROTOCOLS (REQUIRES PI REVIEW)", "  [NON_COMPLIANT] Proto NON_COMPLIANT"),
+            ("INDETERMINATE PROTOCOLS (DOCUMENTATION GAPS)", "  [INDETERMINATE] Proto INDETERMINATE"),
+            ("COMPLIANT PROTOCOLS", "  [COMPLIANT] Proto COMPLIANT"),
+            ("NOT TRIGGERED (protocol did not apply)", "  [ — ] Proto NOT_TRIGGERED"),
+            ("ERRORS", "  [ERROR] Proto ERROR: boom"),
+            ("HOSPITAL EVENTS DETECTED (YES)", "  [YES] #01 Event YES"),
+            ("UNABLE TO DETERMINE (documentation gaps)", "  [UNABLE] #04 Event UNABLE_TO_DETERMINE"),
+            ("NO EVENTS DETECTED", "  [NO] #02 Event NO"),
+            ("EXCLUDED (present on arrival or other exclusion)", "  [EXCLUDED] #03 Event EXCLUDED"),
+            ("NTDS ERRORS", "  [ERROR] #05 Event ERROR: bad"),
+        ):
+            self.assertIn(f"{heading}\n{'-' * 70}\n{line}\n", report)
+        self.assertIn("Triggered:            4\n", report)
+        self.assertIn('          "' + "x" * 120 + '..."\n', report)
+        self.assertIn('        "line one line two"\n', report)
+
+    def test_unknown_outcome_counted_as_triggered(self):
+        evaluation = _evaluation()
+        evaluation["results"].append(dict(evaluation["results"][0], protocol_name="Odd",
+                                          outcome="SOMETHING_NEW"))
+        evaluation["ntds_results"].append(dict(evaluation["ntds_results"][0],
+                                               canonical_name="Odd", outcome="MAYBE"))
+        report = generate_pi_report(evaluation)
+        self.assertIn("Protocols evaluated:  6\nTriggered:            5\n", report)
+        self.assertIn("Events evaluated:         6\n", report)
+        self.assertNotIn("Odd", report)
+        self.assertEqual(be_mod._bucket_by_outcome(
+            [{"outcome": "NO"}, {"outcome": "X"}, {"outcome": "NO"}], ("YES", "NO")),
+            {"YES": [], "NO": [{"outcome": "NO"}, {"outcome": "NO"}]})
+
+    def test_footer(self):
+        report = generate_pi_report(_evaluation())
+        self.assertTrue(report.endswith(
+            f"CerebralOS Governance Engine {be_mod.GOVERNANCE_VERSION} "
+            f"(engine {be_mod.ENGINE_VERSION})\n" + "=" * 70))
+
+    def test_streamed_report_matches_returned_text(self):
+        strip_time = lambda text: re.sub(r"Report generated: .*\n", "", text)
+        expected = strip_time(generate_pi_report(_evaluation()))
+        out = io.StringIO()
+        self.assertIsNone(generate_pi_report(_evaluation(), out, return_text=False))
+        self.assertEqual(strip_time(out.getvalue()), expected)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "sub" / "P001_pi_report.txt"
+            self.assertIsNone(generate_pi_report(_evaluation(), path, return_text=False))
+            self.assertEqual(strip_time(path.read_text(encoding="utf-8")), expected)
+            returned = generate_pi_report(_evaluation(), str(path))
+            self.assertEqual(path.read_text(encoding="utf-8"), returned)
+
+    def test_narrative_builders_imported_once(self):
+        generate_pi_report(_evaluation())
+        builders = be_mod._narrative_builders()
+        self.assertEqual(len(builders), 8)
+        self.assertIs(be_mod._narrative_builders(), builders)
+
+    def test_narrative_import_failure_reported(self):
+        with patch.object(be_mod, "_narrative_builders", side_effect=ImportError("no module")):
+            report = generate_pi_report(_evaluation())
+        self.assertIn("(Narrative summary generation error: no module)", report)
+
+
+class TestSnippetDisplay(unittest.TestCase):
+
+    def test_matches_strip_and_slice(self):
+        for text in ("", " \n\t ", "short", "  padded\n", "a\nb\r\tc",
+                     "y" * 120, "  " + "y" * 120 + "  \n", "y" * 121,
+                     "\n" + "y" * 119 + "\n\n z", "z" * 50000 + "\n"):
+            stripped = text.strip()
+            expected = stripped[:120].replace("\n", " ")
+            if len(stripped) > 120:
+                expected += "..."
+            self.assertEqual(be_mod._snippet_display(text), expected, repr(text[:20]))
+
+
+if __name__ == "__main__":
+    unittest.main()
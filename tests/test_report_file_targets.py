@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for report writers accepting a path or an open file.
+
+Covers:
+  - generate_pi_report writes the returned text to a Path or a file handle
+  - generate_patient_html writes the returned HTML to a Path or a file handle
+  - Missing parent directories are created for Path targets
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from cerebralos.ingestion.batch_eval import generate_pi_report
+from cerebralos.reporting.html_report import generate_patient_html
+
+
+def _evaluation():
+    return {
+        "patient_id": "P001",
+        "patient_name": "Test Patient",
+        "source_file": "P001.txt",
+        "evidence_blocks": 0,
+        "has_discharge": False,
+        "is_live": False,
+        "all_evidence_snippets": [],
+        "results": [],
+        "ntds_results": [],
+    }
+
+
+class TestReportFileTargets(unittest.TestCase):
+
+    def _check(self, writer, name):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / name
+            text = writer(_evaluation(), path)
+            self.assertEqual(path.read_text(encoding="utf-8"), text)
+
+        buf = io.StringIO()
+        text = writer(_evaluation(), buf)
+        self.assertEqual(buf.getvalue(), text)
+
+    def test_pi_report_targets(self):
+        self._check(generate_pi_report, "P001_pi_report.txt")
+
+    def test_html_report_targets(self):
+        self._check(generate_patient_html, "P001_report.html")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos/__main__.py _resolve_patient_file.
+
+Covers:
+  - Absolute paths resolve directly
+  - Bare names resolve into data_raw/, with or without .txt
+  - data_raw/ wins over a same-named .txt in the working directory
+  - Unknown names exit with status 1
+  - data_raw/ lookups use the cached index and pick up new files
+  - Names the index lacks are still checked on disk (case-insensitive filesystems)
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cerebralos.__main__ as main_mod
+
+
+class TestResolvePatientFile(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.data_dir = self.root / "data_raw"
+        self.data_dir.mkdir()
+        (self.data_dir / "Jane_Doe.txt").write_text("PATIENT_ID: J1\n", encoding="utf-8")
+        self.cwd = self.root / "cwd"
+        self.cwd.mkdir()
+        self._old_cwd = os.getcwd()
+        os.chdir(self.cwd)
+        self._patch = patch.object(main_mod, "_DATA_DIR", self.data_dir)
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+        os.chdir(self._old_cwd)
+        self._tmp.cleanup()
+
+    def test_absolute_path(self):
+        target = self.data_dir / "Jane_Doe.txt"
+        self.assertEqual(main_mod._resolve_patient_file(str(target)), target)
+
+    def test_name_with_extension(self):
+        self.assertEqual(main_mod._resolve_patient_file("Jane_Doe.txt"),
+                         self.data_dir / "Jane_Doe.txt")
+
+    def test_name_without_extension(self):
+        self.assertEqual(main_mod._resolve_patient_file("Jane_Doe"),
+                         self.data_dir / "Jane_Doe.txt")
+
+    def test_data_dir_preferred_over_cwd_txt(self):
+        (self.cwd / "Jane_Doe.txt").write_text("local\n", encoding="utf-8")
+        self.assertEqual(main_mod._resolve_patient_file("Jane_Doe"),
+                         self.data_dir / "Jane_Doe.txt")
+
+    def test_cwd_txt_fallback(self):
+        (self.cwd / "Local_Only.txt").write_text("local\n", encoding="utf-8")
+        self.assertEqual(main_mod._resolve_patient_file("Local_Only"),
+                         Path("Local_Only.txt"))
+
+    def test_missing_exits(self):
+        with patch("builtins.print"), self.assertRaises(SystemExit) as ctx:
+            main_mod._resolve_patient_file("Nobody")
+        self.assertEqual(ctx.exception.code, 1)
+
+    def test_index_avoids_data_dir_stats(self):
+        main_mod._resolve_patient_file("Jane_Doe")  # warm the index
+        real_exists = os.path.exists
+        probed = []
+
+        def _exists(path):
+            probed.append(Path(path))
+            return real_exists(path)
+
+        with patch("os.path.exists", side_effect=_exists):
+            self.assertEqual(main_mod._resolve_patient_file("Jane_Doe"),
+                             self.data_dir / "Jane_Doe.txt")
+        # data_raw/Jane_Doe misses the index and is checked on disk; the .txt hit is not
+        self.assertEqual(probed, [Path("Jane_Doe"), self.data_dir / "Jane_Doe"])
+
+    def test_index_miss_checked_on_disk(self):
+        main_mod._resolve_patient_file("Jane_Doe")  # warm the index
+        folded = self.data_dir / "jane_doe.txt"
+        real_exists = os.path.exists
+
+        def _exists(path):
+            # As on a case-insensitive filesystem
+            return Path(path) == folded or real_exists(path)
+
+        with patch("os.path.exists", side_effect=_exists):
+            self.assertEqual(main_mod._resolve_patient_file("jane_doe"), folded)
+
+    def test_index_refreshes_on_new_file(self):
+        with patch("builtins.print"), self.assertRaises(SystemExit):
+            main_mod._resolve_patient_file("Late_Arrival")
+        (self.data_dir / "Late_Arrival.txt").write_text("x\n", encoding="utf-8")
+        # Force a distinct directory mtime even on coarse-grained filesystems
+        st = os.stat(self.data_dir)
+        os.utime(self.data_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(main_mod._resolve_patient_file("Late_Arrival"),
+                         self.data_dir / "Late_Arrival.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
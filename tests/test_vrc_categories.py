@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Tests for cerebralos/classification/vrc_categories.py.
+
+Covers:
+  - classify_vrc_categories returns one result per category, in order
+  - Representative YES / POSSIBLE / NO / UNABLE outcomes per category
+  - Evidence refers to the caller's own snippet dicts
+  - Batch classification matches per-patient classification
+  - Detection patterns are compiled once at module scope
+  - CEREBRAL_VRC_RE2=1 compiles them with RE2 when it is installed
+  - Patterns stay linear-time on 1 MB adversarial input
+  - The one-pass keyword scan finds exactly the keywords in the text
+  - Keyword prechecks never reject text their pattern would accept
+"""
+from __future__ import annotations
+
+import inspect
+import re
+import time
+import unittest
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+from cerebralos.classification import vrc_categories as vrc
+
+
+def _classify(*texts, source_type=None, **evaluation):
+    snippets = []
+    for t in texts:
+        s = {"text": t}
+        if source_type:
+            s["source_type"] = source_type
+        snippets.append(s)
+    evaluation.setdefault("all_evidence_snippets", snippets)
+    return {r["category_id"]: r for r in vrc.classify_vrc_categories(evaluation)}
+
+
+class TestClassifyShape(unittest.TestCase):
+
+    def test_one_result_per_category_in_order(self):
+        results = vrc.classify_vrc_categories({"all_evidence_snippets": []})
+        self.assertEqual([r["category_id"] for r in results],
+                         [c.id for c in vrc._VRC_CATEGORIES])
+        for r in results:
+            self.assertEqual(set(r), {"category_id", "category_group", "description",
+                                      "status", "reason", "evidence_snippets"})
+
+    def test_result_templates_frozen_and_not_shared(self):
+        self.assertEqual(list(vrc._CAT_RESULT_TEMPLATES), [c.id for c in vrc._VRC_CATEGORIES])
+        with self.assertRaises(TypeError):
+            vrc._CAT_RESULT_TEMPLATES["DEATH"]["description"] = "X"
+        first = vrc.classify_vrc_categories({"all_evidence_snippets": []})
+        first[0]["description"] = "X"
+        self.assertEqual(list(first[1]), ["category_id", "category_group", "description",
+                                          "status", "reason", "evidence_snippets"])
+        again = vrc.classify_vrc_categories({"all_evidence_snippets": []})
+        self.assertEqual(again[0]["description"], vrc._VRC_CATEGORIES[0].description)
+
+    def test_categories_bind_detection_functions(self):
+        self.assertIsInstance(vrc._VRC_CATEGORIES, tuple)
+        for cat in vrc._VRC_CATEGORIES:
+            self.assertIsInstance(cat, vrc.VrcCategory)
+            self.assertTrue(callable(cat.detect_fn), cat.id)
+        with self.assertRaises(AttributeError):
+            vrc._VRC_CATEGORIES[0].id = "X"
+
+    def test_absent_results_match_detectors(self):
+        empty = vrc._SnippetIndex([{"text": "no acute findings"}])
+        self.assertEqual(empty.present_mask, 0)
+        gated = [cat for cat in vrc._VRC_CATEGORIES if cat.required_mask]
+        self.assertTrue(gated)
+        for cat in gated:
+            self.assertIs(cat.detect_fn(empty, {}), cat.absent_result, cat.id)
+
+    def test_detectors_return_category_results(self):
+        idx = vrc._SnippetIndex([{"text": "GCS 6, admitted to ICU"}])
+        for cat in vrc._VRC_CATEGORIES:
+            self.assertIsInstance(cat.detect_fn(idx, {}), vrc.CategoryResult, cat.id)
+        for r in vrc.classify_vrc_categories({"all_evidence_snippets": [{"text": "GCS 6"}]}):
+            self.assertIsInstance(r, dict)
+
+    def test_gated_detectors_skipped_without_keywords(self):
+        cats = tuple(
+            vrc.VrcCategory(cat.id, cat.group, cat.description,
+                            detect_fn=(cat.detect_fn if not cat.required_mask else
+                                       Mock(side_effect=AssertionError(cat.id))),
+                            required_mask=cat.required_mask, absent_result=cat.absent_result)
+            for cat in vrc._VRC_CATEGORIES)
+        with patch.object(vrc, "_VRC_CATEGORIES", cats):
+            res = _classify("no acute findings")
+        self.assertEqual(res["DEATH"]["reason"], "No mortality documented")
+
+    def test_missing_snippets_key(self):
+        results = vrc.classify_vrc_categories({})
+        self.assertEqual(len(results), len(vrc._VRC_CATEGORIES))
+
+    def test_none_text_tolerated(self):
+        res = _classify(None, "", "Subdural hematoma")
+        self.assertEqual(res["NEURO_EPIDURAL_SUBDURAL_TO_OR"]["status"], "POSSIBLE")
+
+
+class TestCategoryOutcomes(unittest.TestCase):
+
+    def test_neuro_hematoma(self):
+        res = _classify("Acute subdural hematoma", "Underwent craniotomy")
+        self.assertEqual(res["NEURO_EPIDURAL_SUBDURAL_TO_OR"]["status"], "YES")
+        self.assertEqual(len(res["NEURO_EPIDURAL_SUBDURAL_TO_OR"]["evidence_snippets"]), 2)
+
+    def test_severe_tbi(self):
+        self.assertEqual(_classify("GCS 6", "Admitted to ICU")["NEURO_SEVERE_TBI_ICU"]["status"], "YES")
+        res = _classify("GCS: 14, later GCS 7")["NEURO_SEVERE_TBI_ICU"]
+        self.assertEqual((res["status"], res["reason"]), ("POSSIBLE", "GCS 7 documented, ICU admission unclear"))
+        self.assertEqual(_classify("gcs 99")["NEURO_SEVERE_TBI_ICU"]["status"], "NO")
+        self.assertEqual(_classify("TBI", "SICU")["NEURO_SEVERE_TBI_ICU"]["status"], "POSSIBLE")
+
+    def test_amputation_excludes_digits(self):
+        self.assertEqual(_classify("finger amputation")["ORTHO_AMPUTATION"]["reason"],
+                         "Only digit amputation documented")
+        self.assertEqual(_classify("Below knee amputation")["ORTHO_AMPUTATION"]["status"], "YES")
+
+    def test_open_femur_tibia(self):
+        self.assertEqual(_classify("Open fracture of the left tibia")["ORTHO_OPEN_FEMUR_TIBIA"]["status"], "YES")
+        self.assertEqual(_classify("Femur: open fx")["ORTHO_OPEN_FEMUR_TIBIA"]["status"], "YES")
+        self.assertEqual(_classify("femoral fracture")["ORTHO_OPEN_FEMUR_TIBIA"]["status"], "POSSIBLE")
+
+    def test_open_femur_tibia_within_one_sentence(self):
+        self.assertEqual(_classify("Femur intact. Open fracture of the radius")["ORTHO_OPEN_FEMUR_TIBIA"]["status"], "NO")
+        far = "open fracture " + "x" * 100 + " tibia"
+        self.assertEqual(_classify(far)["ORTHO_OPEN_FEMUR_TIBIA"]["status"], "NO")
+        res = _classify("open fx tibia, femur open fx", "Open fracture left femur")["ORTHO_OPEN_FEMUR_TIBIA"]
+        self.assertEqual([s["text"] for s in res["evidence_snippets"]],
+                         ["open fx tibia, femur open fx", "Open fracture left femur"])
+
+    def test_solid_organ(self):
+        self.assertEqual(_classify("Splenic laceration", "grade IV")["ABDTHOR_SOLID_ORGAN"]["status"], "YES")
+        self.assertEqual(_classify("Liver injury")["ABDTHOR_SOLID_ORGAN"]["status"], "POSSIBLE")
+
+    def test_iss_categories(self):
+        res = _classify("ISS 10")
+        self.assertEqual(res["NONSURG_ISS9"]["reason"], "Non-surgical admission with ISS 10")
+        self.assertEqual(res["ADVERSE_ISS25_SURVIVAL"]["reason"], "ISS 10 (<= 25)")
+        res = _classify("ISS of 30", has_discharge=True)
+        self.assertEqual(res["ADVERSE_ISS25_SURVIVAL"]["status"], "YES")
+        self.assertEqual(_classify("nothing")["ADVERSE_ISS25_SURVIVAL"]["status"], "UNABLE")
+        self.assertEqual(_classify("laparotomy", "ISS=20")["NONSURG_ISS9"]["status"], "NO")
+
+    def test_scores_collected_in_one_pass(self):
+        idx = vrc._SnippetIndex([{"text": "GCS 14, ISS=12"}, {"text": "tissue gcs: 7 iss of 30"},
+                                 {"text": "gcs=9 gcs 100"}, {"text": None}])
+        self.assertEqual((idx.min_gcs, idx.first_iss), (7, 12))
+        self.assertEqual(vrc._extract_gcs(idx), 7)
+        self.assertEqual(vrc._extract_iss(idx), 12)
+        idx = vrc._SnippetIndex([{"text": "gcs 2, gcs 16"}, {"text": "iss"}])
+        self.assertEqual((idx.min_gcs, idx.first_iss), (None, None))
+
+    def test_find_iss_matches_regex(self):
+        pat = re.compile(r'\biss\s*(?:(?:of|:|=)\s*)?(\d+)\b')
+        texts = ["iss 10", "iss:9", "iss =  30", "iss of 26", "iss of", "iss:", "iss12",
+                 "tissue 5 iss 7", "iss 12abc iss 4", "_iss 3", "iss 5_", "iss\n\t22",
+                 "isss 3", "iss ofof 2", "iss :=3", "iss of:4", "", "iss", "x iss 1000"]
+        for text in texts:
+            m = pat.search(text)
+            self.assertEqual(vrc._find_iss(text), int(m.group(1)) if m else None, text)
+
+    def test_geriatric_hip(self):
+        res = _classify("Left hip fracture", dob="01/01/1940")["NONSURG_GERIATRIC_HIP"]
+        self.assertEqual(res["status"], "POSSIBLE")
+        self.assertTrue(res["reason"].startswith("Age "))
+
+    def test_extract_age_reference_time(self):
+        ref = datetime(2020, 1, 1, 23, 59)
+        self.assertEqual(vrc._extract_age({"dob": "06/15/1950"}, ref), 69)
+        self.assertEqual(vrc._extract_age({"dob": "06/15/1950"}, datetime(2021, 1, 1)), 70)
+        self.assertIsNone(vrc._extract_age({"dob": "13/45/2000"}, ref))
+        self.assertIsNone(vrc._extract_age({}, ref))
+
+    def test_age_computed_as_of_classification_date(self):
+        with patch.object(vrc, "date") as mock_date:
+            mock_date.today.return_value = date(2000, 1, 1)
+            res = _classify("Left hip fracture", dob="01/01/1930")["NONSURG_GERIATRIC_HIP"]
+        self.assertTrue(res["reason"].startswith("Age 70,"), res["reason"])
+
+    def test_transfer_out_discharge(self):
+        res = _classify("Transferred to University hospital", source_type="DISCHARGE")
+        self.assertEqual(res["NONSURG_TRANSFER_OUT"]["status"], "YES")
+        self.assertEqual(_classify("accepted by Dr. X")["NONSURG_TRANSFER_OUT"]["status"], "POSSIBLE")
+
+    def test_return_to_or_multiple_operative_blocks(self):
+        res = _classify("Procedure one", "Procedure two", source_type="OPERATIVE_NOTE")
+        self.assertEqual(res["ADVERSE_RETURN_SICU_OR"]["status"], "POSSIBLE")
+        self.assertEqual(_classify("Returned to OR")["ADVERSE_RETURN_SICU_OR"]["status"], "YES")
+
+    def test_return_to_or_mixed_block_order(self):
+        snippets = [{"text": "op a", "source_type": "PROCEDURE"},
+                    {"text": "note", "source_type": "DISCHARGE"},
+                    {"text": "op b", "source_type": "OPERATIVE_NOTE"},
+                    {"text": "op c", "source_type": "PROCEDURE"}]
+        res = _classify(all_evidence_snippets=snippets)["ADVERSE_RETURN_SICU_OR"]
+        self.assertEqual(res["reason"], "Multiple operative blocks (3) — possible return to OR")
+        self.assertEqual([s["text"] for s in res["evidence_snippets"]], ["op a", "op b"])
+
+    def test_by_source_buckets(self):
+        snippets = [{"text": "a", "source_type": "DISCHARGE"}, {"text": "b"},
+                    {"text": "c", "source_type": "DISCHARGE"}]
+        idx = vrc._SnippetIndex(snippets)
+        self.assertEqual(idx.by_source, {"DISCHARGE": [snippets[0], snippets[2]], None: [snippets[1]]})
+
+    def test_mtp_hospice_death(self):
+        res = _classify("Code crimson activated", "Comfort care", "Time of death 0300")
+        self.assertEqual(res["MTP_ACTIVATED"]["status"], "YES")
+        self.assertEqual(res["HOSPICE"]["status"], "YES")
+        self.assertEqual(res["DEATH"]["status"], "YES")
+        res = _classify("PRBC", "FFP", "cryoprecipitate")
+        self.assertEqual(res["MTP_ACTIVATED"]["status"], "POSSIBLE")
+        self.assertEqual(res["DEATH"]["status"], "NO")
+
+
+class TestClassifyEvidence(unittest.TestCase):
+
+    def _evaluation(self):
+        return {"all_evidence_snippets": [{"text": "Subdural hematoma", "id": 1},
+                                          {"text": "Taken to OR", "source_type": "OPERATIVE_NOTE"}],
+                "dob": "01/01/1950", "has_discharge": True}
+
+    def test_evidence_refers_to_callers_snippets(self):
+        ev = self._evaluation()
+        res = {r["category_id"]: r for r in vrc.classify_vrc_categories(ev)}
+        evidence = res["NEURO_EPIDURAL_SUBDURAL_TO_OR"]["evidence_snippets"]
+        self.assertIs(evidence[0], ev["all_evidence_snippets"][0])
+        self.assertEqual(evidence[0]["id"], 1)
+
+    def test_evidence_lists_not_shared(self):
+        first = vrc.classify_vrc_categories({"all_evidence_snippets": []})
+        first[-1]["evidence_snippets"].append({"text": "X"})
+        again = vrc.classify_vrc_categories({"all_evidence_snippets": []})
+        self.assertEqual(again[-1]["evidence_snippets"], [])
+
+
+class TestClassifyBatch(unittest.TestCase):
+
+    def test_matches_per_patient_results(self):
+        evaluations = [
+            {"all_evidence_snippets": [{"text": "GCS 6"}, {"text": "SICU"}]},
+            {"all_evidence_snippets": [{"text": "Left hip fracture"}], "dob": "01/01/1940"},
+            {},
+        ]
+        self.assertEqual(vrc.classify_vrc_categories_batch(evaluations),
+                         [vrc.classify_vrc_categories(ev) for ev in evaluations])
+        self.assertEqual(vrc.classify_vrc_categories_batch([]), [])
+
+    def test_identical_patients_keep_own_evidence(self):
+        evaluations = [{"all_evidence_snippets": [{"text": "expired"}]} for _ in range(3)]
+        results = vrc.classify_vrc_categories_batch(evaluations)
+        self.assertEqual(len(results), 3)
+        self.assertIs(results[2][-1]["evidence_snippets"][0], evaluations[2]["all_evidence_snippets"][0])
+
+
+class TestPatternsPrecompiled(unittest.TestCase):
+
+    def test_module_level_patterns(self):
+        pats = {k: v for k, v in vars(vrc).items() if k.startswith("_PAT_")}
+        self.assertTrue(pats)
+        for name, pat in pats.items():
+            self.assertIsInstance(pat, re.Pattern, name)
+
+    def test_patterns_case_sensitive_lowercase(self):
+        for name, pat in vars(vrc).items():
+            if name.startswith("_PAT_"):
+                self.assertFalse(pat.flags & re.IGNORECASE, name)
+                self.assertEqual(pat.pattern, pat.pattern.lower(), name)
+
+    def test_patterns_re2_compatible(self):
+        for name, pat in vars(vrc).items():
+            if name.startswith("_PAT_"):
+                self.assertNotRegex(pat.pattern, r"\(\?[=!<]|\\[1-9]", name)
+
+    def test_compile_uses_re2_only_when_enabled(self):
+        fake_re2 = Mock()
+        with patch.object(vrc, "re2", fake_re2), patch.dict("os.environ", {"CEREBRAL_VRC_RE2": "1"}):
+            self.assertIs(vrc._compile(r"\bgcs"), fake_re2.compile.return_value)
+        fake_re2.compile.assert_called_once_with(r"\bgcs")
+        with patch.object(vrc, "re2", fake_re2), patch.dict("os.environ", {"CEREBRAL_VRC_RE2": "0"}):
+            self.assertIsInstance(vrc._compile(r"\bgcs"), re.Pattern)
+        with patch.object(vrc, "re2", None), patch.dict("os.environ", {"CEREBRAL_VRC_RE2": "1"}):
+            self.assertIsInstance(vrc._compile(r"\bgcs"), re.Pattern)
+
+    def test_mixed_case_text_still_matches(self):
+        self.assertEqual(_classify("Splenic Laceration", "GRADE IV")["ABDTHOR_SOLID_ORGAN"]["status"], "YES")
+        self.assertEqual(_classify("ISS: 30", has_discharge=True)["ADVERSE_ISS25_SURVIVAL"]["status"], "YES")
+
+    def test_no_compile_in_detectors(self):
+        with patch("re.compile", side_effect=AssertionError("compiled per call")):
+            vrc.classify_vrc_categories({"all_evidence_snippets": [{"text": "GCS 7 ISS 30"}],
+                                         "dob": "01/01/1950"})
+
+
+class TestPathologicalInput(unittest.TestCase):
+    """Patterns stay linear on large adversarial text (no ReDoS)."""
+
+    # Generous wall-clock bound; the old GCS/ISS pattern took minutes on 1 MB
+    _LIMIT_S = 2.0
+
+    def _assert_fast(self, pat, text, label):
+        start = time.perf_counter()
+        pat.search(text)
+        self.assertLess(time.perf_counter() - start, self._LIMIT_S, label)
+
+    def test_one_megabyte_inputs(self):
+        size = 1 << 20
+        for pat, k in ((vrc._PAT_GCS, "gcs"), (vrc._PAT_GCS, "gcs of"),
+                       (vrc._PAT_OPEN_FEMUR_TIBIA, "open fx"), (vrc._PAT_OPEN_FEMUR_TIBIA, "tibia")):
+            self._assert_fast(pat, k + " " * size, (pat.pattern, k))
+            self._assert_fast(pat, ((k + " ") * size)[:size], (pat.pattern, k))
+        for k in ("iss", "iss of", "iss ="):
+            for text in (k + " " * size, ((k + " ") * size)[:size]):
+                start = time.perf_counter()
+                self.assertIsNone(vrc._find_iss(text))
+                self.assertLess(time.perf_counter() - start, self._LIMIT_S, k)
+
+    def test_every_keyword_then_whitespace_run(self):
+        size = 1 << 16
+        for pat, keywords in vrc._PATTERN_KEYWORDS.items():
+            for k in keywords:
+                self._assert_fast(pat, k + " " * size, (pat.pattern, k))
+                self._assert_fast(pat, ((k + " ") * size)[:size], (pat.pattern, k))
+
+    def test_unbounded_gaps_removed(self):
+        for name, pat in vars(vrc).items():
+            if name.startswith("_PAT_"):
+                self.assertNotIn(".*", pat.pattern, name)
+                self.assertNotIn(".+", pat.pattern, name)
+
+
+class TestSnippetIndex(unittest.TestCase):
+
+    _TEXTS = [
+        "", "nothing notable", "Acute SUBDURAL hematoma", "open fracture ... tibia",
+        "s/p ORIF of the pelvis", "Code Crimson", "transported to county hospital",
+        "expired at 0300", "GCS 7", "pronounced dead", "grade iii splenic injury",
+    ]
+
+    def test_keywords_present(self):
+        self.assertEqual(vrc._keywords_present(""), frozenset())
+        self.assertEqual(vrc._keywords_present("transferred to icu; resting"),
+                         {"transfer", "transferred to icu"})
+        for text in self._TEXTS:
+            t = text.lower()
+            self.assertEqual(vrc._keywords_present(t), {k for k in vrc._KEYWORDS if k in t})
+
+    def test_buckets_hold_only_keyword_snippets(self):
+        idx = vrc._SnippetIndex([{"text": t} for t in self._TEXTS])
+        for pat, pairs in idx._buckets.items():
+            for _, t in pairs:
+                self.assertTrue(any(k in t for k in vrc._PATTERN_KEYWORDS[pat]))
+        self.assertEqual(idx.matching_pairs(vrc._PAT_GCS), [])
+
+    def test_matching_is_memoized(self):
+        idx = vrc._SnippetIndex([{"text": t} for t in self._TEXTS])
+        first = idx.matching(vrc._PAT_DEATH)
+        self.assertEqual([s["text"] for s in first], ["expired at 0300", "pronounced dead"])
+        self.assertIs(idx.matching(vrc._PAT_DEATH), first)
+
+    def test_any_matching_stops_at_first_hit(self):
+        seen = []
+
+        class _Pat:
+            def search(self, text):
+                seen.append(text)
+                return True
+
+        pat = _Pat()
+        idx = vrc._SnippetIndex([])
+        idx._buckets[pat] = [({}, "a"), ({}, "b")]
+        self.assertTrue(idx.any_matching(pat))
+        self.assertTrue(idx.any_matching(pat))
+        self.assertEqual(seen, ["a"])
+
+    def test_any_matching_agrees_with_matching(self):
+        idx = vrc._SnippetIndex([{"text": t} for t in self._TEXTS])
+        for pat in vrc._PATTERN_KEYWORDS:
+            self.assertEqual(idx.any_matching(pat), bool(idx.matching(pat)))
+
+    def test_text_lowered_once_per_snippet(self):
+        class _Text(str):
+            calls = 0
+
+            def lower(self):
+                _Text.calls += 1
+                return str.lower(self)
+
+        snippets = [{"text": _Text(t)} for t in self._TEXTS]
+        vrc.classify_vrc_categories({"all_evidence_snippets": snippets, "has_discharge": True})
+        self.assertEqual(_Text.calls, len([t for t in self._TEXTS if t]))
+
+    def test_keywords_are_necessary_for_pattern(self):
+        texts = self._TEXTS + [
+            "taken to OR", "Admitted to MICU", "comfort   measures only", "withdraw care",
+            "TOD: 0300", "right toe amputation", "fingertip", "mortality review",
+            "re-exploration", "reexploration", "code  crimson", "femoral neck fracture",
+            "tibial open fx", "pancreatic injury", "acetabulum fracture", "cardiac tamponade",
+            "transported to mercy hospital", "readmitted to SICU", "Grade V", "s/p arthroplasty",
+        ]
+        for pat, keywords in vrc._PATTERN_KEYWORDS.items():
+            for text in texts:
+                t = text.lower()
+                if pat.search(t):
+                    self.assertTrue(any(k in t for k in keywords), (pat.pattern, text))
+                self.assertEqual(vrc._keyword_search(t, pat), bool(pat.search(t)))
+
+    def test_keyword_hit_still_needs_word_boundary(self):
+        self.assertFalse(vrc._keyword_search("studied the films", vrc._PAT_DEATH))
+        self.assertFalse(vrc._keyword_search("toenail avulsion", vrc._PAT_DIGIT))
+        self.assertEqual(_classify("toenail amputation")["ORTHO_AMPUTATION"]["status"], "YES")
+
+    def test_all_matched_patterns_registered(self):
+        source = inspect.getsource(vrc)
+        used = set(re.findall(r"idx\.(?:any_)?matching(?:_pairs)?\((_PAT_\w+)\)", source))
+        registered = {name for name, pat in vars(vrc).items()
+                      if name.startswith("_PAT_") and pat in vrc._PATTERN_KEYWORDS}
+        self.assertTrue(used)
+        self.assertLessEqual(used, registered)
+
+
+if __name__ == "__main__":
+    unittest.main()